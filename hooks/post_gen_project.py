@@ -42,22 +42,35 @@ REPO = CTX["repo_name"]                  # convenience alias
 
 PRUNE_MAP: Dict[str, List[str]] = {
     # ── Cross-cut helpers ──────────────────────────────────────────
-    "use_prompts":       [f"src/{PKG}/prompts"],
-    "include_rag":       [f"src/{PKG}/services/rag_service.py"],
+    "use_prompts":       [f"src/{PKG}/prompts", "tests/unit/test_prompts.py"],
+    "include_rag": [
+        f"src/{PKG}/services/rag_service.py",
+        f"src/{PKG}/infrastructure/storage/lexical_index.py",
+        "tests/unit/test_rag_service.py",
+        "scripts/benchmark_rag.py",
+    ],
     "use_summarization": [f"src/{PKG}/services/summarization_service.py"],
     # ── GenAI & agents ─────────────────────────────────────────────
     "use_genai": [
         f"src/{PKG}/models/genai",
         f"src/{PKG}/api/routers/genai_router.py",
+        "tests/unit/test_embeddings.py",
+        "tests/unit/test_genai_streaming.py",
+        "tests/unit/test_response_cache.py",
     ],
     "use_agents": [
         f"src/{PKG}/models/agents",
         f"src/{PKG}/api/routers/agent_router.py",
+        "tests/unit/test_agents.py",
     ],
     # ── ML umbrella & tasks ────────────────────────────────────────
     "use_ml": [
         f"src/{PKG}/models/ml",
         f"src/{PKG}/api/routers/ml_router.py",
+        "tests/unit/test_model_registry.py",
+        "tests/unit/test_forecasting.py",
+        "scripts/benchmark_forecasting.py",
+        "tests/unit/test_regression.py",
     ],
     "use_classification": [
         f"src/{PKG}/models/ml/classification",
@@ -66,14 +79,31 @@ PRUNE_MAP: Dict[str, List[str]] = {
     "use_forecasting": [
         f"src/{PKG}/models/ml/forecasting",
         f"src/{PKG}/services/forecasting_service.py",
+        "tests/unit/test_forecasting.py",
+        "scripts/benchmark_forecasting.py",
+    ],
+    "use_regression": [
+        f"src/{PKG}/models/ml/regression",
+        "tests/unit/test_regression.py",
     ],
-    "use_regression":    [f"src/{PKG}/models/ml/regression"],
     "use_sentiment":     [f"src/{PKG}/services/sentiment_service.py"],
     # ── Infrastructure switches ────────────────────────────────────
-    "use_feature_store": [f"src/{PKG}/infrastructure/storage/feature_store.py"],
-    "use_vector_db":     [f"src/{PKG}/infrastructure/storage/vector_db.py"],
-    "use_messaging":     [f"src/{PKG}/infrastructure/messaging"],
-    "use_mlflow":        [f"src/{PKG}/infrastructure/tracking"],
+    "use_feature_store": [
+        f"src/{PKG}/infrastructure/storage/feature_store.py",
+        "tests/unit/test_feature_store.py",
+    ],
+    "use_vector_db": [
+        f"src/{PKG}/infrastructure/storage/vector_db.py",
+        "tests/unit/test_vector_db.py",
+    ],
+    "use_messaging": [
+        f"src/{PKG}/infrastructure/messaging",
+        "tests/unit/test_message_queue.py",
+    ],
+    "use_mlflow": [
+        f"src/{PKG}/infrastructure/tracking",
+        "tests/unit/test_tracker.py",
+    ],
     # ── Lightweight mode cleanup ───────────────────────────────────
     "lightweight_mode": [
         f"src/{PKG}/core.py",
@@ -81,6 +111,15 @@ PRUNE_MAP: Dict[str, List[str]] = {
     ],
 }
 
+# Features that import other features: switching a dependency off switches the feature off too.
+REQUIRES: Dict[str, List[str]] = {
+    "include_rag": ["use_prompts", "use_vector_db", "use_genai"],
+}
+
+for feature, dependencies in REQUIRES.items():
+    if any(CTX.get(dep, "yes") == "no" for dep in dependencies):
+        CTX[feature] = "no"
+
 def prune(path: Path) -> None:
     if path.is_dir():
         shutil.rmtree(path, ignore_errors=True)
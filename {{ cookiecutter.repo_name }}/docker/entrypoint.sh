@@ -11,5 +11,9 @@ if [ -f scripts/seed_demo_data.py ]; then
   python scripts/seed_demo_data.py || true
 fi
 
-# Start the API
-exec uvicorn src.{{ cookiecutter.package_name }}.api.app:app --host 0.0.0.0 --port 8000 
\ No newline at end of file
+# Start the API. With WEB_CONCURRENCY > 1, preload models once and fork workers
+# that share them copy-on-write.
+if [ "${WEB_CONCURRENCY:-1}" -gt 1 ]; then
+  exec python -m src.{{ cookiecutter.package_name }}.serving --workers "${WEB_CONCURRENCY}"
+fi
+exec uvicorn src.{{ cookiecutter.package_name }}.api.app:app --host 0.0.0.0 --port 8000 
@@ -1,5 +1,9 @@
 #!/bin/bash
 set -e
 
-# Example: Run a batch ML job (training)
-python src/{{ cookiecutter.package_name }}/pipelines/training.py 
\ No newline at end of file
+# Example: preprocess raw data on every core, then run a batch ML job (training)
+if [ -d "${RAW_DATA_PATH:-data/raw}" ]; then
+  python -m src.{{ cookiecutter.package_name }}.pipelines.preprocessing "${RAW_DATA_PATH:-data/raw}" \
+    --output "${PROCESSED_DATA_PATH:-data/processed/records.jsonl}" ${PREPROCESS_WORKERS:+--workers "$PREPROCESS_WORKERS"}
+fi
+python src/{{ cookiecutter.package_name }}/pipelines/training.py
@@ -0,0 +1,50 @@
+# Benchmark Forecasting
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.{{ cookiecutter.package_name }}.models.ml.forecasting import (  # noqa: E402
+    model as forecasting,
+)
+
+
+def synthetic_series(
+    n_series: int, length: int, season: int = 7, seed: int = 0
+) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(length)
+    trend = rng.normal(0, 0.05, (n_series, 1)) * t
+    seasonal = rng.uniform(1, 5, (n_series, 1)) * np.sin(
+        2 * np.pi * t / season
+    )
+    return 100 + trend + seasonal + rng.normal(0, 1, (n_series, length))
+
+
+def benchmark(n_series: int, length: int, horizon: int) -> None:
+    """
+    Fit + predict every baseline over all series at once and print series per
+    second.
+    """
+    series = synthetic_series(n_series, length)
+    params = {"seasonal_naive": {"season_length": 7}, "ar": {"order": 7}}
+    print(f"{n_series} series x {length} steps, horizon {horizon}")
+    for method in forecasting.MODELS:
+        model = forecasting.make_model(method, **params.get(method, {}))
+        start = time.perf_counter()
+        model.fit_predict(series, horizon)
+        elapsed = time.perf_counter() - start
+        rate = n_series / elapsed
+        print(f"  {method:<16} {elapsed:8.3f}s  {rate:12,.0f} series/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=benchmark.__doc__)
+    parser.add_argument("--series", type=int, default=50_000)
+    parser.add_argument("--length", type=int, default=365)
+    parser.add_argument("--horizon", type=int, default=28)
+    args = parser.parse_args()
+    benchmark(args.series, args.length, args.horizon)
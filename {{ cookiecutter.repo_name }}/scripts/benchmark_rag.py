@@ -0,0 +1,118 @@
+# Benchmark RAG Retrieval
+import argparse
+import sys
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.{{ cookiecutter.package_name }}.services.rag_service import (  # noqa: E402
+    RAGPipeline,
+)
+
+
+class HashingEmbedder:
+    """
+    Deterministic bag-of-words embedder: each token maps to a fixed random
+    vector.
+    """
+
+    def __init__(self, dim: int = 64):
+        self.dim = dim
+        self._vectors: dict[str, np.ndarray] = {}
+
+    def __call__(self, texts: list[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for token in text.lower().split():
+                out[i] += self._vector(token)
+        return out
+
+    def _vector(self, token: str) -> np.ndarray:
+        vector = self._vectors.get(token)
+        if vector is None:
+            rng = np.random.default_rng(zlib.crc32(token.encode("utf-8")))
+            vector = self._vectors[token] = rng.standard_normal(
+                self.dim
+            ).astype(np.float32)
+        return vector
+
+
+def synthetic_corpus(
+    n_docs: int,
+    n_queries: int,
+    vocab_size: int = 20_000,
+    doc_len: int = 60,
+    query_len: int = 4,
+    seed: int = 0,
+):
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"w{i}" for i in range(vocab_size)])
+    # Zipf-like word frequencies, so queries mix common and rare terms.
+    p = 1.0 / np.arange(1, vocab_size + 1)
+    p /= p.sum()
+    docs = [" ".join(rng.choice(vocab, doc_len, p=p)) for _ in range(n_docs)]
+    targets = rng.integers(0, n_docs, n_queries)
+    queries = [
+        " ".join(rng.choice(docs[t].split(), query_len, replace=False))
+        for t in targets
+    ]
+    return docs, queries, [str(t) for t in targets]
+
+
+def benchmark(
+    n_docs: int,
+    n_queries: int,
+    k: int,
+    vector_weight: float,
+    lexical_weight: float,
+) -> None:
+    """
+    Recall@k of vector-only, lexical-only and hybrid retrieval, plus per-stage
+    p50/p95 latency.
+    """
+    docs, queries, targets = synthetic_corpus(n_docs, n_queries)
+    embedder = HashingEmbedder()
+    start = time.perf_counter()
+    base = RAGPipeline(embed=embedder, dim=embedder.dim, top_k=k)
+    base.add_documents([str(i) for i in range(n_docs)], docs)
+    print(
+        f"indexed {n_docs} docs in {time.perf_counter() - start:.2f}s "
+        f"(BM25 postings {base.lexical.nbytes / 1e6:.1f} MB)"
+    )
+
+    for name, weights in (
+        ("vector", (1.0, 0.0)),
+        ("lexical", (0.0, 1.0)),
+        ("hybrid", (vector_weight, lexical_weight)),
+    ):
+        base.weights = {"vector": weights[0], "lexical": weights[1]}
+        hits, timings = 0, {}
+        for query, target in zip(queries, targets):
+            chunks, stage_ms = base.retrieve(query, k)
+            hits += any(chunk.id == target for chunk in chunks)
+            for stage, ms in stage_ms.items():
+                timings.setdefault(stage, []).append(ms)
+        print(f"{name:<8} recall@{k}: {hits / len(queries):.3f}")
+        for stage, values in timings.items():
+            p50, p95 = np.percentile(values, [50, 95])
+            print(f"    {stage:<16} p50 {p50:7.2f} ms   p95 {p95:7.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=benchmark.__doc__)
+    parser.add_argument("--docs", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--vector-weight", type=float, default=1.0)
+    parser.add_argument("--lexical-weight", type=float, default=1.0)
+    args = parser.parse_args()
+    benchmark(
+        args.docs,
+        args.queries,
+        args.k,
+        args.vector_weight,
+        args.lexical_weight,
+    )
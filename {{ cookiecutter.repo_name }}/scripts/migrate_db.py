@@ -1,9 +1,10 @@
 # DB Migration Script
-import subprocess
 import logging
+import subprocess
 import sys
 from pathlib import Path
 
+
 def migrate_db():
     """
     Run database migrations using Alembic.
@@ -21,5 +22,6 @@ def migrate_db():
         logging.error(f"Migration failed: {e}")
         sys.exit(1)
 
+
 if __name__ == "__main__":
     migrate_db()
@@ -1,6 +1,6 @@
 """
 Main package for {{ cookiecutter.package_name }}.
 
-This package contains all core modules, services, models, and utilities for the project.
-Import submodules explicitly to keep imports clear and maintainable.
+This package contains all core modules, services, models, and utilities for the
+project. Import submodules explicitly to keep imports clear and maintainable.
 """
@@ -3,4 +3,5 @@ from .api.app import app
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+
+    uvicorn.run(app, host="0.0.0.0", port=8000)
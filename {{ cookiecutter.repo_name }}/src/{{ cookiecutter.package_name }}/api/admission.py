@@ -0,0 +1,603 @@
+# admission.py
+"""
+Admission control: per-route concurrency limits, per-tenant token buckets and
+adaptive load shedding.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import time
+import weakref
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import HTTPException, Request
+
+from ..config.settings import settings
+from ..core.errors import OverloadedError
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryRateLimitBackend:
+    """
+    Token buckets for one process, kept in an LRU of at most `max_keys`
+    tenants. Buckets refill lazily from the time elapsed since their last use.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(
+        self, key: str, cost: float, rate: float, burst: float
+    ) -> float:
+        """
+        Spend `cost` tokens from bucket `key`, which refills at `rate` per
+        second up to `burst`. Returns 0.0 if they were spent, otherwise the
+        seconds until they would be available.
+        """
+        cost = min(cost, burst)
+        now = time.monotonic()
+        tokens, last = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - last) * rate)
+        wait = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            wait = (cost - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+# Runs atomically on the server, timed by the server clock, so replicas share
+# one bucket per key. Returns a string because Redis truncates Lua numbers to
+# integers.
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = math.min(tonumber(ARGV[3]), burst)
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= cost then
+  tokens = tokens - cost
+else
+  wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class RedisRateLimitBackend:
+    """
+    Token buckets shared by every replica through a Redis-protocol server.
+    `client` is a `redis.asyncio.Redis`. Idle buckets expire once they would be
+    full again.
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_TOKEN_BUCKET_LUA)
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisRateLimitBackend":
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise ImportError(
+                "RedisRateLimitBackend.from_url requires the 'redis' package"
+            ) from exc
+        return cls(redis.from_url(url, decode_responses=True), **kwargs)
+
+    async def take(
+        self, key: str, cost: float, rate: float, burst: float
+    ) -> float:
+        wait = await self._script(
+            keys=[self.prefix + key], args=[rate, burst, cost]
+        )
+        return float(wait)
+
+
+class _LimiterState:
+    __slots__ = ("active", "waiters", "shedding", "above_since")
+
+    def __init__(self):
+        self.active = 0
+        self.waiters: deque = deque()
+        self.shedding = False
+        self.above_since: Optional[float] = None
+
+
+class ConcurrencyLimiter:
+    """
+    At most `limit` requests in flight, and at most `max_queue` queued for up
+    to `max_wait` seconds each. A request that cannot be queued or times out
+    raises `OverloadedError`.
+
+    Shedding follows CoDel: a burst drains quickly, while a queue that stays
+    up does not. Once queue waits have stayed above `target` for a whole
+    `interval`, the queue is standing, and later arrivals that cannot start
+    at once are rejected instead of queued. The first request that waits
+    less than `target` ends shedding. Limits and shedding are per event loop,
+    so each worker process enforces its own.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        max_queue: int = 256,
+        max_wait: float = 2.0,
+        target: float = 0.1,
+        interval: float = 0.5,
+    ):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.target = target
+        self.interval = interval
+        self.rejected = 0
+        self._states: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _state(self) -> _LimiterState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = self._states[loop] = _LimiterState()
+        return state
+
+    @property
+    def in_flight(self) -> int:
+        return sum(state.active for state in list(self._states.values()))
+
+    @property
+    def queued(self) -> int:
+        return sum(len(state.waiters) for state in list(self._states.values()))
+
+    @property
+    def shedding(self) -> bool:
+        return any(state.shedding for state in list(self._states.values()))
+
+    async def acquire(self) -> None:
+        state = self._state()
+        if state.active < self.limit and not state.waiters:
+            state.active += 1
+            self._record_wait(state, 0.0)
+            return
+        if len(state.waiters) >= self.max_queue or state.shedding:
+            self.rejected += 1
+            reason = (
+                "shedding load"
+                if state.shedding
+                else f"{len(state.waiters)} requests queued"
+            )
+            raise OverloadedError(f"Server overloaded ({reason})")
+        waiter = asyncio.get_running_loop().create_future()
+        state.waiters.append(waiter)
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, self.max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as we gave up; pass it on.
+                self.release()
+            else:
+                try:
+                    state.waiters.remove(waiter)
+                except ValueError:
+                    pass
+            if isinstance(exc, asyncio.TimeoutError):
+                self.rejected += 1
+                self._record_wait(state, time.monotonic() - start)
+                raise OverloadedError(
+                    f"Queued for over {self.max_wait:g}s"
+                ) from None
+            raise
+        self._record_wait(state, time.monotonic() - start)
+
+    def release(self) -> None:
+        state = self._state()
+        while state.waiters:
+            waiter = state.waiters.popleft()
+            if not waiter.done():
+                # Hand the slot straight to the next waiter; `active` stays.
+                waiter.set_result(None)
+                return
+        state.active -= 1
+
+    def _record_wait(self, state: _LimiterState, seconds: float) -> None:
+        if seconds <= self.target:
+            state.above_since = None
+            state.shedding = False
+            return
+        now = time.monotonic()
+        if state.above_since is None:
+            # Queued past the target ever since `start + target`.
+            state.above_since = now - seconds + self.target
+        if now - state.above_since >= self.interval:
+            state.shedding = True
+
+
+def _key_digests(keys) -> frozenset:
+    return frozenset(
+        hashlib.sha256(key.encode("utf-8")).hexdigest() for key in keys
+    )
+
+
+def tenant_key(
+    scope, known_keys: frozenset = frozenset(), by_ip: bool = True
+) -> Optional[str]:
+    """
+    Rate-limit key for a request: its API key if that key's SHA-256 digest is
+    in `known_keys`, else its client address, or None when `by_ip` is False.
+
+    An unknown key is ignored rather than trusted; otherwise a client could
+    get a fresh bucket, and evict other tenants' buckets, by sending a new key
+    with every request.
+    """
+    if known_keys:
+        header = settings.admission_api_key_header.lower().encode("latin-1")
+        for name, value in scope.get("headers", ()):
+            if name == header and value:
+                digest = hashlib.sha256(value).hexdigest()
+                if digest in known_keys:
+                    return "key:" + digest[:16]
+                break
+    if not by_ip:
+        return None
+    client = scope.get("client")
+    return f"ip:{client[0]}" if client else "anonymous"
+
+
+def estimate_llm_tokens(
+    prompt: str, completion_tokens: Optional[int] = None
+) -> int:
+    """
+    Rough LLM cost of a request: about four characters per prompt token, plus
+    the expected completion.
+    """
+    completion = (
+        settings.rate_limit_llm_completion_tokens
+        if completion_tokens is None
+        else completion_tokens
+    )
+    return math.ceil(len(prompt) / 4) + completion
+
+
+class AdmissionController:
+    """
+    Decides whether a request may start.
+
+    Requests first spend one token from their tenant's request-rate bucket
+    (429 when it is empty). Then they take a slot from the limiter of their
+    route, matched by longest path prefix in `route_limits` and falling back
+    to `default_limit` (503 when that limiter is full or shedding). LLM
+    routes also charge estimated tokens to a second per-tenant bucket through
+    `charge_llm_tokens`. A rate or limit of 0 disables that check. If the
+    rate-limit backend fails, requests are admitted rather than rejected.
+    Tenants are the `api_keys` (default `admission_api_keys`), plus client IPs
+    when `limit_by_ip` (default `admission_limit_by_ip`) is set; requests from
+    no tenant skip the rate limits.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        route_limits: Optional[dict[str, int]] = None,
+        default_limit: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        max_queue_wait_ms: Optional[float] = None,
+        shed_target_ms: Optional[float] = None,
+        shed_interval_ms: Optional[float] = None,
+        requests_per_second: Optional[float] = None,
+        request_burst: Optional[int] = None,
+        llm_tokens_per_minute: Optional[int] = None,
+        exempt_prefixes: Optional[list[str]] = None,
+        api_keys: Optional[list[str]] = None,
+        limit_by_ip: Optional[bool] = None,
+    ):
+        self.backend = (
+            backend if backend is not None else InMemoryRateLimitBackend()
+        )
+        self.requests_per_second = (
+            settings.rate_limit_requests_per_second
+            if requests_per_second is None
+            else requests_per_second
+        )
+        self.request_burst = (
+            settings.rate_limit_burst
+            if request_burst is None
+            else request_burst
+        )
+        self.llm_tokens_per_minute = (
+            settings.rate_limit_llm_tokens_per_minute
+            if llm_tokens_per_minute is None
+            else llm_tokens_per_minute
+        )
+        self.exempt_prefixes = tuple(
+            settings.admission_exempt_prefixes
+            if exempt_prefixes is None
+            else exempt_prefixes
+        )
+        self.known_keys = _key_digests(
+            settings.admission_api_keys if api_keys is None else api_keys
+        )
+        self.limit_by_ip = (
+            settings.admission_limit_by_ip
+            if limit_by_ip is None
+            else limit_by_ip
+        )
+        limiter_options = {
+            "max_queue": settings.admission_max_queue
+            if max_queue is None
+            else max_queue,
+            "max_wait": (
+                settings.admission_max_queue_wait_ms
+                if max_queue_wait_ms is None
+                else max_queue_wait_ms
+            )
+            / 1000,
+            "target": (
+                settings.admission_shed_target_ms
+                if shed_target_ms is None
+                else shed_target_ms
+            )
+            / 1000,
+            "interval": (
+                settings.admission_shed_interval_ms
+                if shed_interval_ms is None
+                else shed_interval_ms
+            )
+            / 1000,
+        }
+        route_limits = (
+            settings.admission_route_limits
+            if route_limits is None
+            else route_limits
+        )
+        default_limit = (
+            settings.admission_default_concurrency
+            if default_limit is None
+            else default_limit
+        )
+        # Longest prefix first, so "/genai/generate" wins over "/genai".
+        self.limiters = {
+            prefix: ConcurrencyLimiter(limit, **limiter_options)
+            for prefix, limit in sorted(
+                route_limits.items(), key=lambda item: -len(item[0])
+            )
+            if limit > 0
+        }
+        self.default_limiter = (
+            ConcurrencyLimiter(default_limit, **limiter_options)
+            if default_limit > 0
+            else None
+        )
+        self.rate_limited = 0
+        self.llm_rate_limited = 0
+
+    def tenant(self, scope) -> Optional[str]:
+        return tenant_key(scope, self.known_keys, self.limit_by_ip)
+
+    def is_exempt(self, path: str) -> bool:
+        return path.startswith(self.exempt_prefixes)
+
+    def limiter_for(self, path: str) -> Optional[ConcurrencyLimiter]:
+        for prefix, limiter in self.limiters.items():
+            if path.startswith(prefix):
+                return limiter
+        return self.default_limiter
+
+    async def take_request(self, tenant: str) -> float:
+        """
+        Seconds the tenant must wait before its next request, or 0.0 to admit
+        it now.
+        """
+        if self.requests_per_second <= 0:
+            return 0.0
+        wait = await self._take(
+            "req:" + tenant, 1, self.requests_per_second, self.request_burst
+        )
+        self.rate_limited += wait > 0
+        return wait
+
+    async def take_llm_tokens(self, tenant: str, tokens: int) -> float:
+        """
+        Seconds until the tenant can spend `tokens` LLM tokens, or 0.0 if they
+        were spent. The bucket holds one minute of budget.
+        """
+        if self.llm_tokens_per_minute <= 0:
+            return 0.0
+        wait = await self._take(
+            "llm:" + tenant,
+            tokens,
+            self.llm_tokens_per_minute / 60,
+            self.llm_tokens_per_minute,
+        )
+        self.llm_rate_limited += wait > 0
+        return wait
+
+    async def _take(
+        self, key: str, cost: float, rate: float, burst: float
+    ) -> float:
+        try:
+            return await self.backend.take(key, cost, rate, burst)
+        except Exception:
+            logger.exception("rate-limit backend failed; admitting request")
+            return 0.0
+
+    def stats(self) -> dict:
+        limiters = dict(self.limiters)
+        if self.default_limiter is not None:
+            limiters["*"] = self.default_limiter
+        return {
+            "rate_limited": self.rate_limited,
+            "llm_rate_limited": self.llm_rate_limited,
+            "routes": {
+                prefix: {
+                    "limit": limiter.limit,
+                    "in_flight": limiter.in_flight,
+                    "queued": limiter.queued,
+                    "rejected": limiter.rejected,
+                    "shedding": limiter.shedding,
+                }
+                for prefix, limiter in limiters.items()
+            },
+        }
+
+    def render(self) -> str:
+        """
+        Rejection counters and limiter gauges in Prometheus text format.
+        """
+        stats = self.stats()
+        lines = [
+            "# HELP admission_rate_limited_total"
+            " Requests rejected by a tenant token bucket.",
+            "# TYPE admission_rate_limited_total counter",
+            'admission_rate_limited_total{bucket="requests"} %d'
+            % stats["rate_limited"],
+            'admission_rate_limited_total{bucket="llm_tokens"} %d'
+            % stats["llm_rate_limited"],
+        ]
+        for name, key, kind, help_text in (
+            (
+                "admission_rejected_total",
+                "rejected",
+                "counter",
+                "Requests rejected by a full or shedding limiter.",
+            ),
+            (
+                "admission_in_flight",
+                "in_flight",
+                "gauge",
+                "Admitted requests in progress.",
+            ),
+            (
+                "admission_queued",
+                "queued",
+                "gauge",
+                "Requests waiting for a slot.",
+            ),
+            (
+                "admission_shedding",
+                "shedding",
+                "gauge",
+                "1 while the limiter is shedding load.",
+            ),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for prefix, route in stats["routes"].items():
+                lines.append(
+                    '%s{route_prefix="%s"} %d' % (name, prefix, route[key])
+                )
+        return "\n".join(lines) + "\n"
+
+
+@lru_cache(maxsize=None)
+def get_controller() -> AdmissionController:
+    if settings.admission_backend == "redis":
+        backend = RedisRateLimitBackend.from_url(settings.redis_url)
+    else:
+        backend = InMemoryRateLimitBackend()
+    return AdmissionController(backend)
+
+
+async def _reject(send, status: int, detail: str, retry_after: float) -> None:
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (
+                    b"retry-after",
+                    str(max(1, math.ceil(retry_after))).encode("latin-1"),
+                ),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionMiddleware:
+    """
+    Pure ASGI middleware that applies an `AdmissionController` before routing.
+
+    Exempt paths (health checks, metrics) skip every check, so probes stay
+    fast while the API is saturated. The controller and tenant key are stored
+    in `request.state.admission` and `request.state.tenant` for route-level
+    checks such as `charge_llm_tokens`.
+    """
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.controller = controller
+        self.enabled = controller is not None or settings.admission_enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+        controller = (
+            self.controller
+            if self.controller is not None
+            else get_controller()
+        )
+        if controller.is_exempt(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        tenant = controller.tenant(scope)
+        state = scope.setdefault("state", {})
+        state["admission"], state["tenant"] = controller, tenant
+        if tenant is not None:
+            wait = await controller.take_request(tenant)
+            if wait > 0:
+                await _reject(send, 429, "Rate limit exceeded", wait)
+                return
+        limiter = controller.limiter_for(scope["path"])
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await limiter.acquire()
+        except OverloadedError as exc:
+            await _reject(send, 503, str(exc), limiter.interval)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+async def charge_llm_tokens(request: Request, tokens: int) -> None:
+    """
+    Spend `tokens` from the caller's LLM token bucket, raising a 429 with
+    Retry-After when it is empty. A no-op unless `AdmissionMiddleware` admitted
+    the request for a tenant.
+    """
+    controller = getattr(request.state, "admission", None)
+    tenant = getattr(request.state, "tenant", None)
+    if controller is None or tenant is None:
+        return
+    wait = await controller.take_llm_tokens(tenant, tokens)
+    if wait > 0:
+        raise HTTPException(
+            status_code=429,
+            detail="LLM token rate limit exceeded",
+            headers={"Retry-After": str(max(1, math.ceil(wait)))},
+        )
@@ -1,6 +1,24 @@
 # app.py
 from fastapi import FastAPI
-from .routers import health_router, genai_router, ml_router
+
+{% if cookiecutter.use_vector_db == "yes" -%}
+from ..config.settings import settings
+from ..infrastructure.storage.vector_db import open_shared
+{% endif -%}
+from .admission import AdmissionMiddleware
+from .middleware import MetricsMiddleware
+{%- if cookiecutter.use_agents == "yes" %}
+from .routers import (
+    agent_router,
+    genai_router,
+    health_router,
+    metrics_router,
+    ml_router,
+)
+{%- else %}
+from .routers import genai_router, health_router, metrics_router, ml_router
+{%- endif %}
+
 
 def create_app() -> FastAPI:
     """
@@ -9,11 +27,29 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title="AI Template API",
         description="API for AI/ML operations",
-        version="0.1.0"
+        version="0.1.0",
     )
+    # Starlette puts each added middleware outside the ones before it, so
+    # MetricsMiddleware (added last) is outermost and also times rejected
+    # requests.
+    app.add_middleware(AdmissionMiddleware)
+    app.add_middleware(MetricsMiddleware)
     app.include_router(health_router.router)
+    app.include_router(metrics_router.router)
     app.include_router(genai_router.router)
     app.include_router(ml_router.router)
+{%- if cookiecutter.use_agents == "yes" %}
+    app.include_router(agent_router.router)
+{%- endif %}
+    # Called by serving.preload in the parent process before workers fork.
+    app.state.preload_hooks = [ml_router.registry.get]
+{%- if cookiecutter.use_vector_db == "yes" %}
+    if settings.vector_db_path:
+        app.state.preload_hooks.append(
+            lambda: open_shared(settings.vector_db_path)
+        )
+{%- endif %}
     return app
 
-app = create_app()
\ No newline at end of file
+
+app = create_app()
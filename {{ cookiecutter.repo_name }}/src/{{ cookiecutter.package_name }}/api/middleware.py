@@ -1,13 +1,245 @@
 # middleware.py
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-import time
 import logging
+import random
+import time
+from bisect import bisect_left
+from typing import Optional, Sequence
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds; the implicit last bucket is +Inf.
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _labels(**labels) -> str:
+    escaped = (
+        '%s="%s"'
+        % (
+            key,
+            str(value)
+            .replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\n", "\\n"),
+        )
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+class _RouteMetrics:
+    __slots__ = (
+        "buckets",
+        "duration_sum",
+        "count",
+        "request_bytes",
+        "response_bytes",
+        "statuses",
+    )
+
+    def __init__(self, n_buckets: int):
+        self.buckets = [0] * (n_buckets + 1)
+        self.duration_sum = 0.0
+        self.count = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.statuses: dict[int, int] = {}
+
+
+class HTTPMetrics:
+    """
+    Per-route request counters and latency histograms.
+
+    Updates are plain integer increments made from the event-loop thread
+    (the middleware never runs on worker threads), so they need no locks.
+    Histogram buckets are non-cumulative and made cumulative only when
+    rendered. Routes are labelled by their path template (e.g.
+    `/items/{id}`), and unmatched paths share one label to bound
+    cardinality. With several worker processes, each worker keeps its own
+    counters.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(buckets)
+        self.in_flight = 0
+        self._routes: dict[tuple[str, str], _RouteMetrics] = {}
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        duration_ns: int,
+        request_bytes: int,
+        response_bytes: int,
+    ) -> None:
+        metrics = self._routes.get((method, route))
+        if metrics is None:
+            metrics = self._routes[(method, route)] = _RouteMetrics(
+                len(self.bounds)
+            )
+        seconds = duration_ns / 1e9
+        metrics.buckets[bisect_left(self.bounds, seconds)] += 1
+        metrics.duration_sum += seconds
+        metrics.count += 1
+        metrics.request_bytes += request_bytes
+        metrics.response_bytes += response_bytes
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition format.
+        """
+        lines = [
+            "# HELP http_requests_in_progress"
+            " Requests currently being served.",
+            "# TYPE http_requests_in_progress gauge",
+            f"http_requests_in_progress {self.in_flight}",
+            "# HELP http_requests_total Completed HTTP requests.",
+            "# TYPE http_requests_total counter",
+        ]
+        routes = list(self._routes.items())
+        for (method, route), metrics in routes:
+            for status, count in list(metrics.statuses.items()):
+                labels = _labels(method=method, route=route, status=status)
+                lines.append(f"http_requests_total{labels} {count}")
+        lines += [
+            "# HELP http_request_duration_seconds Request latency.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), metrics in routes:
+            cumulative = 0
+            for bound, count in zip(
+                self.bounds + (float("inf"),), metrics.buckets
+            ):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _labels(method=method, route=route, le=le)
+                lines.append(
+                    f"http_request_duration_seconds_bucket{labels}"
+                    f" {cumulative}"
+                )
+            labels = _labels(method=method, route=route)
+            lines.append(
+                f"http_request_duration_seconds_sum{labels}"
+                f" {metrics.duration_sum}"
+            )
+            lines.append(
+                f"http_request_duration_seconds_count{labels} {metrics.count}"
+            )
+        for name, attr, help_text in (
+            (
+                "http_request_size_bytes_total",
+                "request_bytes",
+                "Request body bytes received.",
+            ),
+            (
+                "http_response_size_bytes_total",
+                "response_bytes",
+                "Response body bytes sent.",
+            ),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (method, route), metrics in routes:
+                labels = _labels(method=method, route=route)
+                lines.append(f"{name}{labels} {getattr(metrics, attr)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = HTTPMetrics()
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware that records `metrics` for every HTTP request.
+
+    Streaming responses pass straight through, and their latency covers the
+    time until the last body chunk is sent. Instead of a log line per request,
+    only requests slower than `slow_request_ms` are logged, and only a
+    `sample_rate` fraction of those.
+    """
+
+    def __init__(
+        self,
+        app,
+        registry: Optional[HTTPMetrics] = None,
+        slow_request_ms: Optional[float] = None,
+        sample_rate: Optional[float] = None,
+    ):
+        self.app = app
+        self.registry = registry if registry is not None else metrics
+        slow_ms = (
+            settings.slow_request_log_ms
+            if slow_request_ms is None
+            else slow_request_ms
+        )
+        self.slow_ns = int(slow_ms * 1e6)
+        self.sample_rate = (
+            settings.slow_request_log_sample_rate
+            if sample_rate is None
+            else sample_rate
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        registry = self.registry
+        status = 500
+        request_bytes = 0
+        response_bytes = 0
+
+        async def counting_receive():
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        logging.info(f"{request.method} {request.url.path} completed in {process_time:.2f}s")
-        return response
+        registry.in_flight += 1
+        start = time.perf_counter_ns()
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            duration = time.perf_counter_ns() - start
+            registry.in_flight -= 1
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "<unmatched>"
+            registry.observe(
+                scope["method"],
+                path,
+                status,
+                duration,
+                request_bytes,
+                response_bytes,
+            )
+            if duration >= self.slow_ns and random.random() < self.sample_rate:
+                logger.warning(
+                    "slow request: %s %s -> %d in %.1f ms",
+                    scope["method"],
+                    scope["path"],
+                    status,
+                    duration / 1e6,
+                )
@@ -1,11 +1,42 @@
 # models.py
-from pydantic import BaseModel
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
 
 class TextGenerationRequest(BaseModel):
     prompt: str
 
+
 class TextGenerationResponse(BaseModel):
     result: str
 
+
+class BatchTextRequest(BaseModel):
+    # A plain list of str: validated element-wise without building a model per
+    # row.
+    texts: List[str]
+
+
+class BatchResponse(BaseModel):
+    results: List[str]
+
+
+class ForecastRequest(BaseModel):
+    series: List[List[float]]
+    horizon: int = Field(1, ge=1, le=1000)
+    method: Literal["seasonal_naive", "ses", "ar"] = "ses"
+    season_length: Optional[int] = Field(None, ge=1)
+    order: Optional[int] = Field(None, ge=1)
+
+
+class ForecastResponse(BaseModel):
+    forecasts: List[List[float]]
+
+
+class ModelPromotionRequest(BaseModel):
+    version: str
+
+
 class HealthResponse(BaseModel):
     status: str
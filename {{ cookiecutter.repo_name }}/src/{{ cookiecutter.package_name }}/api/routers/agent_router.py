@@ -1,11 +1,20 @@
 # agent_router.py
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, HTTPException
+
+from ...config.settings import settings
 from ...models.agents.agent_manager import AgentManager
-from ...models.agents.agent_protocols import AgentCard, MCPRequest, MCPResponse
+from ...models.agents.agent_protocols import (
+    AgentCard,
+    MCPBatchRequest,
+    MCPBatchResponse,
+    MCPRequest,
+    MCPResponse,
+)
 
 router = APIRouter(prefix="/agents", tags=["Agents"])
 manager = AgentManager()
 
+
 @router.get("/card", response_model=AgentCard)
 def get_agent_card():
     """
@@ -13,9 +22,33 @@ def get_agent_card():
     """
     return manager.get_agent_card()
 
+
 @router.post("/mcp", response_model=MCPResponse)
-def handle_mcp(request: MCPRequest):
+async def handle_mcp(request: MCPRequest):
+    """
+    Handle an MCP (Model Context Protocol) request for tool invocation or
+    context injection.
+    """
+    return await manager.handle_mcp(request)
+
+
+@router.post("/mcp/batch", response_model=MCPBatchResponse)
+async def handle_mcp_batch(request: MCPBatchRequest):
+    """
+    Run several MCP tool calls concurrently, each under its tool's timeout and
+    concurrency cap.
+    """
+    if len(request.calls) > settings.agent_max_batch_calls:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {settings.agent_max_batch_calls} calls",
+        )
+    return await manager.handle_mcp_batch(request)
+
+
+@router.get("/tools/stats")
+def tool_stats():
     """
-    Handle an MCP (Model Context Protocol) request for tool invocation or context injection.
+    Per-tool call counts, errors, timeouts and latency percentiles.
     """
-    return manager.handle_mcp(request)
\ No newline at end of file
+    return manager.tool_stats()
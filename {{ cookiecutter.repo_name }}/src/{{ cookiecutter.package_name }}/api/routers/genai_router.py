@@ -1,13 +1,69 @@
 # genai_router.py
-from fastapi import APIRouter
-from ...models.genai.text_generation import generate_text
+import json
+
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+
+from ...api.admission import charge_llm_tokens, estimate_llm_tokens
+from ...api.models import TextGenerationRequest, TextGenerationResponse
+from ...models.genai.text_generation import (
+    agenerate_text,
+    get_response_cache,
+    stream_text,
+)
 
 router = APIRouter(prefix="/genai", tags=["GenAI"])
 
-@router.post("/generate")
-def generate(prompt: str):
+SSE_MEDIA_TYPE = "text/event-stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def _sse(tokens):
+    async for token in tokens:
+        yield f"data: {json.dumps({'token': token})}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+async def _ndjson(tokens):
+    async for token in tokens:
+        yield json.dumps({"token": token}) + "\n"
+    yield json.dumps({"done": True}) + "\n"
+
+
+@router.post("/generate", response_model=TextGenerationResponse)
+async def generate(request: TextGenerationRequest, http_request: Request):
     """
     Generate text using a GenAI model.
+
+    Send `Accept: text/event-stream` for Server-Sent Events or
+    `Accept: application/x-ndjson` for newline-delimited JSON; tokens are
+    forwarded as the provider produces them. A client disconnect cancels the
+    response task, which closes the upstream provider stream. Each call is
+    charged its estimated tokens against the caller's LLM token rate limit.
+    """
+    await charge_llm_tokens(http_request, estimate_llm_tokens(request.prompt))
+    accept = http_request.headers.get("accept", "")
+    if SSE_MEDIA_TYPE in accept:
+        return StreamingResponse(
+            _sse(stream_text(request.prompt)),
+            media_type=SSE_MEDIA_TYPE,
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    if NDJSON_MEDIA_TYPE in accept:
+        return StreamingResponse(
+            _ndjson(stream_text(request.prompt)), media_type=NDJSON_MEDIA_TYPE
+        )
+    result = await agenerate_text(request.prompt)
+    return TextGenerationResponse(result=result)
+
+
+@router.get("/cache")
+def cache_stats():
+    """
+    Response-cache hit ratio and coalesced-request counts.
     """
-    result = generate_text(prompt)
-    return {"result": result}
\ No newline at end of file
+    cache = get_response_cache()
+    return {
+        "enabled": cache is not None,
+        **(cache.stats() if cache is not None else {}),
+    }
@@ -1,11 +1,22 @@
 # health_router.py
 from fastapi import APIRouter
 
+from ...utils.memory import process_memory
+
 router = APIRouter(prefix="/health", tags=["Health"])
 
+
 @router.get("/")
 def health_check():
     """
     Health check endpoint.
     """
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@router.get("/memory")
+def memory():
+    """
+    RSS/PSS of the worker serving this request.
+    """
+    return process_memory()
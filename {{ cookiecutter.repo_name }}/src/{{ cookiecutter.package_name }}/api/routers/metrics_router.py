@@ -0,0 +1,21 @@
+# metrics_router.py
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from ...config.settings import settings
+from ..admission import get_controller
+from ..middleware import PROMETHEUS_CONTENT_TYPE, metrics
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """
+    Request and admission-control metrics of this worker in Prometheus text
+    format.
+    """
+    body = metrics.render()
+    if settings.admission_enabled:
+        body += get_controller().render()
+    return Response(body, media_type=PROMETHEUS_CONTENT_TYPE)
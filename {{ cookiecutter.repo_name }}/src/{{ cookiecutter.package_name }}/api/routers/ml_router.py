@@ -1,16 +1,205 @@
 # ml_router.py
-from fastapi import APIRouter
+import hmac
+import json
+from typing import Callable, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from ...api.models import (
+    BatchResponse,
+    BatchTextRequest,
+{%- if cookiecutter.use_forecasting == "yes" %}
+    ForecastRequest,
+    ForecastResponse,
+{%- endif %}
+    ModelPromotionRequest,
+    TextGenerationRequest,
+    TextGenerationResponse,
+)
+from ...config.settings import settings
+from ...core.errors import OverloadedError
 from ...models.ml.classification.model import ClassificationModel
-from ...api.models import TextGenerationRequest, TextGenerationResponse
+from ...models.ml.registry import ModelRegistry
+from ...services.classification_service import predict_classes
+{% if cookiecutter.use_forecasting == "yes" -%}
+from ...services.forecasting_service import forecast_series
+{% endif -%}
+{% if cookiecutter.use_sentiment == "yes" -%}
+from ...services.sentiment_service import predict_sentiments
+{% endif -%}
+{% if cookiecutter.use_summarization == "yes" -%}
+from ...services.summarization_service import summarize_texts
+{% endif -%}
+from ...utils.batching import MicroBatcher
 
 router = APIRouter(prefix="/ml", tags=["ML"])
 
-model = ClassificationModel()
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+registry = ModelRegistry(
+    settings.model_registry_path,
+    default_factory=ClassificationModel,
+    warmup_inputs=["warm-up"] * settings.model_warmup_batch_size,
+    refresh_interval=settings.model_refresh_interval_seconds,
+)
+
+
+def _predict_batch(xs: list) -> list:
+    # Resolve the model per batch so a promotion takes effect on the next
+    # batch, including promotions made by another pre-forked worker.
+    registry.maybe_refresh()
+    return registry.get().predict_batch(xs)
+
+
+batcher = MicroBatcher(
+    _predict_batch,
+    max_batch_size=settings.ml_max_batch_size,
+    max_wait_ms=settings.ml_max_batch_wait_ms,
+    max_queue_size=settings.ml_max_queue_size,
+)
+
 
 @router.post("/predict", response_model=TextGenerationResponse)
-def predict(request: TextGenerationRequest):
+async def predict(request: TextGenerationRequest):
     """
     Predict using a dummy classification model.
+    Concurrent requests are micro-batched into one `predict_batch` call.
     """
-    prediction = model.predict(request.prompt)
+    try:
+        prediction = await batcher.submit(request.prompt)
+    except OverloadedError as exc:
+        raise HTTPException(
+            status_code=429, detail=str(exc), headers={"Retry-After": "1"}
+        )
     return TextGenerationResponse(result=str(prediction))
+
+
+def _ndjson_lines(fn: Callable[[list[str]], list], texts: list[str]):
+    chunk_size = settings.batch_stream_chunk_size
+    for start in range(0, len(texts), chunk_size):
+        results = fn(texts[start : start + chunk_size])
+        yield "".join(
+            json.dumps({"index": start + i, "result": str(result)}) + "\n"
+            for i, result in enumerate(results)
+        )
+
+
+def _batch(
+    fn: Callable[[list[str]], list],
+    request: BatchTextRequest,
+    http_request: Request,
+):
+    """
+    Run a list-in/list-out function over a request batch.
+
+    Responses are serialized directly, skipping per-row response-model
+    validation. With `Accept: application/x-ndjson` results stream back one
+    JSON line per item as each chunk is scored.
+    """
+    texts = request.texts
+    if len(texts) > settings.max_batch_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {settings.max_batch_items} items",
+        )
+    if NDJSON_MEDIA_TYPE in http_request.headers.get("accept", ""):
+        return StreamingResponse(
+            _ndjson_lines(fn, texts), media_type=NDJSON_MEDIA_TYPE
+        )
+    return JSONResponse({"results": [str(result) for result in fn(texts)]})
+
+
+@router.post("/predict_batch", response_model=BatchResponse)
+def predict_batch(request: BatchTextRequest, http_request: Request):
+    """
+    Predict a batch of texts with the classification model in one call.
+    """
+    return _batch(_predict_batch, request, http_request)
+
+
+@router.post("/classify_batch", response_model=BatchResponse)
+def classify_batch(request: BatchTextRequest, http_request: Request):
+    """
+    Classify a batch of texts with the classification service.
+    """
+    return _batch(predict_classes, request, http_request)
+
+
+{% if cookiecutter.use_sentiment == "yes" -%}
+@router.post("/sentiment_batch", response_model=BatchResponse)
+def sentiment_batch(request: BatchTextRequest, http_request: Request):
+    """
+    Predict sentiment for a batch of texts.
+    """
+    return _batch(predict_sentiments, request, http_request)
+
+
+{% endif -%}
+{% if cookiecutter.use_summarization == "yes" -%}
+@router.post("/summarize_batch", response_model=BatchResponse)
+def summarize_batch(request: BatchTextRequest, http_request: Request):
+    """
+    Summarize a batch of texts.
+    """
+    return _batch(summarize_texts, request, http_request)
+
+
+{% endif -%}
+{% if cookiecutter.use_forecasting == "yes" -%}
+@router.post("/forecast", response_model=ForecastResponse)
+def forecast(request: ForecastRequest):
+    """
+    Forecast `horizon` steps for a batch of series, fitted together in one
+    vectorized pass.
+    """
+    if len(request.series) > settings.max_batch_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {settings.max_batch_items} items",
+        )
+    try:
+        forecasts = forecast_series(
+            request.series,
+            request.horizon,
+            request.method,
+            season_length=request.season_length,
+            order=request.order,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return JSONResponse({"forecasts": forecasts})
+
+
+{% endif -%}
+@router.get("/model")
+def model_info():
+    """
+    The serving model version and its recorded metrics.
+    """
+    registry.maybe_refresh()
+    return {"version": registry.version, "metrics": registry.metrics}
+
+
+@router.post("/model/promote")
+def promote_model(
+    request: ModelPromotionRequest, x_admin_token: Optional[str] = Header(None)
+):
+    """
+    Load, warm up and atomically switch to another model version.
+    Requires the `model_admin_token` setting, sent as `X-Admin-Token`.
+    """
+    token = settings.model_admin_token
+    if (
+        not token
+        or not x_admin_token
+        or not hmac.compare_digest(x_admin_token.encode(), token.encode())
+    ):
+        raise HTTPException(
+            status_code=403, detail="Model promotion is not allowed"
+        )
+    try:
+        registry.promote(request.version)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    return {"version": registry.version}
@@ -3,6 +3,7 @@ import typer
 
 app = typer.Typer()
 
+
 @app.command()
 def hello(name: str):
     """
@@ -10,5 +11,6 @@ def hello(name: str):
     """
     typer.echo(f"Hello, {name}!")
 
+
 if __name__ == "__main__":
-    app()
\ No newline at end of file
+    app()
@@ -1,9 +1,11 @@
 # commands.py
 import typer
+
 from ..services.summarization_service import summarize_text
 
 app = typer.Typer()
 
+
 @app.command()
 def summarize(text: str):
     """
@@ -12,4 +14,5 @@ def summarize(text: str):
     summary = summarize_text(text)
     typer.echo(f"Summary: {summary}")
 
+
 # Add more CLI commands as needed for your workflows
@@ -1,7 +1,9 @@
 # Env loader
-from pydantic import BaseSettings
-from typing import Literal
 import os
+from typing import Literal
+
+from pydantic import BaseSettings
+
 
 class EnvironmentSettings(BaseSettings):
     environment: Literal["dev", "prod", "test"] = "dev"
@@ -13,6 +15,9 @@ class EnvironmentSettings(BaseSettings):
         env_file = ".env"
         env_file_encoding = "utf-8"
 
+
 # Load settings based on environment variable, default to dev
 ENV = os.getenv("APP_ENV", "dev")
-settings = EnvironmentSettings(_env_file=f".env.{ENV}" if os.path.exists(f".env.{ENV}") else ".env")
+settings = EnvironmentSettings(
+    _env_file=f".env.{ENV}" if os.path.exists(f".env.{ENV}") else ".env"
+)
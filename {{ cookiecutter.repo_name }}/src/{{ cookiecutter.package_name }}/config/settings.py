@@ -1,8 +1,114 @@
 # settings.py
 from pydantic import BaseSettings
 
+
 class Settings(BaseSettings):
     app_name: str = "AI Template"
     debug: bool = False
 
-settings = Settings()
\ No newline at end of file
+    # LLM providers ("azure_openai", "gemini", or empty for the dummy
+    # generator)
+    llm_provider: str = ""
+    azure_openai_endpoint: str = ""
+    azure_openai_api_key: str = ""
+    azure_openai_api_version: str = "2024-02-01"
+    azure_openai_deployment: str = "gpt-4o-mini"
+    azure_openai_embedding_deployment: str = "text-embedding-3-small"
+    gemini_api_key: str = ""
+    gemini_model: str = "gemini-1.5-flash"
+    gemini_embedding_model: str = "text-embedding-004"
+    llm_max_concurrency: int = 64
+    llm_timeout_seconds: float = 60.0
+
+    # LLM retries (utils/retry.py); hedging duplicates slow requests, so it is
+    # opt-in
+    llm_max_retries: int = 3
+    llm_hedge_requests: bool = False
+    llm_hedge_quantile: float = 0.95
+
+    # LLM response cache ("memory" or "redis")
+    llm_cache_enabled: bool = True
+    llm_cache_backend: str = "memory"
+    llm_cache_ttl_seconds: float = 300.0
+    llm_cache_max_entries: int = 10_000
+    redis_url: str = "redis://localhost:6379/0"
+
+    # ML micro-batching for /ml/predict
+    ml_max_batch_size: int = 32
+    ml_max_batch_wait_ms: float = 5.0
+    ml_max_queue_size: int = 1024
+
+    # Pre-forking server (serving.py)
+    web_concurrency: int = 1
+    worker_memory_report_delay_seconds: float = 10.0
+    # A worker that exits sooner than this after starting is restarted with
+    # exponential backoff
+    worker_min_uptime_seconds: float = 30.0
+    worker_restart_max_delay_seconds: float = 30.0
+
+    # Model registry
+    model_registry_path: str = "model_registry"
+    model_warmup_batch_size: int = 8
+    # How often each worker checks CURRENT for a version promoted elsewhere
+    model_refresh_interval_seconds: float = 5.0
+    # POST /ml/model/promote requires this in X-Admin-Token; empty disables the
+    # endpoint
+    model_admin_token: str = ""
+
+    # Batch endpoints
+    max_batch_items: int = 10_000
+    batch_stream_chunk_size: int = 500
+
+    # Saved VectorDB that serving.py opens read-only before forking workers;
+    # empty skips it
+    vector_db_path: str = ""
+
+    # RAG retrieval (services/rag_service.py)
+    rag_top_k: int = 5
+    rag_candidates: int = 50
+    rag_rrf_k: int = 60
+    rag_vector_weight: float = 1.0
+    rag_lexical_weight: float = 1.0
+    rag_context_token_budget: int = 3000
+
+    # Agent tools (models/agents); 0 process workers means one per CPU
+    agent_tool_timeout_seconds: float = 30.0
+    agent_tool_max_concurrency: int = 16
+    agent_tool_process_workers: int = 0
+    agent_max_batch_calls: int = 64
+
+    # Request metrics (api/middleware.py)
+    slow_request_log_ms: float = 1000.0
+    slow_request_log_sample_rate: float = 0.1
+
+    # Admission control (api/admission.py); a limit or rate of 0 disables that
+    # check. The "redis" backend shares rate-limit buckets across replicas via
+    # redis_url.
+    admission_enabled: bool = True
+    admission_backend: str = "memory"
+    admission_route_limits: dict[str, int] = {
+        "/genai": 32,
+        "/agents": 64,
+        "/ml": 128,
+    }
+    admission_default_concurrency: int = 256
+    admission_max_queue: int = 256
+    admission_max_queue_wait_ms: float = 2000.0
+    admission_shed_target_ms: float = 100.0
+    admission_shed_interval_ms: float = 500.0
+    admission_exempt_prefixes: list[str] = ["/health", "/metrics"]
+    admission_api_key_header: str = "x-api-key"
+    # Keys in that header that get their own rate-limit buckets
+    admission_api_keys: list[str] = []
+    # Also rate-limit other requests per client IP. Only enable this when the
+    # client address is the real client's: behind a load balancer, uvicorn
+    # must trust its forwarded headers (FORWARDED_ALLOW_IPS), or every request
+    # shares the proxy's bucket.
+    admission_limit_by_ip: bool = False
+    rate_limit_requests_per_second: float = 50.0
+    rate_limit_burst: int = 100
+    rate_limit_llm_tokens_per_minute: int = 100_000
+    rate_limit_llm_completion_tokens: int = 256
+
+
+settings = Settings()
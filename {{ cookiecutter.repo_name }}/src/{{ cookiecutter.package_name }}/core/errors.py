@@ -1,5 +1,26 @@
 # errors.py
+import asyncio
+
 
 class AppError(Exception):
     """Base app error."""
-    pass
\ No newline at end of file
+
+    pass
+
+
+class OverloadedError(AppError):
+    """Raised when a bounded queue is full and new work must be rejected."""
+
+    pass
+
+
+class CircuitOpenError(AppError):
+    """Raised without calling a dependency whose circuit breaker is open."""
+
+    pass
+
+
+class ToolTimeoutError(AppError, asyncio.TimeoutError):
+    """Raised when an agent tool does not finish within its timeout."""
+
+    pass
@@ -1,5 +1,6 @@
 # schemas.py
 from pydantic import BaseModel
 
+
 class TextRequest(BaseModel):
-    text: str
\ No newline at end of file
+    text: str
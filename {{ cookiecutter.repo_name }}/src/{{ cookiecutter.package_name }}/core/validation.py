@@ -1,7 +1,8 @@
 # validation.py
 
+
 def validate_input(data: dict) -> bool:
     """
     Dummy input validation.
     """
-    return "text" in data
\ No newline at end of file
+    return "text" in data
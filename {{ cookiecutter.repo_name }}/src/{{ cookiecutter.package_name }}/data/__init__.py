@@ -2,4 +2,4 @@
 Data subpackage for {{ cookiecutter.package_name }}.
 
 Contains sample data, fixtures, and data loading utilities.
-""" 
\ No newline at end of file
+"""
@@ -1,5 +1,98 @@
 # azure_openai.py
+import json
+from typing import AsyncIterator, Optional
 
-class AzureOpenAIProvider:
-    def generate(self, prompt: str) -> str:
-        return f"AzureOpenAI: {prompt}"
\ No newline at end of file
+from ...config.settings import settings
+from ...utils.retry import Hedger
+from .base import LLMProviderBase
+
+
+class AzureOpenAIProvider(LLMProviderBase):
+    """
+    Azure OpenAI chat-completions and embeddings provider.
+    Without a configured endpoint it echoes the prompt, for local development.
+    """
+
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        api_key: Optional[str] = None,
+        deployment: Optional[str] = None,
+        embedding_deployment: Optional[str] = None,
+        api_version: Optional[str] = None,
+        **kwargs,
+    ):
+        kwargs.setdefault("max_concurrency", settings.llm_max_concurrency)
+        kwargs.setdefault("timeout", settings.llm_timeout_seconds)
+        kwargs.setdefault("retries", settings.llm_max_retries)
+        if settings.llm_hedge_requests:
+            kwargs.setdefault(
+                "hedger", Hedger(quantile=settings.llm_hedge_quantile)
+            )
+        super().__init__(
+            base_url=endpoint
+            if endpoint is not None
+            else settings.azure_openai_endpoint,
+            api_key=api_key
+            if api_key is not None
+            else settings.azure_openai_api_key,
+            **kwargs,
+        )
+        self.deployment = deployment or settings.azure_openai_deployment
+        self.embedding_deployment = (
+            embedding_deployment or settings.azure_openai_embedding_deployment
+        )
+        self.api_version = api_version or settings.azure_openai_api_version
+
+    def headers(self) -> dict:
+        return {"api-key": self.api_key}
+
+    async def agenerate(self, prompt: str) -> str:
+        return await self.achat([{"role": "user", "content": prompt}])
+
+    async def achat(self, messages: list[dict]) -> str:
+        if not self.base_url:
+            return f"AzureOpenAI: {messages[-1]['content']}"
+        data = await self._post(
+            f"/openai/deployments/{self.deployment}/chat/completions",
+            {"messages": messages},
+            params={"api-version": self.api_version},
+        )
+        return data["choices"][0]["message"]["content"]
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        if not self.base_url:
+            for i, word in enumerate(f"AzureOpenAI: {prompt}".split(" ")):
+                yield word if i == 0 else f" {word}"
+            return
+        events = self._stream_sse(
+            f"/openai/deployments/{self.deployment}/chat/completions",
+            {
+                "messages": [{"role": "user", "content": prompt}],
+                "stream": True,
+            },
+            params={"api-version": self.api_version},
+        )
+        try:
+            async for event in events:
+                if event == "[DONE]":
+                    break
+                choices = json.loads(event).get("choices") or [{}]
+                token = choices[0].get("delta", {}).get("content")
+                if token:
+                    yield token
+        finally:
+            await events.aclose()
+
+    async def aembed(self, texts: list[str]) -> list[list[float]]:
+        if not self.base_url:
+            return [[float(ord(c)) for c in text[:10]] for text in texts]
+        data = await self._post(
+            f"/openai/deployments/{self.embedding_deployment}/embeddings",
+            {"input": texts},
+            params={"api-version": self.api_version},
+        )
+        return [
+            item["embedding"]
+            for item in sorted(data["data"], key=lambda item: item["index"])
+        ]
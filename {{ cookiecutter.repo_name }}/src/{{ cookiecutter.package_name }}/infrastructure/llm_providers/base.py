@@ -1,15 +1,218 @@
 # base.py
+import asyncio
+import threading
+import weakref
 from abc import ABC, abstractmethod
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from ...utils.retry import (
+    CircuitBreaker,
+    Hedger,
+    RetryBudget,
+    get_breaker,
+    retry_async,
+)
+
+
+class _SyncRunner:
+    """
+    One long-lived event loop on a daemon thread, shared by all sync adapters
+    so CLI and batch callers reuse pooled connections instead of a loop per
+    call.
+    """
+
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def run(cls, coro):
+        with cls._lock:
+            if cls._loop is None:
+                cls._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=cls._loop.run_forever,
+                    name="llm-sync-runner",
+                    daemon=True,
+                ).start()
+        return asyncio.run_coroutine_threadsafe(coro, cls._loop).result()
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Connection errors, timeouts, 429 and 5xx responses are transient; other 4xx
+    are not.
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, httpx.TransportError)
+
 
 class LLMProviderBase(ABC):
     """
     Abstract base class for all LLM providers.
     Ensures a consistent interface for text generation and other LLM tasks.
+
+    Providers implement the async methods (`agenerate`, `achat`, `aembed`) on
+    top of `_post`, which goes through one pooled `httpx.AsyncClient` per event
+    loop and a semaphore capping in-flight requests to `max_concurrency`. The
+    sync methods are thin adapters for the CLI and batch jobs.
+
+    `_post` retries transient failures up to `retries` attempts with jittered
+    backoff, within `retry_budget`. It fails fast while the breaker shared by
+    all providers for the same endpoint is open, and it races a hedged second
+    request against slow ones when a `hedger` is given. The backoff sleeps do
+    not hold a concurrency slot.
     """
 
+    def __init__(
+        self,
+        base_url: str = "",
+        api_key: str = "",
+        max_concurrency: int = 64,
+        timeout: float = 60.0,
+        max_connections: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        retries: int = 3,
+        retry_base_delay: float = 0.2,
+        retry_budget: Optional[RetryBudget] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        hedger: Optional[Hedger] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_connections = max_connections or max_concurrency
+        self.transport = transport
+        self.in_flight = 0
+        self.retries = retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_budget = (
+            retry_budget if retry_budget is not None else RetryBudget()
+        )
+        self.breaker = (
+            breaker
+            if breaker is not None
+            else get_breaker(f"llm:{type(self).__name__}:{self.base_url}")
+        )
+        self.hedger = hedger
+        # Per event loop: (client, semaphore)
+        self._resources: weakref.WeakKeyDictionary = (
+            weakref.WeakKeyDictionary()
+        )
+
     @abstractmethod
-    def generate(self, prompt: str) -> str:
+    async def agenerate(self, prompt: str) -> str:
         """
         Generate text from a prompt using the LLM provider.
         """
-        pass
+
+    @abstractmethod
+    async def achat(self, messages: list[dict]) -> str:
+        """
+        Continue a chat given a list of {"role", "content"} messages.
+        """
+
+    @abstractmethod
+    async def aembed(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed a batch of texts in one request.
+        """
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Yield generated text incrementally. Providers with a streaming API
+        override this; the default yields the whole completion as one chunk.
+        """
+        yield await self.agenerate(prompt)
+
+    def generate(self, prompt: str) -> str:
+        return _SyncRunner.run(self.agenerate(prompt))
+
+    def chat(self, messages: list[dict]) -> str:
+        return _SyncRunner.run(self.achat(messages))
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        return _SyncRunner.run(self.aembed(texts))
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        resources = self._resources.pop(loop, None)
+        if resources is not None:
+            await resources[0].aclose()
+
+    def headers(self) -> dict:
+        return {}
+
+    async def _post(
+        self, path: str, payload: dict, params: Optional[dict] = None
+    ) -> dict:
+        return await retry_async(
+            self._post_once,
+            path,
+            payload,
+            params,
+            retries=self.retries,
+            base_delay=self.retry_base_delay,
+            retry_on=is_retryable,
+            budget=self.retry_budget,
+            breaker=self.breaker,
+            hedger=self.hedger,
+        )
+
+    async def _post_once(
+        self, path: str, payload: dict, params: Optional[dict] = None
+    ) -> dict:
+        client, semaphore = self._loop_resources()
+        async with semaphore:
+            self.in_flight += 1
+            try:
+                response = await client.post(path, json=payload, params=params)
+                response.raise_for_status()
+                return response.json()
+            finally:
+                self.in_flight -= 1
+
+    async def _stream_sse(
+        self, path: str, payload: dict, params: Optional[dict] = None
+    ) -> AsyncIterator[str]:
+        """
+        POST and yield the `data:` payloads of a Server-Sent Events response.
+        Closing the iterator early (e.g. on client disconnect) closes the
+        upstream connection, which cancels the generation.
+        """
+        client, semaphore = self._loop_resources()
+        async with semaphore:
+            self.in_flight += 1
+            try:
+                async with client.stream(
+                    "POST", path, json=payload, params=params
+                ) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if line.startswith("data:"):
+                            yield line[5:].strip()
+            finally:
+                self.in_flight -= 1
+
+    def _loop_resources(self) -> tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        # Clients and semaphores are bound to the loop they were created on.
+        loop = asyncio.get_running_loop()
+        resources = self._resources.get(loop)
+        if resources is None:
+            client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers(),
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                transport=self.transport,
+            )
+            resources = (client, asyncio.Semaphore(self.max_concurrency))
+            self._resources[loop] = resources
+        return resources
@@ -1,9 +1,103 @@
 # gemini.py
+import json
+from typing import AsyncIterator, Optional
 
-class GeminiProvider:
+from ...config.settings import settings
+from ...utils.retry import Hedger
+from .base import LLMProviderBase
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+
+class GeminiProvider(LLMProviderBase):
     """
-    Example Gemini LLM provider for text generation.
+    Gemini generateContent and batch embeddings provider.
+    Without a configured API key it echoes the prompt, for local development.
     """
-    def generate(self, prompt: str) -> str:
-        # Replace with actual Gemini API call in production
-        return f"Gemini: {prompt}"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        embedding_model: Optional[str] = None,
+        base_url: str = GEMINI_BASE_URL,
+        **kwargs,
+    ):
+        kwargs.setdefault("max_concurrency", settings.llm_max_concurrency)
+        kwargs.setdefault("timeout", settings.llm_timeout_seconds)
+        kwargs.setdefault("retries", settings.llm_max_retries)
+        if settings.llm_hedge_requests:
+            kwargs.setdefault(
+                "hedger", Hedger(quantile=settings.llm_hedge_quantile)
+            )
+        super().__init__(
+            base_url=base_url,
+            api_key=api_key
+            if api_key is not None
+            else settings.gemini_api_key,
+            **kwargs,
+        )
+        self.model = model or settings.gemini_model
+        self.embedding_model = (
+            embedding_model or settings.gemini_embedding_model
+        )
+
+    def headers(self) -> dict:
+        return {"x-goog-api-key": self.api_key}
+
+    async def agenerate(self, prompt: str) -> str:
+        return await self.achat([{"role": "user", "content": prompt}])
+
+    async def achat(self, messages: list[dict]) -> str:
+        if not self.api_key:
+            # Replace with actual Gemini API call in production
+            return f"Gemini: {messages[-1]['content']}"
+        contents = [
+            {
+                "role": "model" if m["role"] == "assistant" else "user",
+                "parts": [{"text": m["content"]}],
+            }
+            for m in messages
+        ]
+        data = await self._post(
+            f"/models/{self.model}:generateContent", {"contents": contents}
+        )
+        return "".join(
+            part.get("text", "")
+            for part in data["candidates"][0]["content"]["parts"]
+        )
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        if not self.api_key:
+            for i, word in enumerate(f"Gemini: {prompt}".split(" ")):
+                yield word if i == 0 else f" {word}"
+            return
+        events = self._stream_sse(
+            f"/models/{self.model}:streamGenerateContent",
+            {"contents": [{"role": "user", "parts": [{"text": prompt}]}]},
+            params={"alt": "sse"},
+        )
+        try:
+            async for event in events:
+                for candidate in json.loads(event).get("candidates", [])[:1]:
+                    for part in candidate.get("content", {}).get("parts", []):
+                        if part.get("text"):
+                            yield part["text"]
+        finally:
+            await events.aclose()
+
+    async def aembed(self, texts: list[str]) -> list[list[float]]:
+        if not self.api_key:
+            return [[float(ord(c)) for c in text[:10]] for text in texts]
+        requests = [
+            {
+                "model": f"models/{self.embedding_model}",
+                "content": {"parts": [{"text": text}]},
+            }
+            for text in texts
+        ]
+        data = await self._post(
+            f"/models/{self.embedding_model}:batchEmbedContents",
+            {"requests": requests},
+        )
+        return [item["values"] for item in data["embeddings"]]
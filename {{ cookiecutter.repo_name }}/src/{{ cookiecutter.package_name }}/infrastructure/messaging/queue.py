@@ -1,5 +1,416 @@
 # queue.py
+import asyncio
+import inspect
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, Sequence, Union
+
+
+@dataclass
+class Message:
+    id: int
+    body: str
+    attempts: int = 0
+    enqueued_at: float = 0.0
+
+
+class InMemoryQueueBackend:
+    """
+    Non-durable backend for tests and single-process use.
+    """
+
+    def __init__(self):
+        self._ready: dict[str, deque] = {}
+        self._delayed: dict[str, list[tuple[float, Message]]] = {}
+        self._in_flight: dict[
+            int, tuple[str, float, Message, Optional[int]]
+        ] = {}
+        self._dead: dict[str, list[Message]] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def publish(self, queue: str, bodies: Sequence[str]) -> None:
+        now = time.time()
+        with self._lock:
+            ready = self._ready.setdefault(queue, deque())
+            for body in bodies:
+                ready.append(Message(self._next_id, body, 0, now))
+                self._next_id += 1
+
+    def reserve(
+        self,
+        queue: str,
+        limit: int,
+        visibility_timeout: float,
+        max_attempts: Optional[int] = None,
+    ) -> list[Message]:
+        """
+        Lease up to `limit` ready messages. A lease that expires without an ack
+        or nack counts as a failed attempt, and the message is dead-lettered
+        once it reaches `max_attempts`.
+        """
+        now = time.time()
+        with self._lock:
+            self._promote(queue, now)
+            ready = self._ready.setdefault(queue, deque())
+            batch = [ready.popleft() for _ in range(min(limit, len(ready)))]
+            for message in batch:
+                self._in_flight[message.id] = (
+                    queue,
+                    now + visibility_timeout,
+                    message,
+                    max_attempts,
+                )
+            return batch
+
+    def ack(self, ids: Sequence[int]) -> None:
+        with self._lock:
+            for id_ in ids:
+                self._in_flight.pop(id_, None)
+
+    def nack(self, id_: int, delay: float, max_attempts: int) -> bool:
+        """
+        Return a failed message for retry after `delay`; returns True if it was
+        dead-lettered.
+        """
+        with self._lock:
+            entry = self._in_flight.pop(id_, None)
+            if entry is None:
+                return False
+            queue, _, message, _ = entry
+            message.attempts += 1
+            if message.attempts >= max_attempts:
+                self._dead.setdefault(queue, []).append(message)
+                return True
+            self._delayed.setdefault(queue, []).append(
+                (time.time() + delay, message)
+            )
+            return False
+
+    def dead_letters(self, queue: str) -> list[Message]:
+        with self._lock:
+            return list(self._dead.get(queue, []))
+
+    def stats(self, queue: str) -> dict:
+        now = time.time()
+        with self._lock:
+            self._promote(queue, now)
+            ready = self._ready.get(queue, deque())
+            return {
+                "ready": len(ready) + len(self._delayed.get(queue, [])),
+                "in_flight": sum(
+                    1 for q, *_ in self._in_flight.values() if q == queue
+                ),
+                "dead": len(self._dead.get(queue, [])),
+                "oldest_enqueued_at": ready[0].enqueued_at if ready else None,
+            }
+
+    def _promote(self, queue: str, now: float) -> None:
+        # Delayed retries and reservations past their visibility timeout become
+        # ready again.
+        delayed = self._delayed.get(queue, [])
+        due = [m for at, m in delayed if at <= now]
+        self._delayed[queue] = [(at, m) for at, m in delayed if at > now]
+        expired = [
+            id_
+            for id_, (q, until, *_) in self._in_flight.items()
+            if q == queue and until <= now
+        ]
+        for id_ in expired:
+            _, _, message, max_attempts = self._in_flight.pop(id_)
+            message.attempts += 1
+            if max_attempts is not None and message.attempts >= max_attempts:
+                self._dead.setdefault(queue, []).append(message)
+            else:
+                due.append(message)
+        if due:
+            self._ready.setdefault(queue, deque()).extendleft(
+                sorted(due, key=lambda m: m.id, reverse=True)
+            )
+
+
+class SQLiteQueueBackend:
+    """
+    Durable local backend: messages survive restarts in a single SQLite file
+    (WAL mode).
+
+    A reserved message is hidden until its visibility timeout; if the consumer
+    dies without acking, it becomes ready again. The `attempts` column counts
+    deliveries, so a message whose leases keep expiring still dead-letters.
+    """
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS messages ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " queue TEXT NOT NULL, body TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0, enqueued_at REAL NOT NULL,"
+            " visible_at REAL NOT NULL, dead INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ready_idx"
+            " ON messages (queue, dead, visible_at, id)"
+        )
+        self._lock = threading.Lock()
+
+    def publish(self, queue: str, bodies: Sequence[str]) -> None:
+        now = time.time()
+        with self._lock, self._transaction():
+            self._conn.executemany(
+                "INSERT INTO messages (queue, body, enqueued_at, visible_at)"
+                " VALUES (?, ?, ?, ?)",
+                [(queue, body, now, now) for body in bodies],
+            )
+
+    def reserve(
+        self,
+        queue: str,
+        limit: int,
+        visibility_timeout: float,
+        max_attempts: Optional[int] = None,
+    ) -> list[Message]:
+        now = time.time()
+        with self._lock, self._transaction():
+            if max_attempts is not None:
+                # Every delivery of these ended without an ack or nack.
+                self._conn.execute(
+                    "UPDATE messages SET dead = 1"
+                    " WHERE queue = ? AND dead = 0 AND visible_at <= ?"
+                    " AND attempts >= ?",
+                    (queue, now, max_attempts),
+                )
+            rows = self._conn.execute(
+                "SELECT id, body, attempts, enqueued_at FROM messages"
+                " WHERE queue = ? AND dead = 0 AND visible_at <= ?"
+                " ORDER BY id LIMIT ?",
+                (queue, now, limit),
+            ).fetchall()
+            # Messages report their attempts before this delivery.
+            self._conn.executemany(
+                "UPDATE messages SET visible_at = ?, attempts = attempts + 1"
+                " WHERE id = ?",
+                [(now + visibility_timeout, row[0]) for row in rows],
+            )
+        return [Message(*row) for row in rows]
+
+    def ack(self, ids: Sequence[int]) -> None:
+        with self._lock, self._transaction():
+            self._conn.executemany(
+                "DELETE FROM messages WHERE id = ?", [(id_,) for id_ in ids]
+            )
+
+    def nack(self, id_: int, delay: float, max_attempts: int) -> bool:
+        with self._lock, self._transaction():
+            row = self._conn.execute(
+                "SELECT attempts FROM messages WHERE id = ?", (id_,)
+            ).fetchone()
+            if row is None:
+                return False
+            # reserve() already counted this delivery.
+            dead = row[0] >= max_attempts
+            self._conn.execute(
+                "UPDATE messages SET visible_at = ?, dead = ? WHERE id = ?",
+                (time.time() + delay, int(dead), id_),
+            )
+            return dead
+
+    def dead_letters(self, queue: str) -> list[Message]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, body, attempts, enqueued_at FROM messages"
+                " WHERE queue = ? AND dead = 1 ORDER BY id",
+                (queue,),
+            ).fetchall()
+        return [Message(*row) for row in rows]
+
+    def stats(self, queue: str) -> dict:
+        now = time.time()
+        with self._lock:
+            ready, in_flight, dead, oldest = self._conn.execute(
+                "SELECT"
+                " SUM(dead = 0 AND visible_at <= ?),"
+                " SUM(dead = 0 AND visible_at > ?),"
+                " SUM(dead = 1),"
+                " MIN(CASE WHEN dead = 0 AND visible_at <= ?"
+                " THEN enqueued_at END)"
+                " FROM messages WHERE queue = ?",
+                (now, now, now, queue),
+            ).fetchone()
+        # Delayed retries are counted as in flight until they become visible.
+        return {
+            "ready": ready or 0,
+            "in_flight": in_flight or 0,
+            "dead": dead or 0,
+            "oldest_enqueued_at": oldest,
+        }
+
+    def close(self) -> None:
+        self._conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+
+Handler = Callable[[Message], Union[Awaitable[None], None]]
+
 
 class MessageQueue:
-    def send(self, message: str):
-        pass
\ No newline at end of file
+    """
+    Async producer/consumer API over a queue backend.
+
+    Producers call `send`/`send_batch`. `consume` runs `handler` on up to
+    `concurrency` messages at once while keeping at most `prefetch` more
+    reserved ahead. A handler that returns normally acks the message. One that
+    raises is retried with exponential backoff, and after `max_attempts` the
+    message moves to the dead-letter list. A delivery whose visibility timeout
+    expires (e.g. the consumer crashed) counts as an attempt too. Sync
+    handlers run in the thread pool.
+    """
+
+    def __init__(
+        self,
+        name: str = "default",
+        backend=None,
+        max_attempts: int = 5,
+        retry_delay: float = 1.0,
+        visibility_timeout: float = 300.0,
+    ):
+        self.name = name
+        self.backend = (
+            backend if backend is not None else InMemoryQueueBackend()
+        )
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.visibility_timeout = visibility_timeout
+        self.published = 0
+        self.acked = 0
+        self.failed = 0
+        self.dead_lettered = 0
+        self._started_at = time.monotonic()
+
+    async def send(self, message: str) -> None:
+        await self.send_batch([message])
+
+    async def send_batch(self, messages: Sequence[str]) -> None:
+        """
+        Publish many messages in one backend write (one transaction for
+        SQLite).
+        """
+        if messages:
+            await asyncio.to_thread(
+                self.backend.publish, self.name, list(messages)
+            )
+            self.published += len(messages)
+
+    async def consume(
+        self,
+        handler: Handler,
+        prefetch: int = 32,
+        concurrency: int = 4,
+        stop: Optional[asyncio.Event] = None,
+        drain: bool = False,
+        poll_interval: float = 0.1,
+    ) -> None:
+        """
+        Process messages until `stop` is set, or until the queue is empty when
+        `drain=True`.
+        """
+        stop = stop or asyncio.Event()
+        buffer: asyncio.Queue = asyncio.Queue()
+        pending = 0
+        is_async = inspect.iscoroutinefunction(handler)
+
+        async def process(message: Message) -> None:
+            try:
+                if is_async:
+                    await handler(message)
+                else:
+                    await asyncio.to_thread(handler, message)
+            except Exception:
+                self.failed += 1
+                delay = self.retry_delay * 2**message.attempts
+                if await asyncio.to_thread(
+                    self.backend.nack, message.id, delay, self.max_attempts
+                ):
+                    self.dead_lettered += 1
+            else:
+                await asyncio.to_thread(self.backend.ack, [message.id])
+                self.acked += 1
+
+        async def worker() -> None:
+            nonlocal pending
+            while True:
+                message = await buffer.get()
+                try:
+                    await process(message)
+                finally:
+                    pending -= 1
+                    buffer.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            while not stop.is_set():
+                free = prefetch - buffer.qsize()
+                messages = []
+                if free > 0:
+                    messages = await asyncio.to_thread(
+                        self.backend.reserve,
+                        self.name,
+                        free,
+                        self.visibility_timeout,
+                        self.max_attempts,
+                    )
+                for message in messages:
+                    pending += 1
+                    buffer.put_nowait(message)
+                if messages:
+                    continue
+                if drain and pending == 0:
+                    stats = await asyncio.to_thread(
+                        self.backend.stats, self.name
+                    )
+                    if stats["ready"] == 0 and stats["in_flight"] == 0:
+                        break
+                await asyncio.sleep(poll_interval)
+            await buffer.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def dead_letters(self) -> list[Message]:
+        return self.backend.dead_letters(self.name)
+
+    def stats(self) -> dict:
+        """
+        Counters plus queue depth, lag (age of the oldest ready message) and
+        ack throughput.
+        """
+        backend_stats = self.backend.stats(self.name)
+        oldest = backend_stats.pop("oldest_enqueued_at")
+        elapsed = time.monotonic() - self._started_at
+        return {
+            **backend_stats,
+            "published": self.published,
+            "acked": self.acked,
+            "failed": self.failed,
+            "dead_lettered": self.dead_lettered,
+            "lag_seconds": time.time() - oldest if oldest is not None else 0.0,
+            "acked_per_second": self.acked / elapsed if elapsed > 0 else 0.0,
+        }
@@ -0,0 +1,74 @@
+# cache.py
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class InMemoryCacheBackend:
+    """
+    In-process key/value cache with per-entry TTL (expired lazily on read)
+    and LRU eviction once `max_entries` is reached.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+class RedisCacheBackend:
+    """
+    Cache backend for any Redis-protocol server. `client` is a
+    `redis.asyncio.Redis` (or a compatible fake); TTL and eviction are
+    delegated to the server.
+    """
+
+    def __init__(self, client, prefix: str = "cache:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisCacheBackend":
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise ImportError(
+                "RedisCacheBackend.from_url requires the 'redis' package"
+            ) from exc
+        return cls(redis.from_url(url, decode_responses=True), **kwargs)
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self.client.get(self.prefix + key)
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return value
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        await self.client.set(
+            self.prefix + key, value, px=max(1, int(ttl * 1000))
+        )
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
@@ -1,15 +1,292 @@
 # feature_store.py
+import threading
+import time
+from pathlib import Path
+from typing import Mapping, Optional, Sequence
+
+import numpy as np
+
+
+def _ttl_mask(
+    written: np.ndarray, ttl: Optional[float], now: float
+) -> np.ndarray:
+    if ttl is None:
+        return np.zeros(len(written), dtype=bool)
+    return now - written > ttl
+
+
+def _check_columns(
+    keys: Sequence[str], columns: Mapping[str, Sequence[float]]
+) -> dict[str, np.ndarray]:
+    checked = {}
+    for name, values in columns.items():
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape != (len(keys),):
+            raise ValueError(
+                f"Feature '{name}' has {len(values)} values"
+                f" for {len(keys)} keys"
+            )
+        checked[name] = values
+    return checked
+
 
 class FeatureStore:
     """
-    Simple in-memory feature store for demonstration.
-    Replace with a real backend (e.g., Redis, Feast) for production.
+    In-memory columnar feature store.
+
+    Each feature is a float64 column indexed by an entity-to-row map, with a
+    parallel column of write timestamps. Missing or expired values read as
+    NaN. Features listed in `ttls` (seconds) expire lazily: they are cleared
+    the first time a read finds them too old. Snapshots save and load the raw
+    columns, so a restart restores millions of rows in seconds.
     """
-    def __init__(self):
-        self._store = {}
+
+    def __init__(
+        self,
+        ttls: Optional[Mapping[str, float]] = None,
+        initial_capacity: int = 1024,
+    ):
+        self.ttls = dict(ttls or {})
+        self._rows: dict[str, int] = {}
+        self._capacity = initial_capacity
+        self._values: dict[str, np.ndarray] = {}
+        self._written: dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def feature_names(self) -> list[str]:
+        return list(self._values)
 
     def put(self, key: str, features: dict):
-        self._store[key] = features
+        self.put_many(
+            [key], {name: [value] for name, value in features.items()}
+        )
 
     def get(self, key: str) -> dict:
-        return self._store.get(key, {})
+        columns = self.get_many([key], self.feature_names)
+        return {
+            name: float(values[0])
+            for name, values in columns.items()
+            if not np.isnan(values[0])
+        }
+
+    def put_many(
+        self,
+        keys: Sequence[str],
+        columns: Mapping[str, Sequence[float]],
+        now: Optional[float] = None,
+    ) -> None:
+        """
+        Write feature columns for many entities; `columns[name][i]` belongs to
+        `keys[i]`. Every column is checked before anything is written, so a bad
+        column changes nothing.
+        """
+        now = time.time() if now is None else now
+        columns = _check_columns(keys, columns)
+        with self._lock:
+            rows = np.empty(len(keys), dtype=np.int64)
+            for i, key in enumerate(keys):
+                row = self._rows.get(key)
+                if row is None:
+                    row = self._rows[key] = len(self._rows)
+                rows[i] = row
+            self._reserve(len(self._rows))
+            for name, values in columns.items():
+                if name not in self._values:
+                    self._values[name] = np.full(self._capacity, np.nan)
+                    self._written[name] = np.full(self._capacity, -np.inf)
+                self._values[name][rows] = values
+                self._written[name][rows] = now
+
+    def get_many(
+        self,
+        keys: Sequence[str],
+        feature_names: Sequence[str],
+        now: Optional[float] = None,
+    ) -> dict[str, np.ndarray]:
+        """
+        Look up features for many entities at once. Returns one float64 array
+        per feature, aligned with `keys` (NaN when missing or expired).
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = np.fromiter(
+                (self._rows.get(key, -1) for key in keys),
+                dtype=np.int64,
+                count=len(keys),
+            )
+            known = rows >= 0
+            known_rows = rows[known]
+            result = {}
+            for name in feature_names:
+                out = np.full(len(keys), np.nan)
+                values = self._values.get(name)
+                if values is not None:
+                    column = values[known_rows]
+                    expired = _ttl_mask(
+                        self._written[name][known_rows],
+                        self.ttls.get(name),
+                        now,
+                    )
+                    if expired.any():
+                        values[known_rows[expired]] = np.nan
+                        column[expired] = np.nan
+                    out[known] = column
+                result[name] = out
+            return result
+
+    def save_snapshot(self, path) -> None:
+        """
+        Write all columns to `path` (a directory) as raw .npy arrays.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            n = len(self._rows)
+            np.save(path / "keys.npy", np.array(list(self._rows), dtype=str))
+            names = list(self._values)
+            np.save(path / "features.npy", np.array(names, dtype=str))
+            np.save(
+                path / "values.npy",
+                np.stack([self._values[name][:n] for name in names])
+                if names
+                else np.empty((0, n)),
+            )
+            np.save(
+                path / "written.npy",
+                np.stack([self._written[name][:n] for name in names])
+                if names
+                else np.empty((0, n)),
+            )
+
+    @classmethod
+    def load_snapshot(
+        cls, path, ttls: Optional[Mapping[str, float]] = None
+    ) -> "FeatureStore":
+        path = Path(path)
+        keys = np.load(path / "keys.npy").tolist()
+        names = np.load(path / "features.npy").tolist()
+        values = np.load(path / "values.npy")
+        written = np.load(path / "written.npy")
+        store = cls(ttls=ttls, initial_capacity=max(len(keys), 1))
+        store._rows = {key: row for row, key in enumerate(keys)}
+        for i, name in enumerate(names):
+            store._values[name] = np.full(store._capacity, np.nan)
+            store._written[name] = np.full(store._capacity, -np.inf)
+            store._values[name][: len(keys)] = values[i]
+            store._written[name][: len(keys)] = written[i]
+        return store
+
+    def _reserve(self, size: int) -> None:
+        if size <= self._capacity:
+            return
+        capacity = max(size, 2 * self._capacity)
+        for columns, fill in (
+            (self._values, np.nan),
+            (self._written, -np.inf),
+        ):
+            for name, column in columns.items():
+                grown = np.full(capacity, fill)
+                grown[: self._capacity] = column
+                columns[name] = grown
+        self._capacity = capacity
+
+
+class RedisFeatureStore:
+    """
+    Feature store on a Redis-protocol server, with the same batch API as
+    `FeatureStore`.
+
+    Each (feature, entity) pair is its own key so per-feature TTLs map onto
+    native key expiry. `get_many` issues one MGET per feature and `put_many`
+    one SET per value, all inside a single pipeline (one network round trip).
+    Feature names are also kept in the `{prefix}features` set, so `get`
+    without names returns every feature, like `FeatureStore.get`.
+    `client` is a `redis.Redis` or any compatible fake.
+    """
+
+    def __init__(
+        self,
+        client,
+        ttls: Optional[Mapping[str, float]] = None,
+        prefix: str = "fs:",
+    ):
+        self.client = client
+        self.ttls = dict(ttls or {})
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisFeatureStore":
+        try:
+            import redis
+        except ImportError as exc:
+            raise ImportError(
+                "RedisFeatureStore.from_url requires the 'redis' package"
+            ) from exc
+        return cls(redis.from_url(url), **kwargs)
+
+    def put(self, key: str, features: dict):
+        self.put_many(
+            [key], {name: [value] for name, value in features.items()}
+        )
+
+    @property
+    def feature_names(self) -> list[str]:
+        return sorted(
+            name.decode() if isinstance(name, bytes) else name
+            for name in self.client.smembers(self._names_key)
+        )
+
+    def get(
+        self, key: str, feature_names: Optional[Sequence[str]] = None
+    ) -> dict:
+        if feature_names is None:
+            feature_names = self.feature_names
+        columns = self.get_many([key], feature_names)
+        return {
+            name: float(values[0])
+            for name, values in columns.items()
+            if not np.isnan(values[0])
+        }
+
+    def put_many(
+        self, keys: Sequence[str], columns: Mapping[str, Sequence[float]]
+    ) -> None:
+        columns = _check_columns(keys, columns)
+        pipe = self.client.pipeline(transaction=False)
+        if columns:
+            pipe.sadd(self._names_key, *columns)
+        for name, values in columns.items():
+            ttl = self.ttls.get(name)
+            px = max(1, int(ttl * 1000)) if ttl is not None else None
+            for key, value in zip(keys, values):
+                pipe.set(self._key(name, key), repr(float(value)), px=px)
+        pipe.execute()
+
+    def get_many(
+        self, keys: Sequence[str], feature_names: Sequence[str]
+    ) -> dict[str, np.ndarray]:
+        names = list(feature_names)
+        if not keys or not names:
+            return {name: np.full(len(keys), np.nan) for name in names}
+        pipe = self.client.pipeline(transaction=False)
+        for name in names:
+            pipe.mget([self._key(name, key) for key in keys])
+        replies = pipe.execute()
+        return {
+            name: np.array(
+                [np.nan if value is None else float(value) for value in reply],
+                dtype=np.float64,
+            )
+            for name, reply in zip(names, replies)
+        }
+
+    @property
+    def _names_key(self) -> str:
+        return f"{self.prefix}features"
+
+    def _key(self, feature: str, key: str) -> str:
+        return f"{self.prefix}{feature}:{key}"
@@ -0,0 +1,207 @@
+# lexical_index.py
+import re
+import threading
+from typing import Sequence
+
+import numpy as np
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _narrow(values: np.ndarray) -> np.ndarray:
+    """
+    Store non-negative integers in the smallest unsigned dtype that holds them.
+    """
+    top = int(values.max()) if len(values) else 0
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if top <= np.iinfo(dtype).max:
+            return values.astype(dtype)
+    return values.astype(np.uint64)
+
+
+class _Postings:
+    """
+    One term's posting list: doc-id gaps and term frequencies, each narrowed to
+    the smallest dtype.
+
+    New postings go to plain-list buffers and are packed once the buffer is
+    as long as the packed arrays (and at least `MIN_COMPACT` entries). Each
+    posting is therefore re-packed O(1) times on average, even when
+    documents arrive one at a time. All state is swapped in as one tuple, so
+    readers never see packed arrays and buffers from different generations.
+    """
+
+    __slots__ = ("_state", "last_doc")
+    MIN_COMPACT = 256
+
+    def __init__(self):
+        empty = np.empty(0, dtype=np.uint8)
+        # (packed gaps, packed tfs, last packed doc id, buffered doc ids,
+        # buffered tfs)
+        self._state = (empty, empty, 0, [], [])
+        self.last_doc = -1
+
+    @property
+    def gaps(self) -> np.ndarray:
+        return self._state[0]
+
+    def append(self, docs: Sequence[int], tfs: Sequence[int]) -> None:
+        gaps, _, _, buffered_docs, buffered_tfs = self._state
+        # tfs first: readers copy docs before tfs, so their tfs copy is never
+        # the shorter one.
+        buffered_tfs.extend(tfs)
+        buffered_docs.extend(docs)
+        self.last_doc = int(docs[-1])
+        if len(buffered_docs) >= max(len(gaps), self.MIN_COMPACT):
+            self.compact()
+
+    def compact(self) -> None:
+        gaps, tfs, last_packed, buffered_docs, buffered_tfs = self._state
+        if not buffered_docs:
+            return
+        docs = np.asarray(buffered_docs, dtype=np.int64)
+        self._state = (
+            _narrow(
+                np.concatenate(
+                    [gaps.astype(np.int64), np.diff(docs, prepend=last_packed)]
+                )
+            ),
+            _narrow(
+                np.concatenate(
+                    [
+                        tfs.astype(np.int64),
+                        np.asarray(buffered_tfs, dtype=np.int64),
+                    ]
+                )
+            ),
+            int(docs[-1]),
+            [],
+            [],
+        )
+
+    def snapshot(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Doc ids and term frequencies, buffered postings included.
+        """
+        gaps, tfs, _, buffered_docs, buffered_tfs = self._state
+        buffered_docs = buffered_docs[:]
+        buffered_tfs = buffered_tfs[: len(buffered_docs)]
+        docs = np.concatenate(
+            [
+                np.cumsum(gaps, dtype=np.int64),
+                np.asarray(buffered_docs, dtype=np.int64),
+            ]
+        )
+        return docs, np.concatenate(
+            [tfs, np.asarray(buffered_tfs, dtype=np.int64)]
+        )
+
+    def docs(self) -> np.ndarray:
+        return self.snapshot()[0]
+
+    @property
+    def nbytes(self) -> int:
+        gaps, tfs, _, buffered_docs, _ = self._state
+        return gaps.nbytes + tfs.nbytes + 16 * len(buffered_docs)
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a compressed in-memory inverted index.
+
+    Each term's postings are stored as doc-id gaps plus term frequencies,
+    each narrowed to the smallest unsigned dtype that fits (usually uint8).
+    Decoding is a single `cumsum`. A query scores every matching posting in
+    NumPy and partial-sorts the top k. Documents are append-only, so new
+    postings are added to the end of each list. Lists and the document-length
+    array grow geometrically, so adding documents one at a time stays linear.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._ids: list[str] = []
+        self._lengths = np.empty(0, dtype=np.int32)
+        self._postings: dict[str, _Postings] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def nbytes(self) -> int:
+        return self._lengths[: len(self._ids)].nbytes + sum(
+            p.nbytes for p in self._postings.values()
+        )
+
+    def add_documents(self, ids: Sequence[str], texts: Sequence[str]) -> None:
+        if len(ids) != len(texts):
+            raise ValueError(f"Got {len(ids)} ids for {len(texts)} texts")
+        token_lists = [tokenize(text) for text in texts]
+        with self._lock:
+            start = len(self._ids)
+            new_terms: dict[str, tuple[list[int], list[int]]] = {}
+            for offset, tokens in enumerate(token_lists):
+                counts: dict[str, int] = {}
+                for token in tokens:
+                    counts[token] = counts.get(token, 0) + 1
+                for term, tf in counts.items():
+                    docs, tfs = new_terms.setdefault(term, ([], []))
+                    docs.append(start + offset)
+                    tfs.append(tf)
+            for term, (docs, tfs) in new_terms.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = _Postings()
+                postings.append(docs, tfs)
+            end = start + len(token_lists)
+            if end > len(self._lengths):
+                # Searches may still hold the old array; it keeps its first
+                # `start` rows.
+                grown = np.empty(
+                    max(end, 2 * len(self._lengths), 64), dtype=np.int32
+                )
+                grown[:start] = self._lengths[:start]
+                self._lengths = grown
+            self._lengths[start:end] = [len(tokens) for tokens in token_lists]
+            # Publish the ids last: searches only score rows below
+            # len(self._ids).
+            self._ids.extend(str(i) for i in ids)
+
+    def search(self, query: str, k: int = 10) -> list[tuple[str, float]]:
+        """
+        Return the top-k (id, score) pairs, best match first.
+        """
+        n_docs = len(self._ids)
+        terms = [
+            term
+            for term in dict.fromkeys(tokenize(query))
+            if term in self._postings
+        ]
+        if not n_docs or not terms:
+            return []
+        lengths = self._lengths[:n_docs]
+        norm = self.k1 * (
+            1 - self.b + self.b * lengths / max(lengths.mean(), 1e-9)
+        )
+        scores = np.zeros(n_docs)
+        for term in terms:
+            postings = self._postings[term]
+            docs, tf = postings.snapshot()
+            # Doc ids ascend, so postings of unpublished documents form a
+            # suffix.
+            docs = docs[docs < n_docs]
+            tf = tf[: len(docs)].astype(np.float64)
+            idf = np.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            scores[docs] += idf * tf * (self.k1 + 1) / (tf + norm[docs])
+        candidates = np.flatnonzero(scores)
+        k = min(k, len(candidates))
+        if k == 0:
+            return []
+        top = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self._ids[i], float(scores[i])) for i in top]
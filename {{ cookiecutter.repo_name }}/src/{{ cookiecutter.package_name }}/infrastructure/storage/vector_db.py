@@ -1,5 +1,648 @@
 # vector_db.py
+import json
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple, Optional, Sequence
+
+import numpy as np
+
+METRICS = ("cosine", "dot")
+FORMAT_VERSION = 1
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Row-wise top-k of a 2-D score matrix, highest first. Uses a partial sort so
+    the cost is O(n) per row plus O(k log k) for ordering.
+    """
+    k = min(k, scores.shape[1])
+    if k == 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(np.int64), empty.astype(np.float32)
+    if k < scores.shape[1]:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.broadcast_to(np.arange(k), (scores.shape[0], k))
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(
+        part_scores, order, axis=1
+    )
+
+
+class FlatIndex:
+    """
+    Exact brute-force index: one matrix multiply against every stored vector.
+    """
+
+    def build(self, vectors: np.ndarray) -> None:
+        pass
+
+    def search(
+        self, vectors: np.ndarray, queries: np.ndarray, k: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        return _top_k(queries @ vectors.T, k)
+
+    def state(self) -> dict[str, np.ndarray]:
+        return {}
+
+    def load_state(self, state) -> None:
+        pass
+
+
+class IVFIndex:
+    """
+    Approximate inverted-file index.
+
+    Vectors are assigned to the nearest of `nlist` k-means centroids; a query
+    only scans the `nprobe` closest lists, so search cost drops roughly by
+    nlist / nprobe.
+    """
+
+    def __init__(
+        self,
+        nlist: int = 1024,
+        nprobe: int = 16,
+        train_size: int = 65536,
+        iterations: int = 10,
+        seed: int = 0,
+    ):
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_size = train_size
+        self.iterations = iterations
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self.lists: list[np.ndarray] = []
+
+    def build(self, vectors: np.ndarray) -> None:
+        if len(vectors) == 0:
+            self.centroids = None
+            self.lists = []
+            return
+        rng = np.random.default_rng(self.seed)
+        nlist = min(self.nlist, len(vectors))
+        sample = vectors
+        if len(vectors) > self.train_size:
+            sample = vectors[
+                rng.choice(len(vectors), self.train_size, replace=False)
+            ]
+        centroids = sample[
+            rng.choice(len(sample), nlist, replace=False)
+        ].copy()
+        for _ in range(self.iterations):
+            assign = self._assign(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            counts = np.bincount(assign, minlength=nlist)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+        self.centroids = centroids.astype(np.float32)
+        self.lists = [np.empty(0, dtype=np.int64) for _ in range(nlist)]
+        self.add(vectors, 0)
+
+    def add(self, vectors: np.ndarray, start: int) -> None:
+        if self.centroids is None:
+            return
+        assign = self._assign(vectors, self.centroids)
+        rows = np.arange(start, start + len(vectors), dtype=np.int64)
+        order = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(
+            assign[order], np.arange(len(self.centroids) + 1)
+        )
+        for c in range(len(self.centroids)):
+            chunk = rows[order[bounds[c] : bounds[c + 1]]]
+            if len(chunk):
+                self.lists[c] = np.concatenate([self.lists[c], chunk])
+
+    def search(
+        self, vectors: np.ndarray, queries: np.ndarray, k: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        if self.centroids is None:
+            return FlatIndex().search(vectors, queries, k)
+        probes = self.probe(queries)
+        ids = np.full((len(queries), k), -1, dtype=np.int64)
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        for i, query in enumerate(queries):
+            candidates = np.concatenate([self.lists[c] for c in probes[i]])
+            if len(candidates) == 0:
+                continue
+            local, local_scores = _top_k(
+                (vectors[candidates] @ query)[None, :], k
+            )
+            ids[i, : local.shape[1]] = candidates[local[0]]
+            scores[i, : local.shape[1]] = local_scores[0]
+        return ids, scores
+
+    def probe(self, queries: np.ndarray) -> np.ndarray:
+        """
+        The `nprobe` lists to scan for each query, ranked with the same L2
+        score `_assign` used to fill them, so a vector's own list always ranks
+        first.
+        """
+        nprobe = min(self.nprobe, len(self.centroids))
+        probes, _ = _top_k(self._l2_scores(queries, self.centroids), nprobe)
+        return probes
+
+    def state(self) -> dict[str, np.ndarray]:
+        if self.centroids is None:
+            return {}
+        offsets = np.cumsum([0] + [len(rows) for rows in self.lists])
+        return {
+            "centroids": self.centroids,
+            "offsets": offsets,
+            "rows": np.concatenate(self.lists),
+        }
+
+    def load_state(self, state) -> None:
+        if "centroids" not in state:
+            return
+        self.centroids = np.asarray(state["centroids"], dtype=np.float32)
+        offsets, rows = state["offsets"], state["rows"]
+        self.lists = [
+            rows[offsets[i] : offsets[i + 1]]
+            for i in range(len(self.centroids))
+        ]
+
+    @staticmethod
+    def _l2_scores(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        # argmin ||v - c||^2 == argmax (v.c - ||c||^2 / 2)
+        half_norms = 0.5 * np.einsum("ij,ij->i", centroids, centroids)
+        return vectors @ centroids.T - half_norms
+
+    @classmethod
+    def _assign(cls, vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        return np.argmax(cls._l2_scores(vectors, centroids), axis=1)
+
+
+class _State(NamedTuple):
+    """
+    Immutable view published to readers; writers replace it wholesale so a
+    search never observes a half-applied append or compaction.
+    """
+
+    base: np.ndarray
+    index: object
+    delta: np.ndarray
+    count: int
+
 
 class VectorDB:
-    def add_embedding(self, embedding: list[float]):
-        pass
\ No newline at end of file
+    """
+    In-process vector index backed by contiguous float32 matrices.
+
+    Vectors live in an indexed *base* segment (memory-mapped when loaded from
+    disk) plus an append-only *delta* segment that is scanned exactly until the
+    next compaction folds it into the base. Use `index="flat"` for exact
+    search, or `index="ivf"` for approximate search over large corpora.
+
+    On-disk layout (one directory, `generation` bumps on every compaction):
+        manifest.json          format version, dim, metric, index, row count
+        vectors-<gen>.f32      raw row-major float32 base vectors (mmap)
+        ids-<gen>.jsonl        one {"id", "metadata"} record per base row
+        index-<gen>.npz        index state (IVF centroids and lists)
+        segment-<gen>.f32      appended vectors since the last compaction
+        segment-<gen>.jsonl    ids/metadata for the appended vectors
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        metric: str = "cosine",
+        index: str = "flat",
+        initial_capacity: int = 1024,
+        compact_threshold: Optional[int] = None,
+        **index_params,
+    ):
+        if metric not in METRICS:
+            raise ValueError(
+                f"Unknown metric '{metric}', expected one of {METRICS}"
+            )
+        if index not in ("flat", "ivf"):
+            raise ValueError(
+                f"Unknown index '{index}', expected 'flat' or 'ivf'"
+            )
+        self.dim = dim
+        self.metric = metric
+        self.index_kind = index
+        self.index_params = index_params
+        self.compact_threshold = compact_threshold
+        self.read_only = False
+        self._ids: list[str] = []
+        self._metadata: list[Optional[dict]] = []
+        self._rows: dict[str, int] = {}
+        self._state = _State(
+            base=np.empty((0, dim), dtype=np.float32),
+            index=self._new_index(),
+            delta=np.empty((initial_capacity, dim), dtype=np.float32),
+            count=0,
+        )
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+        self._path: Optional[Path] = None
+        self._generation = 0
+        self._segment = None
+
+    def __len__(self) -> int:
+        state = self._state
+        return len(state.base) + state.count
+
+    @property
+    def index(self):
+        return self._state.index
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """
+        All stored vectors (normalized when the metric is cosine). Copies when
+        a delta segment is pending.
+        """
+        state = self._state
+        if state.count == 0:
+            return state.base
+        return np.concatenate([state.base, state.delta[: state.count]])
+
+    @property
+    def ids(self) -> list[str]:
+        return self._ids[: len(self)]
+
+    def get_metadata(self, id: str) -> Optional[dict]:
+        row = self._rows.get(id)
+        return None if row is None else self._metadata[row]
+
+    def add_embedding(
+        self,
+        embedding: Sequence[float],
+        id: Optional[str] = None,
+        metadata: Optional[dict] = None,
+    ) -> None:
+        self.add_embeddings(
+            [id if id is not None else str(len(self))],
+            [embedding],
+            None if metadata is None else [metadata],
+        )
+
+    def add_embeddings(
+        self,
+        ids: Sequence[str],
+        matrix,
+        metadata: Optional[Sequence[Optional[dict]]] = None,
+    ) -> None:
+        """
+        Bulk-insert a (n, dim) matrix of embeddings under the given ids. New
+        rows land in the delta segment (and its on-disk file when persisted).
+        """
+        if self.read_only:
+            raise RuntimeError("VectorDB was loaded read-only")
+        matrix = self._prepare(matrix)
+        ids = [str(i) for i in ids]
+        metadata = (
+            list(metadata) if metadata is not None else [None] * len(ids)
+        )
+        if not len(ids) == len(matrix) == len(metadata):
+            raise ValueError(
+                f"Got {len(ids)} ids and {len(metadata)} metadata"
+                f" for {len(matrix)} vectors"
+            )
+        with self._lock:
+            state = self._state
+            start = len(state.base) + state.count
+            self._ids.extend(ids)
+            self._metadata.extend(metadata)
+            self._rows.update((id_, start + i) for i, id_ in enumerate(ids))
+            if self._segment is not None:
+                self._append_segment(self._segment, matrix, ids, metadata)
+            delta = state.delta
+            count = state.count + len(matrix)
+            if count > len(delta):
+                delta = np.empty(
+                    (max(count, 2 * len(delta)), self.dim), dtype=np.float32
+                )
+                delta[: state.count] = state.delta[: state.count]
+            delta[state.count : count] = matrix
+            self._state = state._replace(delta=delta, count=count)
+        if (
+            self.compact_threshold is not None
+            and count >= self.compact_threshold
+        ):
+            self.compact(background=True)
+
+    def build_index(self) -> None:
+        """
+        Fold pending vectors into the base segment and (re)train the index.
+        """
+        self.compact()
+
+    def compact(self, background: bool = False) -> Optional[threading.Thread]:
+        """
+        Merge the delta segment into a new base segment and rebuild the index.
+
+        Searches keep using the previous state until the new one is published,
+        so reads never wait on compaction. With `background=True` the work runs
+        on a daemon thread (at most one at a time) which is returned.
+        """
+        if background:
+            with self._lock:
+                if self._compactor is not None and self._compactor.is_alive():
+                    return self._compactor
+                self._compactor = threading.Thread(
+                    target=self._compact, daemon=True
+                )
+                self._compactor.start()
+                return self._compactor
+        self._compact()
+        return None
+
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> None:
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join(timeout)
+
+    def search(
+        self, query: Sequence[float], k: int = 10
+    ) -> list[tuple[str, float]]:
+        return self.search_batch([query], k)[0]
+
+    def search_batch(
+        self, queries, k: int = 10
+    ) -> list[list[tuple[str, float]]]:
+        """
+        Return the top-k (id, score) pairs for each query, best match first.
+        """
+        queries = self._prepare(queries)
+        state = self._state
+        rows, scores = state.index.search(state.base, queries, k)
+        if state.count:
+            delta_rows, delta_scores = _top_k(
+                queries @ state.delta[: state.count].T, k
+            )
+            merged_rows = np.concatenate(
+                [rows, delta_rows + len(state.base)], axis=1
+            )
+            merged_scores = np.concatenate([scores, delta_scores], axis=1)
+            order, _ = _top_k(merged_scores, k)
+            rows = np.take_along_axis(merged_rows, order, axis=1)
+            scores = np.take_along_axis(merged_scores, order, axis=1)
+        ids = self._ids
+        return [
+            [
+                (ids[r], float(s))
+                for r, s in zip(row, row_scores)
+                if r >= 0 and np.isfinite(s)
+            ]
+            for row, row_scores in zip(rows, scores)
+        ]
+
+    def save(self, path) -> None:
+        """
+        Persist to `path` and keep appending new vectors to its segment files.
+        """
+        with self._lock:
+            self._path = Path(path)
+            self._path.mkdir(parents=True, exist_ok=True)
+        self._compact(force=True)
+
+    @classmethod
+    def load(
+        cls, path, mmap: bool = True, read_only: bool = False
+    ) -> "VectorDB":
+        """
+        Open a saved VectorDB. With `mmap=True` the base vectors are mapped
+        read-only, so every worker process on a node shares the same page-cache
+        pages instead of holding its own copy. Use `read_only=True` in serving
+        workers; only one process should append to a given directory.
+        """
+        path = Path(path)
+        manifest = json.loads((path / "manifest.json").read_text())
+        if manifest["format_version"] > FORMAT_VERSION:
+            raise ValueError(
+                "Unsupported VectorDB format version"
+                f" {manifest['format_version']}"
+            )
+        db = cls(
+            dim=manifest["dim"],
+            metric=manifest["metric"],
+            index=manifest["index"],
+            **manifest.get("index_params", {}),
+        )
+        gen, count = manifest["generation"], manifest["count"]
+        vectors_file = path / f"vectors-{gen}.f32"
+        if count == 0:
+            base = np.empty((0, db.dim), dtype=np.float32)
+        elif mmap:
+            base = np.memmap(
+                vectors_file, dtype=np.float32, mode="r", shape=(count, db.dim)
+            )
+        else:
+            base = np.fromfile(vectors_file, dtype=np.float32).reshape(
+                count, db.dim
+            )
+        index = db._new_index()
+        with np.load(path / f"index-{gen}.npz") as state:
+            index.load_state(state)
+        for record in _read_jsonl(path / f"ids-{gen}.jsonl"):
+            db._ids.append(record["id"])
+            db._metadata.append(record.get("metadata"))
+        db._rows = {id_: row for row, id_ in enumerate(db._ids)}
+        db._state = db._state._replace(base=base, index=index)
+        db._generation = gen
+
+        segment = (
+            path / f"segment-{gen}.f32",
+            path / f"segment-{gen}.jsonl",
+        )
+        segment_records = list(_read_jsonl(segment[1]))
+        segment_vectors = np.fromfile(segment[0], dtype=np.float32)
+        # A crash mid-append can leave a torn last vector.
+        segment_vectors = segment_vectors[
+            : len(segment_vectors) // db.dim * db.dim
+        ].reshape(-1, db.dim)
+        rows = min(len(segment_records), len(segment_vectors))
+        if rows:
+            # Replay through the in-memory path only; the segment files already
+            # hold these rows.
+            db.add_embeddings(
+                [r["id"] for r in segment_records[:rows]],
+                segment_vectors[:rows],
+                [r.get("metadata") for r in segment_records[:rows]],
+            )
+        db.read_only = read_only
+        if not read_only:
+            # Drop rows present in only one file, so rows appended from now on
+            # line up in both again.
+            _truncate_segment(segment, rows, db.dim)
+            db._path = path
+            db._segment = segment
+        return db
+
+    def _compact(self, force: bool = False) -> None:
+        with self._compact_lock:
+            self._compact_locked(force)
+
+    def _compact_locked(self, force: bool) -> None:
+        with self._lock:
+            snapshot = self._state
+        if snapshot.count == 0 and not force:
+            return
+        merged = np.concatenate(
+            [snapshot.base, snapshot.delta[: snapshot.count]]
+        )
+        index = self._new_index()
+        index.build(merged)
+        path = self._path
+        generation = self._generation + 1
+        if path is not None:
+            merged.tofile(path / f"vectors-{generation}.f32")
+            np.savez(path / f"index-{generation}.npz", **index.state())
+            _write_jsonl(
+                path / f"ids-{generation}.jsonl",
+                (
+                    {"id": i, "metadata": m}
+                    for i, m in zip(
+                        self._ids[: len(merged)], self._metadata[: len(merged)]
+                    )
+                ),
+            )
+            if len(merged):
+                merged = np.memmap(
+                    path / f"vectors-{generation}.f32",
+                    dtype=np.float32,
+                    mode="r",
+                    shape=merged.shape,
+                )
+        with self._lock:
+            # Rows appended while we were building stay in the new delta.
+            state = self._state
+            remaining = state.delta[snapshot.count : state.count]
+            delta = np.empty(
+                (max(len(remaining), len(state.delta) // 2, 1), self.dim),
+                dtype=np.float32,
+            )
+            delta[: len(remaining)] = remaining
+            if path is not None:
+                segment = (
+                    path / f"segment-{generation}.f32",
+                    path / f"segment-{generation}.jsonl",
+                )
+                for segment_file in segment:
+                    segment_file.write_bytes(b"")
+                done = len(merged)
+                self._append_segment(
+                    segment,
+                    remaining,
+                    self._ids[done : done + len(remaining)],
+                    self._metadata[done : done + len(remaining)],
+                )
+                _write_json_atomic(
+                    path / "manifest.json",
+                    {
+                        "format_version": FORMAT_VERSION,
+                        "generation": generation,
+                        "dim": self.dim,
+                        "metric": self.metric,
+                        "index": self.index_kind,
+                        "index_params": self.index_params,
+                        "count": len(merged),
+                    },
+                )
+                self._segment = segment
+                self._remove_generation(path, self._generation)
+            self._generation = generation
+            self._state = _State(
+                base=merged, index=index, delta=delta, count=len(remaining)
+            )
+
+    def _append_segment(
+        self, segment, matrix: np.ndarray, ids, metadata
+    ) -> None:
+        vectors_file, records_file = segment
+        # Vectors first: on restart only rows present in both files are
+        # replayed.
+        with open(vectors_file, "ab") as f:
+            f.write(np.ascontiguousarray(matrix, dtype=np.float32).tobytes())
+        with open(records_file, "a", encoding="utf-8") as f:
+            f.writelines(
+                json.dumps({"id": i, "metadata": m}) + "\n"
+                for i, m in zip(ids, metadata)
+            )
+
+    @staticmethod
+    def _remove_generation(path: Path, generation: int) -> None:
+        # Unlinking is safe for other processes that still map these files.
+        for name in (
+            "vectors-{}.f32",
+            "ids-{}.jsonl",
+            "index-{}.npz",
+            "segment-{}.f32",
+            "segment-{}.jsonl",
+        ):
+            try:
+                os.remove(path / name.format(generation))
+            except FileNotFoundError:
+                pass
+
+    def _new_index(self):
+        if self.index_kind == "ivf":
+            return IVFIndex(**self.index_params)
+        return FlatIndex()
+
+    def _prepare(self, matrix) -> np.ndarray:
+        matrix = np.asarray(matrix, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix[None, :]
+        if matrix.ndim != 2 or matrix.shape[1] != self.dim:
+            raise ValueError(
+                f"Expected vectors of dimension {self.dim},"
+                f" got shape {matrix.shape}"
+            )
+        if self.metric == "cosine":
+            matrix = _normalize(matrix)
+        return np.ascontiguousarray(matrix)
+
+
+@lru_cache(maxsize=None)
+def open_shared(path: str) -> VectorDB:
+    """
+    The process-wide read-only, memory-mapped VectorDB saved at `path`.
+    Opened in the parent before workers fork, its ids, metadata and index are
+    shared copy-on-write and its vectors through the page cache.
+    """
+    return VectorDB.load(path, mmap=True, read_only=True)
+
+
+def _read_jsonl(path: Path):
+    if not path.exists():
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.endswith("\n"):
+                yield json.loads(line)
+
+
+def _truncate_segment(segment, rows: int, dim: int) -> None:
+    vectors_file, records_file = segment
+    os.truncate(vectors_file, rows * dim * np.dtype(np.float32).itemsize)
+    with open(records_file, "rb+") as f:
+        for _ in range(rows):
+            f.readline()
+        f.truncate()
+
+
+def _write_jsonl(path: Path, records) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(record) + "\n" for record in records)
+
+
+def _write_json_atomic(path: Path, data: dict) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2))
+    os.replace(tmp, path)
@@ -1,5 +1,287 @@
 # tracker.py
+import json
+import logging
+import threading
+import time
+import warnings
+import weakref
+from collections import deque
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# (kind, name, value, step, timestamp) with kind in {"metric", "param"}
+Record = tuple[str, str, Any, Optional[int], float]
+
+
+class NullSink:
+    def write(self, records: Sequence[Record]) -> None:
+        pass
+
+
+class JSONLSink:
+    """
+    Append records to a local JSON Lines file.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, records: Sequence[Record]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(
+                json.dumps(
+                    {
+                        "type": kind,
+                        "name": name,
+                        "value": value,
+                        "step": step,
+                        "timestamp": ts,
+                    }
+                )
+                + "\n"
+                for kind, name, value, step, ts in records
+            )
+
+
+class ParquetSink:
+    """
+    Write each flushed batch as a numbered Parquet file under `directory`
+    (requires pyarrow).
+    """
+
+    def __init__(self, directory: str):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as exc:
+            raise ImportError(
+                "ParquetSink requires the 'pyarrow' package"
+            ) from exc
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._part = len(list(self.directory.glob("part-*.parquet")))
+
+    def write(self, records: Sequence[Record]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        kinds, names, values, steps, timestamps = zip(*records)
+        table = pa.table(
+            {
+                "type": kinds,
+                "name": names,
+                "value": [str(v) for v in values],
+                "step": steps,
+                "timestamp": timestamps,
+            }
+        )
+        pq.write_table(
+            table, self.directory / f"part-{self._part:06d}.parquet"
+        )
+        self._part += 1
+
+
+class MLflowHTTPSink:
+    """
+    Send batches to an MLflow-compatible tracking server via `runs/log-batch`,
+    split to the API's per-request limits (1000 metrics, 100 params).
+    """
+
+    MAX_METRICS = 1000
+    MAX_PARAMS = 100
+
+    def __init__(self, tracking_uri: str, run_id: str, timeout: float = 10.0):
+        import httpx
+
+        self.run_id = run_id
+        self._client = httpx.Client(
+            base_url=tracking_uri.rstrip("/"), timeout=timeout
+        )
+
+    def write(self, records: Sequence[Record]) -> None:
+        metrics = [
+            {
+                "key": name,
+                "value": float(value),
+                "timestamp": int(ts * 1000),
+                "step": step or 0,
+            }
+            for kind, name, value, step, ts in records
+            if kind == "metric"
+        ]
+        params = [
+            {"key": name, "value": str(value)}
+            for kind, name, value, _, _ in records
+            if kind == "param"
+        ]
+        while metrics or params:
+            body = {
+                "run_id": self.run_id,
+                "metrics": metrics[: self.MAX_METRICS],
+                "params": params[: self.MAX_PARAMS],
+            }
+            metrics, params = (
+                metrics[self.MAX_METRICS :],
+                params[self.MAX_PARAMS :],
+            )
+            self._client.post(
+                "/api/2.0/mlflow/runs/log-batch", json=body
+            ).raise_for_status()
+
 
 class Tracker:
-    def log_metric(self, name: str, value: float):
-        pass
\ No newline at end of file
+    """
+    Non-blocking metric tracker.
+
+    `log_metric` and `log_param` only append a tuple to an in-memory buffer;
+    a background thread flushes batches to `sink` whenever `flush_size`
+    records are waiting or every `flush_interval` seconds. The buffer holds at
+    most `max_buffer` records. When it is full, `overflow="drop"` discards new
+    records and counts them in `dropped`, while `overflow="block"` makes the
+    caller wait for the next flush.
+
+    Records still buffered are written by `close()`, or when the tracker is
+    garbage collected or the interpreter exits. The flush thread only holds
+    a weak reference, so an unclosed tracker does not live forever. Records
+    logged after `close()` are dropped with a `RuntimeWarning`.
+    """
+
+    def __init__(
+        self,
+        sink=None,
+        flush_size: int = 1000,
+        flush_interval: float = 1.0,
+        max_buffer: int = 100_000,
+        overflow: str = "drop",
+    ):
+        if overflow not in ("drop", "block"):
+            raise ValueError("overflow must be 'drop' or 'block'")
+        self.sink = sink if sink is not None else NullSink()
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.overflow = overflow
+        self.dropped = 0
+        self.flushed = 0
+        self.failed = 0
+        self._buffer: deque = deque()
+        self._wake = threading.Event()
+        self._space = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=_flush_loop,
+            args=(weakref.ref(self), self._wake, flush_interval),
+            name="tracker-flush",
+            daemon=True,
+        )
+        self._thread.start()
+        # Must not reference self, or the tracker could never be collected.
+        self._finalizer = weakref.finalize(
+            self,
+            _drain,
+            self._buffer,
+            self.sink,
+            flush_size,
+            self._flush_lock,
+            self._wake,
+        )
+
+    def log_metric(self, name: str, value: float, step: Optional[int] = None):
+        self._append(("metric", name, value, step, time.time()))
+
+    def log_metrics(self, metrics: dict, step: Optional[int] = None):
+        ts = time.time()
+        for name, value in metrics.items():
+            self._append(("metric", name, value, step, ts))
+
+    def log_param(self, name: str, value: Any):
+        self._append(("param", name, value, None, time.time()))
+
+    def flush(self) -> None:
+        """
+        Synchronously write everything buffered so far.
+        """
+        with self._flush_lock:
+            while self._buffer:
+                batch = _take_batch(self._buffer, self.flush_size)
+                if _write_batch(self.sink, batch):
+                    self.flushed += len(batch)
+                else:
+                    self.failed += len(batch)
+                with self._space:
+                    self._space.notify_all()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+        self._finalizer.detach()
+
+    def _append(self, record: Record) -> None:
+        if self._closed:
+            self.dropped += 1
+            warnings.warn(
+                "Tracker is closed; record dropped",
+                RuntimeWarning,
+                stacklevel=3,
+            )
+            return
+        buffer = self._buffer
+        if len(buffer) >= self.max_buffer:
+            if self.overflow == "drop":
+                self.dropped += 1
+                return
+            with self._space:
+                while len(buffer) >= self.max_buffer:
+                    self._wake.set()
+                    self._space.wait(self.flush_interval)
+        buffer.append(record)
+        if len(buffer) >= self.flush_size:
+            self._wake.set()
+
+
+def _take_batch(buffer: deque, flush_size: int) -> list[Record]:
+    return [buffer.popleft() for _ in range(min(flush_size, len(buffer)))]
+
+
+def _write_batch(sink, batch: list[Record]) -> bool:
+    try:
+        sink.write(batch)
+        return True
+    except Exception:
+        logger.exception("Tracker sink failed; dropped %d records", len(batch))
+        return False
+
+
+def _flush_loop(
+    ref: "weakref.ref[Tracker]", wake: threading.Event, interval: float
+) -> None:
+    while True:
+        wake.wait(interval)
+        wake.clear()
+        tracker = ref()
+        if tracker is None or tracker._closed:
+            return
+        tracker.flush()
+        del tracker
+
+
+def _drain(
+    buffer: deque,
+    sink,
+    flush_size: int,
+    flush_lock: threading.Lock,
+    wake: threading.Event,
+) -> None:
+    # Finalizer for a tracker that was never closed: stop its thread and write
+    # what is left.
+    wake.set()
+    with flush_lock:
+        while buffer:
+            _write_batch(sink, _take_batch(buffer, flush_size))
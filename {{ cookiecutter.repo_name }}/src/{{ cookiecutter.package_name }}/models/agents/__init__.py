@@ -3,5 +3,6 @@
 """
 Agents subpackage for {{ cookiecutter.package_name }}.
 
-Contains agent manager, protocols, and tool interfaces for A2A/MCP agent communication and orchestration.
+Contains agent manager, protocols, and tool interfaces for A2A/MCP agent
+communication and orchestration.
 """
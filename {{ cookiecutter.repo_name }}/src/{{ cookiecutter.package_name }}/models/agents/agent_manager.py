@@ -1,13 +1,35 @@
 # agent_manager.py
-from .agent_protocols import AgentCard, MCPRequest, MCPResponse
+import asyncio
+from typing import Optional
+
+from ...core.errors import ToolTimeoutError
+from .agent_protocols import (
+    AgentCard,
+    MCPBatchRequest,
+    MCPBatchResponse,
+    MCPRequest,
+    MCPResponse,
+)
+from .tool_interfaces import ClassifyTool, SummarizeTool, ToolRegistry
+
+
+def default_registry() -> ToolRegistry:
+    registry = ToolRegistry()
+    registry.register(SummarizeTool())
+    registry.register(ClassifyTool())
+    return registry
+
 
 class AgentManager:
-    def __init__(self):
+    def __init__(self, registry: Optional[ToolRegistry] = None):
+        self.registry = (
+            registry if registry is not None else default_registry()
+        )
         self.card = AgentCard(
             id="agent-001",
             name="ExampleAgent",
-            capabilities=["summarize", "classify"],
-            endpoints=["/agents/mcp"]
+            capabilities=self.registry.names(),
+            endpoints=["/agents/mcp", "/agents/mcp/batch"],
         )
 
     def get_agent_card(self) -> AgentCard:
@@ -16,12 +38,37 @@ class AgentManager:
         """
         return self.card
 
-    def handle_mcp(self, request: MCPRequest) -> MCPResponse:
+    async def handle_mcp(self, request: MCPRequest) -> MCPResponse:
         """
-        Handle an MCP request (e.g., tool invocation).
+        Handle an MCP request (e.g., tool invocation) by dispatching to the
+        registered tool.
         """
-        # Example: route to a summarization tool
-        if request.tool == "summarize":
-            summary = f"Summary: {request.input[:50]}..."
-            return MCPResponse(result=summary)
-        return MCPResponse(result="Tool not found", error=True)
\ No newline at end of file
+        if request.tool not in self.registry:
+            return MCPResponse(result="Tool not found", error=True)
+        try:
+            result = await self.registry.invoke(request.tool, request.input)
+        except ToolTimeoutError:
+            return MCPResponse(
+                result=f"Tool '{request.tool}' timed out", error=True
+            )
+        except Exception as exc:
+            return MCPResponse(
+                result=f"Tool '{request.tool}' failed: {exc}", error=True
+            )
+        return MCPResponse(result=result)
+
+    async def handle_mcp_batch(
+        self, request: MCPBatchRequest
+    ) -> MCPBatchResponse:
+        """
+        Run independent tool calls concurrently; results keep the order of
+        `request.calls`. Each call fails on its own without affecting the
+        others.
+        """
+        results = await asyncio.gather(
+            *(self.handle_mcp(call) for call in request.calls)
+        )
+        return MCPBatchResponse(results=list(results))
+
+    def tool_stats(self) -> dict:
+        return self.registry.stats()
@@ -1,18 +1,30 @@
 # agent_protocols.py
 
-from pydantic import BaseModel
 from typing import List, Optional
 
+from pydantic import BaseModel
+
+
 class AgentCard(BaseModel):
     id: str
     name: str
     capabilities: List[str]
     endpoints: List[str]
 
+
 class MCPRequest(BaseModel):
     tool: str
     input: str
 
+
 class MCPResponse(BaseModel):
     result: str
-    error: Optional[bool] = False
\ No newline at end of file
+    error: Optional[bool] = False
+
+
+class MCPBatchRequest(BaseModel):
+    calls: List[MCPRequest]
+
+
+class MCPBatchResponse(BaseModel):
+    results: List[MCPResponse]
@@ -1,14 +1,241 @@
 # tool_interfaces.py
+import asyncio
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from ...config.settings import settings
+from ...core.errors import ToolTimeoutError
+
 
 class AgentToolInterface(ABC):
     """
-    Abstract base class for agent tool interfaces.
-    Each tool should implement the execute method, which can be invoked via MCP or A2A protocols.
+    Abstract base class for agent tool interfaces. Each tool should implement
+    the execute method, which can be invoked via MCP or A2A protocols.
+
+    `name` is the key the tool is dispatched by. `timeout` (seconds) and
+    `max_concurrency` bound each tool separately; None means use the
+    `agent_tool_*` settings.
     """
+
+    name: str = ""
+    description: str = ""
+    timeout: Optional[float] = None
+    max_concurrency: Optional[int] = None
+
     @abstractmethod
-    def execute(self, input_data: str) -> str:
+    async def execute(self, input_data: str) -> str:
         """
         Execute the tool with the given input and return the result.
         """
         pass
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=settings.agent_tool_process_workers or None
+            )
+        return _process_pool
+
+
+class SyncTool(AgentToolInterface):
+    """
+    Base for blocking or CPU-heavy tools: implement `run`, and `execute` moves
+    it off the event loop.
+
+    `offload="thread"` suits blocking I/O and code that releases the GIL (e.g.
+    NumPy). `offload="process"` suits pure-Python CPU work; the tool instance
+    must then be picklable. A running job cannot be interrupted, so when
+    `execute` is cancelled it still waits for `run` to return before
+    re-raising. The caller's concurrency slot stays held until then.
+    """
+
+    offload: str = "thread"
+
+    @abstractmethod
+    def run(self, input_data: str) -> str:
+        pass
+
+    async def execute(self, input_data: str) -> str:
+        if self.offload == "process":
+            job = asyncio.get_running_loop().run_in_executor(
+                _get_process_pool(), self.run, input_data
+            )
+        else:
+            job = asyncio.ensure_future(
+                asyncio.to_thread(self.run, input_data)
+            )
+        try:
+            return await asyncio.shield(job)
+        except asyncio.CancelledError:
+            await asyncio.wait({job})
+            raise
+
+
+class ToolStats:
+    """
+    Call counters plus latency percentiles over the most recent `window` calls.
+    """
+
+    def __init__(self, window: int = 1000):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self._latencies: deque = deque(maxlen=window)
+
+    def record(
+        self, seconds: float, error: bool = False, timeout: bool = False
+    ) -> None:
+        self.calls += 1
+        self.errors += error
+        self.timeouts += timeout
+        self._latencies.append(seconds * 1000)
+
+    def snapshot(self) -> dict:
+        latencies = np.fromiter(self._latencies, dtype=np.float64)
+        p50, p95, p99 = (
+            np.percentile(latencies, [50, 95, 99])
+            if len(latencies)
+            else (0.0, 0.0, 0.0)
+        )
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "in_flight": self.in_flight,
+            "latency_ms": {
+                "mean": float(latencies.mean()) if len(latencies) else 0.0,
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+                "max": float(latencies.max()) if len(latencies) else 0.0,
+            },
+        }
+
+
+class ToolRegistry:
+    """
+    Name -> tool map with per-tool concurrency caps, timeouts and latency
+    stats.
+    """
+
+    def __init__(self):
+        self._tools: dict[str, AgentToolInterface] = {}
+        self._stats: dict[str, ToolStats] = {}
+        # Semaphores are bound to the loop they were first awaited on.
+        self._semaphores: weakref.WeakKeyDictionary = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tools
+
+    def register(self, tool: AgentToolInterface) -> AgentToolInterface:
+        if not tool.name:
+            raise ValueError(f"{type(tool).__name__} has no name")
+        self._tools[tool.name] = tool
+        self._stats.setdefault(tool.name, ToolStats())
+        return tool
+
+    def get(self, name: str) -> Optional[AgentToolInterface]:
+        return self._tools.get(name)
+
+    def names(self) -> list[str]:
+        return list(self._tools)
+
+    def stats(self) -> dict[str, dict]:
+        return {name: stats.snapshot() for name, stats in self._stats.items()}
+
+    async def invoke(self, name: str, input_data: str) -> str:
+        """
+        Run tool `name` under its concurrency cap and timeout.
+        Raises KeyError for unknown tools and `ToolTimeoutError` on timeout;
+        errors raised by the tool itself propagate unchanged.
+
+        The caller gets the timeout error right away, but the tool's
+        concurrency slot is only freed once `execute` has actually finished.
+        For a `SyncTool` that means its job has returned, so
+        `max_concurrency` bounds running work, not just waiting callers.
+        """
+        tool = self._tools.get(name)
+        if tool is None:
+            raise KeyError(name)
+        stats = self._stats[name]
+        timeout = (
+            tool.timeout
+            if tool.timeout is not None
+            else settings.agent_tool_timeout_seconds
+        )
+        semaphore = self._semaphore(tool)
+        await semaphore.acquire()
+        stats.in_flight += 1
+        task = asyncio.ensure_future(tool.execute(input_data))
+
+        def finished(_):
+            stats.in_flight -= 1
+            semaphore.release()
+
+        task.add_done_callback(finished)
+        start = time.perf_counter()
+        error = timed_out = False
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError as exc:
+            if task.done():
+                # Raised by the tool itself, not by wait_for.
+                error = True
+                raise
+            timed_out = True
+            task.cancel()
+            raise ToolTimeoutError(
+                f"Tool '{name}' timed out after {timeout}s"
+            ) from exc
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        except Exception:
+            error = True
+            raise
+        finally:
+            stats.record(time.perf_counter() - start, error, timed_out)
+
+    def _semaphore(self, tool: AgentToolInterface) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores.setdefault(loop, {})
+        semaphore = semaphores.get(tool.name)
+        if semaphore is None:
+            limit = tool.max_concurrency or settings.agent_tool_max_concurrency
+            semaphore = semaphores[tool.name] = asyncio.Semaphore(limit)
+        return semaphore
+
+
+class SummarizeTool(AgentToolInterface):
+    name = "summarize"
+    description = "Summarize the input text."
+
+    async def execute(self, input_data: str) -> str:
+        return f"Summary: {input_data[:50]}..."
+
+
+class ClassifyTool(SyncTool):
+    name = "classify"
+    description = "Classify the sentiment of the input text."
+
+    def run(self, input_data: str) -> str:
+        from ...services.classification_service import predict_class
+
+        return predict_class(input_data)
@@ -1,8 +1,211 @@
 # embeddings.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .llm_base import LLMBase
+
+EMBEDDING_DIM = 10
+
 
 def embed_text(text: str) -> list[float]:
     """
     Dummy embedding function.
     Replace with actual embedding model.
     """
-    return [float(ord(c)) for c in text[:10]]
\ No newline at end of file
+    return embed_texts([text])[0].tolist()
+
+
+def _dummy_embed_batch(texts: list[str]) -> np.ndarray:
+    out = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+    for i, text in enumerate(texts):
+        codes = [float(ord(c)) for c in text[:EMBEDDING_DIM]]
+        out[i, : len(codes)] = codes
+    return out
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def cache_key(text: str, model_name: str) -> str:
+    return hashlib.sha256(
+        f"{model_name}\0{normalize_text(text)}".encode("utf-8")
+    ).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Bounded LRU cache of embeddings keyed by `cache_key`, with an optional
+    on-disk tier (one .npy file per key) that survives restarts.
+
+    The disk tier is unbounded unless `disk_maxsize` is set. Then, whenever
+    it grows past that, the least recently used files (by mtime, which disk
+    hits refresh) are deleted down to 90% of the limit.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 100_000,
+        directory: Optional[str] = None,
+        disk_maxsize: Optional[int] = None,
+    ):
+        self.maxsize = maxsize
+        self.directory = Path(directory) if directory else None
+        self.disk_maxsize = disk_maxsize
+        self._disk_count = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if disk_maxsize is not None:
+                self._disk_count = sum(1 for _ in self._disk_files())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vector
+        if self.directory is not None:
+            path = self._disk_path(key)
+            try:
+                vector = np.load(path)
+                if self.disk_maxsize is not None:
+                    os.utime(path)  # mark as recently used
+            except FileNotFoundError:
+                vector = None
+            if vector is not None:
+                self._remember(key, vector)
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                return vector
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        self._remember(key, vector)
+        if self.directory is not None:
+            path = self._disk_path(key)
+            path.parent.mkdir(exist_ok=True)
+            tmp = path.with_suffix(".tmp.npy")
+            np.save(tmp, vector)
+            existed = path.exists()
+            tmp.replace(path)
+            if self.disk_maxsize is not None and not existed:
+                with self._lock:
+                    self._disk_count += 1
+                    if self._disk_count > self.disk_maxsize:
+                        self._prune_disk(int(self.disk_maxsize * 0.9))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _disk_files(self):
+        return self.directory.glob("??/*.npy")
+
+    def _prune_disk(self, keep: int) -> None:
+        files = []
+        for path in self._disk_files():
+            try:
+                files.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                pass
+        files.sort()
+        for _, path in files[: max(0, len(files) - keep)]:
+            path.unlink(missing_ok=True)
+        self._disk_count = min(len(files), keep)
+
+    def _disk_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.npy"
+
+
+default_cache = EmbeddingCache()
+
+
+def embed_texts(
+    texts: Sequence[str],
+    batch_size: int = 64,
+    model: Optional[LLMBase] = None,
+    cache: Optional[EmbeddingCache] = default_cache,
+) -> np.ndarray:
+    """
+    Embed many texts, returning a (len(texts), dim) float32 array.
+
+    Cached and repeated texts are embedded once; the rest are sent to
+    `model.embed_batch` (or the dummy embedder) in chunks of `batch_size`.
+    Pass `cache=None` to bypass caching.
+    """
+    model_name = model.model_name if model is not None else "dummy"
+    embed_batch = (
+        model.embed_batch if model is not None else _dummy_embed_batch
+    )
+    keys = [cache_key(text, model_name) for text in texts]
+
+    found: dict[str, np.ndarray] = {}
+    pending: dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        if key in found or key in pending:
+            continue
+        vector = cache.get(key) if cache is not None else None
+        if vector is not None:
+            found[key] = vector
+        else:
+            pending[key] = text
+
+    pending_keys = list(pending)
+    for start in range(0, len(pending_keys), batch_size):
+        chunk = pending_keys[start : start + batch_size]
+        vectors = np.asarray(
+            embed_batch([pending[key] for key in chunk]), dtype=np.float32
+        )
+        if model is not None:
+            model.embedding_dim = vectors.shape[1]
+        for key, vector in zip(chunk, vectors):
+            found[key] = vector
+            if cache is not None:
+                cache.put(key, vector.copy())
+
+    if not keys:
+        if model is None:
+            return np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+        if model.embedding_dim is None:
+            probe = np.asarray(embed_batch([""]), dtype=np.float32)
+            model.embedding_dim = probe.shape[1]
+        return np.empty((0, model.embedding_dim), dtype=np.float32)
+    return np.stack([found[key] for key in keys]).astype(
+        np.float32, copy=False
+    )
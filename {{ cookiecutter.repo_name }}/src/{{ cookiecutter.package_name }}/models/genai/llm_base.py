@@ -1,14 +1,34 @@
 # llm_base.py
+from typing import Optional
+
+import numpy as np
+
 
 class LLMBase:
     """
     Base class for Large Language Models.
     """
+
+    model_name: str = "default"
+    # Width of `embed_batch` vectors, if known up front; `embed_texts` fills
+    # it in otherwise.
+    embedding_dim: Optional[int] = None
+
     def generate(self, prompt: str) -> str:
         raise NotImplementedError
 
     def embed(self, text: str) -> list[float]:
         raise NotImplementedError
 
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        """
+        Embed many texts in one call, returning a (len(texts), dim) float32
+        array. Providers with a batch endpoint should override this; the
+        default falls back to one `embed` call per text.
+        """
+        return np.asarray(
+            [self.embed(text) for text in texts], dtype=np.float32
+        )
+
     def chat(self, messages: list[dict]) -> str:
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
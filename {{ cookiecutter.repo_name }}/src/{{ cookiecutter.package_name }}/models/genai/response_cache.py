@@ -0,0 +1,104 @@
+# response_cache.py
+import asyncio
+import hashlib
+import json
+from typing import Awaitable, Callable, Optional
+
+from ...infrastructure.storage.cache import InMemoryCacheBackend
+from .embeddings import normalize_text
+
+
+def response_key(prompt: str, model: str, **params) -> str:
+    """
+    Cache key over the whitespace-normalized prompt, model and sampling params.
+    """
+    payload = json.dumps(
+        {"prompt": normalize_text(prompt), "model": model, "params": params},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Response cache with single-flight coalescing.
+
+    Concurrent calls for the same key share one in-flight computation, so N
+    identical requests make exactly one upstream call. Failures are propagated
+    to every waiter and never cached.
+    """
+
+    def __init__(self, backend=None, ttl: float = 300.0):
+        self.backend = (
+            backend if backend is not None else InMemoryCacheBackend()
+        )
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    async def get_or_compute(
+        self, key: str, compute: Callable[[], Awaitable[str]]
+    ) -> str:
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The leading request was cancelled (e.g. client disconnect);
+                # take over.
+                return await self.get_or_compute(key, compute)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            cached = await self.backend.get(key)
+            if cached is not None:
+                self.hits += 1
+                result = json.loads(cached)
+            else:
+                self.misses += 1
+                result = await compute()
+                await self.backend.set(key, json.dumps(result), self.ttl)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark retrieved so an un-awaited failure does not log "exception
+            # never retrieved".
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "in_flight": len(self._in_flight),
+        }
+
+
+def build_response_cache(settings) -> Optional[ResponseCache]:
+    if not settings.llm_cache_enabled:
+        return None
+    if settings.llm_cache_backend == "redis":
+        from ...infrastructure.storage.cache import RedisCacheBackend
+
+        backend = RedisCacheBackend.from_url(settings.redis_url, prefix="llm:")
+    else:
+        backend = InMemoryCacheBackend(
+            max_entries=settings.llm_cache_max_entries
+        )
+    return ResponseCache(backend, ttl=settings.llm_cache_ttl_seconds)
@@ -1,8 +1,92 @@
 # text_generation.py
+from functools import lru_cache
+from typing import AsyncIterator, Optional
+
+from ...config.settings import settings
+from ...infrastructure.llm_providers.base import LLMProviderBase
+from .response_cache import ResponseCache, build_response_cache, response_key
+
+
+@lru_cache(maxsize=None)
+def get_provider() -> Optional[LLMProviderBase]:
+    """
+    Return the provider selected by `settings.llm_provider`, or None for the
+    dummy generator.
+    """
+    if settings.llm_provider == "azure_openai":
+        from ...infrastructure.llm_providers.azure_openai import (
+            AzureOpenAIProvider,
+        )
+
+        return AzureOpenAIProvider()
+    if settings.llm_provider == "gemini":
+        from ...infrastructure.llm_providers.gemini import GeminiProvider
+
+        return GeminiProvider()
+    if settings.llm_provider:
+        raise ValueError(f"Unknown llm_provider '{settings.llm_provider}'")
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_response_cache() -> Optional[ResponseCache]:
+    return build_response_cache(settings)
+
+
+def _model_name(provider: Optional[LLMProviderBase]) -> str:
+    if provider is None:
+        return "dummy"
+    model = getattr(provider, "deployment", None) or getattr(
+        provider, "model", ""
+    )
+    return f"{type(provider).__name__}:{model}"
+
 
 def generate_text(prompt: str) -> str:
     """
     Dummy text generation function.
     Replace with actual model inference.
     """
-    return f"Generated text for: {prompt}"
\ No newline at end of file
+    provider = get_provider()
+    if provider is not None:
+        return provider.generate(prompt)
+    return f"Generated text for: {prompt}"
+
+
+async def agenerate_text(prompt: str) -> str:
+    """
+    Generate text without blocking the event loop. Goes through the response
+    cache (when enabled) so identical concurrent prompts share one upstream
+    call.
+    """
+    provider = get_provider()
+
+    async def compute() -> str:
+        if provider is not None:
+            return await provider.agenerate(prompt)
+        return generate_text(prompt)
+
+    cache = get_response_cache()
+    if cache is None:
+        return await compute()
+    return await cache.get_or_compute(
+        response_key(prompt, _model_name(provider)), compute
+    )
+
+
+async def stream_text(prompt: str) -> AsyncIterator[str]:
+    """
+    Yield the completion for `prompt` token by token as the provider produces
+    it.
+    """
+    provider = get_provider()
+    if provider is None:
+        for i, word in enumerate(generate_text(prompt).split(" ")):
+            yield word if i == 0 else f" {word}"
+        return
+    tokens = provider.astream(prompt)
+    try:
+        async for token in tokens:
+            yield token
+    finally:
+        await tokens.aclose()
@@ -1,5 +1,13 @@
 # model.py
 
+
 class ClassificationModel:
     def predict(self, x):
-        return 1
\ No newline at end of file
+        return 1
+
+    def predict_batch(self, xs: list) -> list:
+        """
+        Score a batch of inputs in one call; replace with a vectorized model
+        call.
+        """
+        return [1] * len(xs)
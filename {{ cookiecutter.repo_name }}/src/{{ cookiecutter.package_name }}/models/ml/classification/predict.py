@@ -1,4 +1,5 @@
 # predict.py
 
+
 def predict(model, x):
-    return model.predict(x)
\ No newline at end of file
+    return model.predict(x)
@@ -1,4 +1,5 @@
 # train.py
 
+
 def train_classification(data):
-    return {"coef": 0.5}
\ No newline at end of file
+    return {"coef": 0.5}
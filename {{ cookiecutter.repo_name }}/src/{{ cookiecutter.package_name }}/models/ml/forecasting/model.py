@@ -1 +1,176 @@
 # model.py
+"""
+Baseline forecasters that fit and predict many series at once.
+
+Series are rows of one 2-D float array of shape (n_series, n_timesteps).
+Every model keeps its fitted state as arrays with one row per series, and
+all arithmetic is vectorized across series. The only Python loops run over
+time steps, forecast horizon or a small parameter grid, never over series.
+"""
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+def as_series_matrix(series) -> np.ndarray:
+    values = np.asarray(series, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[None, :]
+    if values.ndim != 2 or values.shape[1] == 0:
+        raise ValueError(
+            "series must be a non-empty 2-D array"
+            " of shape (n_series, n_timesteps)"
+        )
+    return values
+
+
+class ForecastModel:
+    min_length = 1
+
+    def fit(self, series) -> "ForecastModel":
+        raise NotImplementedError
+
+    def predict(self, horizon: int) -> np.ndarray:
+        """
+        Forecast the next `horizon` steps as an array of shape
+        (n_series, horizon).
+        """
+        raise NotImplementedError
+
+    def fit_predict(self, series, horizon: int) -> np.ndarray:
+        return self.fit(series).predict(horizon)
+
+    def _check(self, series) -> np.ndarray:
+        values = as_series_matrix(series)
+        if values.shape[1] < self.min_length:
+            raise ValueError(
+                f"{type(self).__name__} needs at least {self.min_length}"
+                " observations per series"
+            )
+        return values
+
+
+class SeasonalNaive(ForecastModel):
+    """
+    Repeat the last observed season (`season_length=1` is the plain naive
+    forecast).
+    """
+
+    def __init__(self, season_length: int = 1):
+        self.season_length = season_length
+        self.min_length = season_length
+        self.last_season: Optional[np.ndarray] = None
+
+    def fit(self, series) -> "SeasonalNaive":
+        self.last_season = self._check(series)[:, -self.season_length :].copy()
+        return self
+
+    def predict(self, horizon: int) -> np.ndarray:
+        reps = -(-horizon // self.season_length)
+        return np.tile(self.last_season, reps)[:, :horizon]
+
+
+class ExponentialSmoothing(ForecastModel):
+    """
+    Simple exponential smoothing.
+
+    With `alpha=None`, each series gets the alpha from `alpha_grid` with the
+    lowest one-step-ahead squared error. All grid values are smoothed
+    together as a (grid, series) array in one pass over time.
+    """
+
+    def __init__(
+        self,
+        alpha: Optional[float] = None,
+        alpha_grid: Sequence[float] = (0.05, 0.1, 0.2, 0.3, 0.5, 0.7, 0.9),
+    ):
+        self.alpha = alpha
+        self.alpha_grid = np.asarray(
+            [alpha] if alpha is not None else alpha_grid, dtype=np.float64
+        )
+        self.alphas: Optional[np.ndarray] = None
+        self.level: Optional[np.ndarray] = None
+
+    def fit(self, series) -> "ExponentialSmoothing":
+        values = self._check(series)
+        alphas = self.alpha_grid[:, None]
+        level = np.repeat(values[None, :, 0], len(alphas), axis=0)
+        sse = np.zeros_like(level)
+        for t in range(1, values.shape[1]):
+            error = values[:, t] - level
+            sse += error * error
+            level = level + alphas * error
+        best = sse.argmin(axis=0)
+        columns = np.arange(values.shape[0])
+        self.alphas = self.alpha_grid[best]
+        self.level = level[best, columns]
+        return self
+
+    def predict(self, horizon: int) -> np.ndarray:
+        return np.repeat(self.level[:, None], horizon, axis=1)
+
+
+class AutoRegressive(ForecastModel):
+    """
+    AR(`order`) with intercept, fitted per series by (ridge-regularized) least
+    squares.
+
+    The normal equations of every series are stacked into (n_series, p+1, p+1)
+    by batched matmul and solved in a single batched `np.linalg.solve`.
+    """
+
+    def __init__(self, order: int = 3, ridge: float = 1e-6):
+        self.order = order
+        self.ridge = ridge
+        self.min_length = order + 2
+        self.coef: Optional[np.ndarray] = None
+        self.history: Optional[np.ndarray] = None
+
+    def fit(self, series) -> "AutoRegressive":
+        values = self._check(series)
+        n, length = values.shape
+        p = self.order
+        # lags[:, i, j] = y[t - 1 - j] for target y[t], t = p .. length-1
+        windows = np.lib.stride_tricks.sliding_window_view(values, p, axis=1)[
+            :, : length - p
+        ]
+        lags = windows[:, :, ::-1]
+        design = np.concatenate([np.ones((n, length - p, 1)), lags], axis=2)
+        target = values[:, p:]
+        design_t = design.transpose(0, 2, 1)
+        gram = design_t @ design + self.ridge * np.eye(p + 1)
+        rhs = design_t @ target[:, :, None]
+        self.coef = np.linalg.solve(gram, rhs)[:, :, 0]
+        self.history = values[:, -p:][:, ::-1].copy()
+        return self
+
+    def predict(self, horizon: int) -> np.ndarray:
+        lags = self.history.copy()
+        out = np.empty((lags.shape[0], horizon))
+        for h in range(horizon):
+            step = self.coef[:, 0] + np.einsum(
+                "ni,ni->n", self.coef[:, 1:], lags
+            )
+            out[:, h] = step
+            lags = np.concatenate([step[:, None], lags[:, :-1]], axis=1)
+        return out
+
+
+MODELS = {
+    "seasonal_naive": SeasonalNaive,
+    "ses": ExponentialSmoothing,
+    "ar": AutoRegressive,
+}
+
+
+def make_model(method: str, **params) -> ForecastModel:
+    try:
+        cls = MODELS[method]
+    except KeyError:
+        raise ValueError(
+            f"Unknown forecasting method '{method}';"
+            f" expected one of {sorted(MODELS)}"
+        ) from None
+    return cls(
+        **{key: value for key, value in params.items() if value is not None}
+    )
@@ -1 +1,6 @@
 # predict.py
+import numpy as np
+
+
+def predict(model, horizon: int) -> np.ndarray:
+    return model.predict(horizon)
@@ -1 +1,10 @@
 # train.py
+from .model import ForecastModel, make_model
+
+
+def train_forecasting(series, method: str = "ses", **params) -> ForecastModel:
+    """
+    Fit one forecaster over all rows of `series` (n_series, n_timesteps) at
+    once.
+    """
+    return make_model(method, **params).fit(series)
@@ -0,0 +1,230 @@
+# registry.py
+import json
+import logging
+import os
+import pickle
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = "CURRENT"
+
+
+def _version_key(name: str):
+    # Natural sort so v10 ranks above v9.
+    return [
+        int(part) if part.isdigit() else part
+        for part in re.split(r"(\d+)", name)
+    ]
+
+
+def load_artifact(version_dir: Path) -> Any:
+    """
+    Load the model artifact in a version folder.
+
+    `.npy` arrays are memory-mapped read-only and `.npz` archives are opened
+    lazily, so large weights are paged in on demand; `.joblib` files are
+    memory-mapped when joblib is installed; `.pkl` files are unpickled.
+    """
+    for name, load in (
+        ("model.npy", lambda p: np.load(p, mmap_mode="r")),
+        ("model.npz", lambda p: np.load(p)),
+        ("model.joblib", _load_joblib),
+        ("model.pkl", _load_pickle),
+    ):
+        path = version_dir / name
+        if path.exists():
+            return load(path)
+    raise FileNotFoundError(f"No model artifact found in {version_dir}")
+
+
+def _load_pickle(path: Path) -> Any:
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def _load_joblib(path: Path) -> Any:
+    import joblib
+
+    return joblib.load(path, mmap_mode="r")
+
+
+class ModelRegistry:
+    """
+    Serves the current model version from a local `model_registry/` layout.
+
+    The serving version is named in `<root>/CURRENT`, or is the highest
+    version folder if that file is absent. The model is loaded on first use
+    and warmed up with `warmup_inputs` before it takes traffic. `promote()`
+    loads and warms the new version alongside the old one, then swaps a single
+    reference, so requests never see a half-loaded model and at most two
+    models are resident during the swap; the old one is released as soon as
+    its in-flight requests finish.
+
+    `promote()` only swaps the model in the calling process. Other processes
+    (forked workers, other pods) pick up the new `CURRENT` through
+    `maybe_refresh()`, which checks the file at most once per
+    `refresh_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        loader: Callable[[Path], Any] = load_artifact,
+        default_factory: Optional[Callable[[], Any]] = None,
+        warmup_inputs: Sequence[Any] = (),
+        refresh_interval: float = 5.0,
+    ):
+        self.root = Path(root)
+        self.loader = loader
+        self.default_factory = default_factory
+        self.warmup_inputs = list(warmup_inputs)
+        self.refresh_interval = refresh_interval
+        self._current: Optional[tuple[str, Any, dict]] = None
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        self._seen_stamp: Optional[tuple[int, int]] = None
+
+    def versions(self) -> list[str]:
+        if not self.root.is_dir():
+            return []
+        return sorted(
+            (p.name for p in self.root.iterdir() if p.is_dir()),
+            key=_version_key,
+        )
+
+    def resolve_version(self) -> Optional[str]:
+        current_file = self.root / CURRENT_FILE
+        if current_file.exists():
+            return current_file.read_text().strip()
+        versions = self.versions()
+        return versions[-1] if versions else None
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._load_current()[0]
+
+    @property
+    def metrics(self) -> dict:
+        return self._load_current()[2]
+
+    def get(self) -> Any:
+        """
+        Return the serving model, loading and warming it up on first call.
+        """
+        return self._load_current()[1]
+
+    def promote(self, version: str) -> None:
+        """
+        Make `version` the serving model without interrupting traffic.
+        Only the name of a version folder directly under the root is accepted.
+        """
+        self._check_version(version)
+        with self._lock:
+            self._current = self._load(version)
+            tmp = self.root / f"{CURRENT_FILE}.tmp"
+            tmp.write_text(version)
+            os.replace(tmp, self.root / CURRENT_FILE)
+
+    def refresh(self) -> bool:
+        """
+        Swap to the version named on disk if it changed (e.g. another pod
+        promoted it).
+        """
+        version = self.resolve_version()
+        if version is None or (
+            self._current is not None and self._current[0] == version
+        ):
+            return False
+        self._check_version(version)
+        with self._lock:
+            self._current = self._load(version)
+        return True
+
+    def maybe_refresh(self) -> bool:
+        """
+        `refresh()` if `CURRENT` changed since the last check, at most once per
+        `refresh_interval`.
+
+        Cheap enough to call per request or batch: between checks it only reads
+        the clock, and a check is one `stat` unless the file changed. A bad
+        version on disk is logged and the serving model is kept.
+        """
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        self._next_check = now + self.refresh_interval
+        try:
+            stat = (self.root / CURRENT_FILE).stat()
+        except OSError:
+            return False
+        # promote() replaces the file, so the inode changes even within one
+        # mtime tick.
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        if stamp == self._seen_stamp:
+            return False
+        self._seen_stamp = stamp
+        try:
+            return self.refresh()
+        except FileNotFoundError as exc:
+            logger.error("Not refreshing the model: %s", exc)
+            return False
+
+    def _check_version(self, version: str) -> None:
+        # Artifacts may be pickles, so never load from outside the registry
+        # root.
+        if (
+            not version
+            or version in (".", "..")
+            or "/" in version
+            or "\\" in version
+            or version not in self.versions()
+        ):
+            raise FileNotFoundError(f"Unknown model version '{version}'")
+
+    def _load_current(self) -> tuple[Optional[str], Any, dict]:
+        current = self._current
+        if current is not None:
+            return current
+        with self._lock:
+            if self._current is None:
+                version = self.resolve_version()
+                if version is None:
+                    if self.default_factory is None:
+                        raise FileNotFoundError(
+                            f"No model versions under {self.root}"
+                        )
+                    self._current = (
+                        None,
+                        self._warm_up(self.default_factory()),
+                        {},
+                    )
+                else:
+                    self._current = self._load(version)
+            return self._current
+
+    def _load(self, version: str) -> tuple[str, Any, dict]:
+        version_dir = self.root / version
+        model = self._warm_up(self.loader(version_dir))
+        metrics_file = version_dir / "metrics.json"
+        metrics = (
+            json.loads(metrics_file.read_text())
+            if metrics_file.exists()
+            else {}
+        )
+        return version, model, metrics
+
+    def _warm_up(self, model: Any) -> Any:
+        if self.warmup_inputs:
+            if hasattr(model, "predict_batch"):
+                model.predict_batch(self.warmup_inputs)
+            elif hasattr(model, "predict"):
+                for item in self.warmup_inputs:
+                    model.predict(item)
+        return model
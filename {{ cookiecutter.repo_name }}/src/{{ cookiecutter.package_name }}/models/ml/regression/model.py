@@ -1 +1,198 @@
 # model.py
+"""
+Linear and ridge regression that train out-of-core, one batch at a time.
+
+`NormalEquationRegressor` accumulates X'X and X'y, which take
+O(n_features^2) memory whatever the number of rows, and solves once at the
+end. `SGDRegressor` takes one mini-batch gradient step per batch. Both
+predict a whole batch with a single matrix-vector product and save to a
+small `.npz` file.
+"""
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+def records_to_matrix(
+    records: Sequence[dict], feature_names: Sequence[str]
+) -> np.ndarray:
+    """
+    Stack dict records into an (n_rows, n_features) float64 matrix, one column
+    at a time.
+    """
+    matrix = np.empty((len(records), len(feature_names)))
+    for j, name in enumerate(feature_names):
+        matrix[:, j] = np.fromiter(
+            (record[name] for record in records),
+            dtype=np.float64,
+            count=len(records),
+        )
+    return matrix
+
+
+class LinearRegressor:
+    """
+    Shared prediction and serialization for fitted linear models.
+    """
+
+    kind = "linear"
+
+    def __init__(
+        self, feature_names: Optional[Sequence[str]] = None, alpha: float = 0.0
+    ):
+        self.feature_names = (
+            list(feature_names) if feature_names is not None else None
+        )
+        self.alpha = alpha
+        self.coef: Optional[np.ndarray] = None
+        self.intercept = 0.0
+        self.n_samples = 0
+
+    def predict_batch(self, xs) -> np.ndarray:
+        """
+        Predict for a 2-D feature array, or for dict records when
+        `feature_names` is set.
+        """
+        if len(xs) and isinstance(xs[0], dict):
+            xs = records_to_matrix(xs, self.feature_names)
+        return np.asarray(xs, dtype=np.float64) @ self.coef + self.intercept
+
+    def predict(self, x) -> float:
+        return float(self.predict_batch([x])[0])
+
+    def save(self, path) -> None:
+        np.savez(
+            path,
+            kind=np.array(self.kind),
+            coef=self.coef,
+            intercept=np.array(self.intercept),
+            alpha=np.array(self.alpha),
+            n_samples=np.array(self.n_samples),
+            feature_names=np.array(self.feature_names or [], dtype=str),
+        )
+
+    @classmethod
+    def load(cls, path) -> "LinearRegressor":
+        """
+        Load a model saved by `save`, from the file or a directory holding
+        `model.npz`. `ModelRegistry`'s default loader returns a bare `.npz`
+        archive, so serve regression models with
+        `ModelRegistry(root, loader=LinearRegressor.load)`.
+        """
+        path = Path(path)
+        if path.is_dir():
+            path = path / "model.npz"
+        with np.load(path) as data:
+            model_cls = REGRESSORS.get(str(data["kind"]), cls)
+            model = model_cls(
+                data["feature_names"].tolist() or None,
+                alpha=float(data["alpha"]),
+            )
+            model.coef = data["coef"]
+            model.intercept = float(data["intercept"])
+            model.n_samples = int(data["n_samples"])
+        return model
+
+
+class NormalEquationRegressor(LinearRegressor):
+    """
+    Exact least squares (`alpha=0`) or ridge regression from streamed
+    sufficient statistics.
+
+    Every batch is shifted by the first batch's means before its sums are
+    added, and the sums are centered on the overall means when X'X is
+    solved, so the intercept is not regularized. The shift keeps the sums
+    small: centering raw sums of features near 1e6 would subtract two
+    numbers around 1e12 * n and lose most of their digits.
+    """
+
+    kind = "normal_equation"
+
+    def __init__(
+        self, feature_names: Optional[Sequence[str]] = None, alpha: float = 0.0
+    ):
+        super().__init__(feature_names, alpha)
+        self._xtx: Optional[np.ndarray] = None
+        self._xty: Optional[np.ndarray] = None
+        self._x_sum: Optional[np.ndarray] = None
+        self._y_sum = 0.0
+        self._x_shift: Optional[np.ndarray] = None
+        self._y_shift = 0.0
+
+    def partial_fit(self, X, y) -> "NormalEquationRegressor":
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if self._xtx is None:
+            d = X.shape[1]
+            self._xtx, self._xty, self._x_sum = (
+                np.zeros((d, d)),
+                np.zeros(d),
+                np.zeros(d),
+            )
+            self._x_shift, self._y_shift = X.mean(axis=0), float(y.mean())
+        X = X - self._x_shift
+        y = y - self._y_shift
+        self._xtx += X.T @ X
+        self._xty += X.T @ y
+        self._x_sum += X.sum(axis=0)
+        self._y_sum += float(y.sum())
+        self.n_samples += len(y)
+        return self
+
+    def finalize(self) -> "NormalEquationRegressor":
+        if not self.n_samples:
+            raise ValueError("No training data")
+        n = self.n_samples
+        # Means of the shifted data; these are small, so the corrections below
+        # are too.
+        x_mean, y_mean = self._x_sum / n, self._y_sum / n
+        xtx = self._xtx - n * np.outer(x_mean, x_mean)
+        xty = self._xty - n * x_mean * y_mean
+        xtx[np.diag_indices_from(xtx)] += self.alpha
+        self.coef = np.linalg.lstsq(xtx, xty, rcond=None)[0]
+        self.intercept = float(
+            self._y_shift + y_mean - (self._x_shift + x_mean) @ self.coef
+        )
+        return self
+
+
+class SGDRegressor(LinearRegressor):
+    """
+    Mini-batch gradient descent on squared error plus `alpha`-weighted L2.
+    """
+
+    kind = "sgd"
+
+    def __init__(
+        self,
+        feature_names: Optional[Sequence[str]] = None,
+        alpha: float = 0.0,
+        learning_rate: float = 0.01,
+    ):
+        super().__init__(feature_names, alpha)
+        self.learning_rate = learning_rate
+
+    def partial_fit(self, X, y) -> "SGDRegressor":
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if self.coef is None:
+            self.coef = np.zeros(X.shape[1])
+        residual = X @ self.coef + self.intercept - y
+        self.coef -= self.learning_rate * (
+            X.T @ residual / len(y) + self.alpha * self.coef
+        )
+        self.intercept -= self.learning_rate * float(residual.mean())
+        self.n_samples += len(y)
+        return self
+
+    def finalize(self) -> "SGDRegressor":
+        if self.coef is None:
+            raise ValueError("No training data")
+        return self
+
+
+REGRESSORS = {
+    NormalEquationRegressor.kind: NormalEquationRegressor,
+    SGDRegressor.kind: SGDRegressor,
+}
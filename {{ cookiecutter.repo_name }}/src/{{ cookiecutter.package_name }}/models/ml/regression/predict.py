@@ -1 +1,6 @@
 # predict.py
+import numpy as np
+
+
+def predict(model, xs) -> np.ndarray:
+    return model.predict_batch(xs)
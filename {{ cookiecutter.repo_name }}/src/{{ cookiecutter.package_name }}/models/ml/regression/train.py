@@ -1 +1,47 @@
 # train.py
+from typing import Callable, Iterable, Sequence, Union
+
+from .model import NormalEquationRegressor, SGDRegressor, records_to_matrix
+
+Batches = Union[Iterable[list[dict]], Callable[[], Iterable[list[dict]]]]
+
+
+def train_regression(
+    batches: Batches,
+    feature_names: Sequence[str],
+    target: str,
+    method: str = "normal_equation",
+    alpha: float = 0.0,
+    epochs: int = 1,
+    learning_rate: float = 0.01,
+):
+    """
+    Train on streamed record batches, e.g. from
+    `pipelines.data_ingestion.iter_batches`, without holding the dataset in
+    memory.
+
+    `method="normal_equation"` is exact in one pass. `method="sgd"` can make
+    several passes; for `epochs > 1`, pass a zero-argument callable that
+    returns a fresh batch iterator.
+    """
+    if method == "normal_equation":
+        model = NormalEquationRegressor(feature_names, alpha=alpha)
+        epochs = 1
+    elif method == "sgd":
+        model = SGDRegressor(
+            feature_names, alpha=alpha, learning_rate=learning_rate
+        )
+    else:
+        raise ValueError("method must be 'normal_equation' or 'sgd'")
+    if epochs > 1 and not callable(batches):
+        raise ValueError(
+            "epochs > 1 needs a callable that returns a fresh batch iterator"
+        )
+    for _ in range(epochs):
+        for batch in batches() if callable(batches) else batches:
+            if batch:
+                model.partial_fit(
+                    records_to_matrix(batch, feature_names),
+                    records_to_matrix(batch, [target])[:, 0],
+                )
+    return model.finalize()
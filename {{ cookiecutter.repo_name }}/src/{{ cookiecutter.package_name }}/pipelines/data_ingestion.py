@@ -1,8 +1,164 @@
 # data_ingestion.py
+import csv
+import glob
+import json
+import queue
+import threading
+from pathlib import Path
+from typing import Iterator, Sequence, Union
+
+Batch = list[dict]
+Sources = Union[str, Path, Sequence[Union[str, Path]]]
+
+SUPPORTED_SUFFIXES = (".csv", ".jsonl", ".ndjson", ".parquet")
+
 
 def ingest_data(source: str) -> list[dict]:
     """
-    Dummy data ingestion.
-    Replace with actual data loading logic.
+    Load every record from `source` into memory.
+    Prefer `iter_batches` for anything that may not fit in RAM.
+    """
+    return [record for batch in iter_batches(source) for record in batch]
+
+
+def resolve_sources(sources: Sources) -> list[Path]:
+    """
+    Expand a file, directory, glob pattern, or list of them into data files.
+    """
+    if isinstance(sources, (str, Path)):
+        sources = [sources]
+    files: list[Path] = []
+    for source in map(str, sources):
+        if glob.has_magic(source):
+            files.extend(
+                Path(p) for p in sorted(glob.glob(source, recursive=True))
+            )
+        elif Path(source).is_dir():
+            files.extend(
+                sorted(
+                    p
+                    for p in Path(source).rglob("*")
+                    if p.suffix in SUPPORTED_SUFFIXES
+                )
+            )
+        elif Path(source).exists():
+            files.append(Path(source))
+        else:
+            raise FileNotFoundError(f"No such data source: {source}")
+    return files
+
+
+def read_file(path: Path, batch_size: int = 10_000) -> Iterator[Batch]:
+    """
+    Yield fixed-size record batches from one CSV, JSONL or Parquet file.
+    """
+    suffix = path.suffix.lower()
+    if suffix == ".parquet":
+        yield from _read_parquet(path, batch_size)
+        return
+    if suffix == ".csv":
+        f = open(path, newline="", encoding="utf-8")
+        rows = csv.DictReader(f)
+    elif suffix in (".jsonl", ".ndjson"):
+        f = open(path, encoding="utf-8")
+        rows = (json.loads(line) for line in f if line.strip())
+    else:
+        raise ValueError(f"Unsupported data file type: {path}")
+    with f:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _read_parquet(path: Path, batch_size: int) -> Iterator[Batch]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError(
+            "Reading Parquet requires the 'pyarrow' package"
+        ) from exc
+    for record_batch in pq.ParquetFile(path).iter_batches(
+        batch_size=batch_size
+    ):
+        yield record_batch.to_pylist()
+
+
+_DONE = object()
+
+
+def iter_batches(
+    sources: Sources,
+    batch_size: int = 10_000,
+    readahead: int = 4,
+    max_workers: int = 4,
+) -> Iterator[Batch]:
     """
-    return [{"text": "sample", "label": 1}]
\ No newline at end of file
+    Stream record batches from one or more files.
+
+    Up to `max_workers` files are read concurrently, and at most `readahead`
+    batches wait in memory ahead of the consumer, so peak memory is about
+    (readahead + max_workers) * batch_size records whatever the dataset size.
+    Batches from different files are interleaved in arrival order.
+    """
+    files = resolve_sources(sources)
+    if len(files) <= 1 or max_workers <= 1:
+        for path in files:
+            yield from read_file(path, batch_size)
+        return
+
+    ready: queue.Queue = queue.Queue(maxsize=readahead)
+    pending: queue.Queue = queue.Queue()
+    for path in files:
+        pending.put(path)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def reader() -> None:
+        try:
+            while not stop.is_set():
+                try:
+                    path = pending.get_nowait()
+                except queue.Empty:
+                    break
+                for batch in read_file(path, batch_size):
+                    if not put(batch):
+                        return
+        except Exception as exc:
+            put(exc)
+        finally:
+            put(_DONE)
+
+    threads = [
+        threading.Thread(target=reader, daemon=True)
+        for _ in range(min(max_workers, len(files)))
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        remaining = len(threads)
+        while remaining:
+            item = ready.get()
+            if item is _DONE:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        # Runs on normal exit, on error and when the consumer stops early.
+        stop.set()
+        for thread in threads:
+            thread.join()
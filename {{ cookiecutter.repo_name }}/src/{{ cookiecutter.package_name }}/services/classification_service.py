@@ -1,13 +1,24 @@
 # classification_service.py
 
+
 def predict_class(text: str) -> str:
     """
     Dummy classification service function.
     Replace with actual model inference logic.
     """
-    if "good" in text.lower():
-        return "positive"
-    elif "bad" in text.lower():
-        return "negative"
-    else:
-        return "neutral"
+    return predict_classes([text])[0]
+
+
+def predict_classes(texts: list[str]) -> list[str]:
+    """
+    Classify a batch of texts in one pass; list in, list out.
+    """
+    results = []
+    for text in map(str.lower, texts):
+        if "good" in text:
+            results.append("positive")
+        elif "bad" in text:
+            results.append("negative")
+        else:
+            results.append("neutral")
+    return results
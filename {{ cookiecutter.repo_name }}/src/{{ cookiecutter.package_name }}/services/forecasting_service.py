@@ -1 +1,37 @@
 # forecasting_service.py
+from collections import defaultdict
+from typing import Optional
+
+import numpy as np
+
+from ..models.ml.forecasting.train import train_forecasting
+
+
+def forecast_series(
+    series: list[list[float]],
+    horizon: int,
+    method: str = "ses",
+    season_length: Optional[int] = None,
+    order: Optional[int] = None,
+) -> list[list[float]]:
+    """
+    Forecast `horizon` steps for every series; list in, list out.
+    Series of equal length are stacked and fitted together as one 2-D array.
+    """
+    by_length = defaultdict(list)
+    for i, values in enumerate(series):
+        by_length[len(values)].append(i)
+    params = {
+        "seasonal_naive": {"season_length": season_length},
+        "ar": {"order": order},
+    }.get(method, {})
+    forecasts: list = [None] * len(series)
+    for indices in by_length.values():
+        model = train_forecasting(
+            np.array([series[i] for i in indices], dtype=np.float64),
+            method,
+            **params,
+        )
+        for i, row in zip(indices, model.predict(horizon).tolist()):
+            forecasts[i] = row
+    return forecasts
@@ -1,4 +1,265 @@
 # rag_service.py
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+from ..config.settings import settings
+from ..infrastructure.storage.lexical_index import BM25Index
+from ..infrastructure.storage.vector_db import VectorDB
+from ..models.genai.embeddings import EMBEDDING_DIM, embed_texts
+from ..models.genai.text_generation import agenerate_text, generate_text
+from ..prompts.templates import registry as prompt_registry
+from ..prompts.tokens import TokenCounter, default_counter
+
+# Shared by every pipeline, so building short-lived pipelines does not leak
+# threads. Workers are started lazily, on the first search.
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rag")
+
+
+@dataclass
+class RetrievedChunk:
+    id: str
+    text: str
+    score: float
+    ranks: dict = field(default_factory=dict)
+
+
+@dataclass
+class RAGResult:
+    query: str
+    chunks: list[RetrievedChunk]
+    prompt: str
+    answer: str = ""
+    timings: dict = field(default_factory=dict)
+
+
+def reciprocal_rank_fusion(
+    rankings: dict[str, Sequence[str]],
+    weights: Optional[dict[str, float]] = None,
+    k: int = 60,
+) -> list[tuple[str, float, dict]]:
+    """
+    Fuse ranked id lists: score(d) = sum over retrievers of
+    weight / (k + rank), with ranks starting at 1. Returns
+    (id, score, {retriever: rank}) best first.
+    """
+    weights = weights or {}
+    scores: dict[str, float] = {}
+    ranks: dict[str, dict] = {}
+    for name, ids in rankings.items():
+        weight = weights.get(name, 1.0)
+        for rank, id_ in enumerate(ids, start=1):
+            scores[id_] = scores.get(id_, 0.0) + weight / (k + rank)
+            ranks.setdefault(id_, {})[name] = rank
+    fused = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    return [(id_, score, ranks[id_]) for id_, score in fused]
+
+
+class RAGPipeline:
+    """
+    Hybrid retrieval-augmented generation.
+
+    Stages: query embedding, then top-k vector search over `VectorDB`, run
+    concurrently with BM25 lexical search; reciprocal-rank fusion of the two
+    candidate lists; packing the best chunks into the `rag_answer` prompt
+    within `token_budget`; generation. Each result carries per-stage
+    latencies in milliseconds. Vector and lexical timings overlap, so they do
+    not add up to `retrieve`.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[list[str]], np.ndarray] = embed_texts,
+        dim: int = EMBEDDING_DIM,
+        vector_db: Optional[VectorDB] = None,
+        lexical: Optional[BM25Index] = None,
+        top_k: Optional[int] = None,
+        candidates: Optional[int] = None,
+        rrf_k: Optional[int] = None,
+        vector_weight: Optional[float] = None,
+        lexical_weight: Optional[float] = None,
+        token_budget: Optional[int] = None,
+        template: str = "rag_answer",
+        counter: TokenCounter = default_counter,
+    ):
+        self.embed = embed
+        self.vector_db = vector_db if vector_db is not None else VectorDB(dim)
+        self.lexical = lexical if lexical is not None else BM25Index()
+        self.top_k = top_k or settings.rag_top_k
+        self.candidates = candidates or settings.rag_candidates
+        self.rrf_k = rrf_k or settings.rag_rrf_k
+        self.weights = {
+            "vector": settings.rag_vector_weight
+            if vector_weight is None
+            else vector_weight,
+            "lexical": settings.rag_lexical_weight
+            if lexical_weight is None
+            else lexical_weight,
+        }
+        self.token_budget = token_budget or settings.rag_context_token_budget
+        self.template = prompt_registry.get(template)
+        self.counter = counter
+        self.documents: dict[str, str] = {}
+
+    def add_documents(
+        self,
+        ids: Sequence[str],
+        texts: Sequence[str],
+        metadata: Optional[Sequence[Optional[dict]]] = None,
+    ) -> None:
+        ids = [str(i) for i in ids]
+        vectors = self.embed(list(texts))
+        self.vector_db.add_embeddings(ids, vectors, metadata)
+        self.lexical.add_documents(ids, texts)
+        self.documents.update(zip(ids, texts))
+
+    def retrieve(
+        self, query: str, k: Optional[int] = None
+    ) -> tuple[list[RetrievedChunk], dict]:
+        """
+        Return the fused top-k chunks and per-stage timings (ms).
+        """
+        k = k or self.top_k
+        timings: dict[str, float] = {}
+        start = time.perf_counter()
+        lexical = _executor.submit(
+            self._timed,
+            timings,
+            "lexical_search",
+            self.lexical.search,
+            query,
+            self.candidates,
+        )
+        vector_hits = self._vector_search(query, timings)
+        lexical_hits = lexical.result()
+        chunks = self._fuse(vector_hits, lexical_hits, k, timings)
+        timings["retrieve"] = (time.perf_counter() - start) * 1000
+        return chunks, timings
+
+    def build_prompt(
+        self, query: str, chunks: Sequence[RetrievedChunk]
+    ) -> str:
+        """
+        Render the prompt with as many chunks (best first) as fit in the token
+        budget.
+        """
+        overhead = self.counter.count_template(
+            self.template, context="", question=query
+        )
+        packed = self.counter.fit(
+            [chunk.text for chunk in chunks], self.token_budget - overhead
+        )
+        return self.template.render(
+            context="\n\n".join(packed), question=query
+        )
+
+    def run(self, query: str, k: Optional[int] = None) -> RAGResult:
+        start = time.perf_counter()
+        result = self._prepare(query, k)
+        result.answer = self._timed(
+            result.timings, "generate", generate_text, result.prompt
+        )
+        result.timings["total"] = (time.perf_counter() - start) * 1000
+        return result
+
+    async def arun(self, query: str, k: Optional[int] = None) -> RAGResult:
+        """
+        Async `run`: the two retrievers run concurrently in worker threads,
+        generation on the event loop.
+        """
+        start = time.perf_counter()
+        k = k or self.top_k
+        timings: dict[str, float] = {}
+        # Each retriever gets its own thread; nesting them on one bounded pool
+        # can deadlock.
+        vector_hits, lexical_hits = await asyncio.gather(
+            asyncio.to_thread(self._vector_search, query, timings),
+            asyncio.to_thread(
+                self._timed,
+                timings,
+                "lexical_search",
+                self.lexical.search,
+                query,
+                self.candidates,
+            ),
+        )
+        chunks = self._fuse(vector_hits, lexical_hits, k, timings)
+        timings["retrieve"] = (time.perf_counter() - start) * 1000
+        prompt = await asyncio.to_thread(
+            self._timed,
+            timings,
+            "pack_context",
+            self.build_prompt,
+            query,
+            chunks,
+        )
+        result = RAGResult(query, chunks, prompt, timings=timings)
+        generate_start = time.perf_counter()
+        result.answer = await agenerate_text(result.prompt)
+        result.timings["generate"] = (
+            time.perf_counter() - generate_start
+        ) * 1000
+        result.timings["total"] = (time.perf_counter() - start) * 1000
+        return result
+
+    def _prepare(self, query: str, k: Optional[int]) -> RAGResult:
+        chunks, timings = self.retrieve(query, k)
+        prompt = self._timed(
+            timings, "pack_context", self.build_prompt, query, chunks
+        )
+        return RAGResult(query, chunks, prompt, timings=timings)
+
+    def _fuse(
+        self, vector_hits: list, lexical_hits: list, k: int, timings: dict
+    ) -> list[RetrievedChunk]:
+        start = time.perf_counter()
+        fused = reciprocal_rank_fusion(
+            {
+                "vector": [id_ for id_, _ in vector_hits],
+                "lexical": [id_ for id_, _ in lexical_hits],
+            },
+            self.weights,
+            self.rrf_k,
+        )[:k]
+        chunks = [
+            RetrievedChunk(id_, self.documents.get(id_, ""), score, ranks)
+            for id_, score, ranks in fused
+        ]
+        timings["fusion"] = (time.perf_counter() - start) * 1000
+        return chunks
+
+    def _vector_search(
+        self, query: str, timings: dict
+    ) -> list[tuple[str, float]]:
+        if not len(self.vector_db):
+            return []
+        vector = self._timed(timings, "embed_query", self.embed, [query])
+        return self._timed(
+            timings,
+            "vector_search",
+            self.vector_db.search_batch,
+            vector,
+            self.candidates,
+        )[0]
+
+    @staticmethod
+    def _timed(timings: dict, stage: str, fn, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            timings[stage] = (time.perf_counter() - start) * 1000
+
+
+@lru_cache(maxsize=None)
+def get_pipeline() -> RAGPipeline:
+    return RAGPipeline()
+
 
 def retrieve_and_generate(query: str) -> str:
-    return f"RAG result for: {query}"
\ No newline at end of file
+    return get_pipeline().run(query).answer
@@ -1,7 +1,15 @@
 # sentiment_service.py
 
+
 def predict_sentiment(text: str) -> str:
     """
     Dummy sentiment prediction.
     """
-    return "positive" if "good" in text else "negative"
\ No newline at end of file
+    return predict_sentiments([text])[0]
+
+
+def predict_sentiments(texts: list[str]) -> list[str]:
+    """
+    Predict sentiment for a batch of texts; list in, list out.
+    """
+    return ["positive" if "good" in text else "negative" for text in texts]
@@ -1,10 +1,16 @@
 # summarization_service.py
 
+
 def summarize_text(text: str) -> str:
     """
     Dummy summarization service function.
     Replace with actual summarization model or API call.
     """
-    if len(text) > 50:
-        return text[:47] + "..."
-    return text
+    return summarize_texts([text])[0]
+
+
+def summarize_texts(texts: list[str]) -> list[str]:
+    """
+    Summarize a batch of texts; list in, list out.
+    """
+    return [text[:47] + "..." if len(text) > 50 else text for text in texts]
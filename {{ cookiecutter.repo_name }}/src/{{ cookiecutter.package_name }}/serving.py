@@ -0,0 +1,157 @@
+# serving.py
+"""
+Pre-forking server: load models and large read-only arrays once, then fork
+workers.
+
+Workers forked after `preload` share the parent's pages copy-on-write, so a
+4-worker pod holds one copy of the model instead of four. Run with:
+
+    python -m src.{{ cookiecutter.package_name }}.serving --workers 4
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+
+import uvicorn
+
+from .config.settings import settings
+from .utils.memory import process_memory
+
+logger = logging.getLogger(__name__)
+
+
+def preload(app) -> None:
+    """
+    Run the app's preload hooks (model loads, warm-ups) in the parent process.
+    """
+    for hook in getattr(app.state, "preload_hooks", []):
+        hook()
+    # Move everything loaded so far out of the GC's generations; otherwise the
+    # first collection in each worker writes to those objects and un-shares
+    # their pages.
+    gc.collect()
+    gc.freeze()
+
+
+def _run_worker(app, sock: socket.socket) -> None:
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    server = uvicorn.Server(uvicorn.Config(app, log_level="info"))
+    server.run(sockets=[sock])
+
+
+def report_worker_memory(pids) -> list[dict]:
+    reports = [process_memory(pid) for pid in pids]
+    for report in reports:
+        logger.info("worker memory: %s", report)
+    return reports
+
+
+def restart_delay(crashes: int) -> float:
+    """
+    Seconds to wait before respawning after `crashes` consecutive early exits.
+    """
+    if crashes <= 0:
+        return 0.0
+    return min(
+        settings.worker_restart_max_delay_seconds, 0.5 * 2 ** (crashes - 1)
+    )
+
+
+def serve(host: str, port: int, workers: int) -> None:
+    from .api.app import app
+
+    logging.basicConfig(level=logging.INFO)
+    preload(app)
+    logger.info("preloaded app, parent memory: %s", process_memory())
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    children: dict[int, float] = {}
+    stopping = False
+    crashes = 0
+
+    def spawn() -> None:
+        pid = os.fork()
+        if pid == 0:
+            try:
+                _run_worker(app, sock)
+            finally:
+                os._exit(0)
+        children[pid] = time.monotonic()
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(workers):
+        spawn()
+    threading.Timer(
+        settings.worker_memory_report_delay_seconds,
+        lambda: report_worker_memory(list(children)),
+    ).start()
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        started = children.pop(pid, None)
+        if stopping:
+            continue
+        # Back off while workers keep dying at startup (bad model, port clash)
+        # instead of fork-looping; a worker that ran for a while resets the
+        # count.
+        if (
+            started is not None
+            and time.monotonic() - started
+            >= settings.worker_min_uptime_seconds
+        ):
+            crashes = 0
+        else:
+            crashes += 1
+        delay = restart_delay(crashes)
+        logger.warning(
+            "worker %s exited with status %s, restarting in %.1fs",
+            pid,
+            status,
+            delay,
+        )
+        time.sleep(delay)
+        if not stopping:
+            spawn()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument(
+        "--port", type=int, default=int(os.getenv("PORT", 8000))
+    )
+    parser.add_argument(
+        "--workers", type=int, default=settings.web_concurrency
+    )
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# batching.py
+import asyncio
+from typing import Any, Callable, Optional, Sequence
+
+from ..core.errors import OverloadedError
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-item requests into batches for a vectorized
+    function.
+
+    A batch is flushed once it holds `max_batch_size` items or the oldest item
+    has waited `max_wait_ms`. `batch_fn` runs in the default thread pool so
+    CPU-bound inference does not stall the event loop. `submit` raises
+    `OverloadedError` when `max_queue_size` items are already waiting.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list], Sequence[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        max_queue_size: int = 1024,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue_size = max_queue_size
+        self.batches = 0
+        self.items = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def queue_size(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def submit(self, item: Any) -> Any:
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            raise OverloadedError(
+                f"Batch queue is full ({self.max_queue_size} waiting)"
+            ) from None
+        return await future
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+        self._queue = None
+
+    def _ensure_started(self) -> None:
+        # The worker is started lazily on (and bound to) the loop serving
+        # requests.
+        loop = asyncio.get_running_loop()
+        if (
+            self._worker is None
+            or self._worker.done()
+            or self._loop is not loop
+        ):
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+            # Requests cancelled while queued (client went away) are not
+            # scored.
+            batch = [
+                (item, future) for item, future in batch if not future.done()
+            ]
+            if not batch:
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            try:
+                results = await loop.run_in_executor(
+                    None, self.batch_fn, [item for item, _ in batch]
+                )
+                if len(results) != len(batch):
+                    raise ValueError(
+                        f"batch_fn returned {len(results)} results"
+                        f" for {len(batch)} items"
+                    )
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches
+            if self.batches
+            else 0.0,
+            "queue_size": self.queue_size,
+        }
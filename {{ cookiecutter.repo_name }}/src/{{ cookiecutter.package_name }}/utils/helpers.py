@@ -1,4 +1,5 @@
 # helpers.py
 
+
 def to_upper(text: str) -> str:
-    return text.upper()
\ No newline at end of file
+    return text.upper()
@@ -0,0 +1,57 @@
+# memory.py
+import os
+import resource
+import sys
+from typing import Optional
+
+
+def process_memory(pid: Optional[int] = None) -> dict:
+    """
+    Memory usage of a process in bytes.
+
+    RSS counts shared pages in every process that maps them, so for forked
+    workers PSS (shared pages split between their users) is the number that
+    adds up to the pod's real footprint. PSS/shared figures need Linux
+    /proc/<pid>/smaps_rollup. Without it, RSS comes from /proc/<pid>/status,
+    and failing that only this process's peak RSS (`max_rss_bytes`) is known;
+    for another process nothing is, and only the pid is returned.
+    """
+    pid = pid or os.getpid()
+    fields = _read_kb_fields(f"/proc/{pid}/smaps_rollup")
+    if not fields:
+        status = _read_kb_fields(f"/proc/{pid}/status")
+        if "VmRSS" in status:
+            return {"pid": pid, "rss_bytes": status["VmRSS"]}
+        if pid != os.getpid():
+            return {"pid": pid}
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is kB on Linux but bytes on macOS.
+        return {
+            "pid": pid,
+            "max_rss_bytes": max_rss
+            if sys.platform == "darwin"
+            else max_rss * 1024,
+        }
+    return {
+        "pid": pid,
+        "rss_bytes": fields.get("Rss", 0),
+        "pss_bytes": fields.get("Pss", 0),
+        "shared_bytes": fields.get("Shared_Clean", 0)
+        + fields.get("Shared_Dirty", 0),
+        "private_bytes": fields.get("Private_Clean", 0)
+        + fields.get("Private_Dirty", 0),
+    }
+
+
+def _read_kb_fields(path: str) -> dict:
+    # Parses "Name:   123 kB" lines, as used by smaps_rollup and status.
+    fields = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1]) * 1024
+    except OSError:
+        pass
+    return fields
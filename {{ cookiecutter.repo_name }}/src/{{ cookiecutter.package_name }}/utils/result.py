@@ -1,6 +1,7 @@
 # result.py
 
+
 class Result:
     def __init__(self, value, error=None):
         self.value = value
-        self.error = error
\ No newline at end of file
+        self.error = error
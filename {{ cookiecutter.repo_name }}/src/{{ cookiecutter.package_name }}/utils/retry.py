@@ -1,10 +1,379 @@
 # retry.py
+"""
+Retries with jittered exponential backoff, retry budgets, circuit breakers and
+hedged requests.
+"""
+import asyncio
+import functools
+import random
+import threading
 import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, Tuple, Type, TypeVar, Union
 
-def retry(func, retries=3, delay=1):
-    for _ in range(retries):
+import numpy as np
+
+from ..core.errors import CircuitOpenError
+
+T = TypeVar("T")
+RetryOn = Union[
+    Tuple[Type[BaseException], ...], Callable[[BaseException], bool]
+]
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """
+    "Full jitter" backoff: uniform in [0, cap], where
+    cap = min(max_delay, base_delay * 2**attempt).
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2**attempt))
+
+
+def _should_retry(exc: BaseException, retry_on: RetryOn) -> bool:
+    if isinstance(retry_on, tuple):
+        return isinstance(exc, retry_on)
+    return retry_on(exc)
+
+
+def retry(
+    func, retries=3, delay=1, max_delay=30.0, retry_on: RetryOn = (Exception,)
+):
+    """
+    Call `func` up to `retries` times with jittered exponential backoff,
+    re-raising the last error. Blocks the calling thread between attempts; use
+    `retry_async` in async code.
+    """
+    for attempt in range(retries):
         try:
             return func()
-        except Exception:
-            time.sleep(delay)
-    raise Exception("Max retries exceeded")
\ No newline at end of file
+        except Exception as exc:
+            if attempt == retries - 1 or not _should_retry(exc, retry_on):
+                raise
+            time.sleep(backoff_delay(attempt, delay, max_delay))
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of recent traffic so retries cannot multiply
+    load during an outage.
+
+    Each call deposits `ratio` tokens and each retry withdraws one. A floor
+    of `min_per_second` retries keeps low-traffic clients usable. Tokens are
+    capped at `ratio * 10 + min_per_second` (a few seconds of normal traffic).
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = ratio * 10 + min_per_second
+        self._tokens = self.max_tokens
+        self._last = time.monotonic()
+        self.exhausted = 0
+        self._lock = threading.Lock()
+
+    def record_call(self) -> None:
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            self.exhausted += 1
+            return False
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.max_tokens,
+            self._tokens + (now - self._last) * self.min_per_second,
+        )
+        self._last = now
+
+
+class CircuitBreaker:
+    """
+    Fail fast while a dependency is down.
+
+    Closed: calls pass; `failure_threshold` consecutive failures open it.
+    Open: calls raise `CircuitOpenError` immediately for `recovery_timeout`
+    seconds. Half-open: up to `half_open_max_calls` trial calls pass; one
+    success closes the circuit, one failure re-opens it. A trial that ends
+    without either (e.g. it was cancelled) must hand its slot back with
+    `release`. Trial slots held for longer than `recovery_timeout` are
+    treated as abandoned, so a lost slot cannot wedge the breaker.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.failures = 0
+        self.rejected = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_started = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if (
+                self._state == self.OPEN
+                and time.monotonic() - self._opened_at >= self.recovery_timeout
+            ):
+                self._state, self._trials = self.HALF_OPEN, 0
+            return self._state
+
+    def before_call(self) -> None:
+        state = self.state
+        with self._lock:
+            if (
+                state == self.HALF_OPEN
+                and self._trials >= self.half_open_max_calls
+                and time.monotonic() - self._trial_started
+                >= self.recovery_timeout
+            ):
+                self._trials = 0
+            if state == self.OPEN or (
+                state == self.HALF_OPEN
+                and self._trials >= self.half_open_max_calls
+            ):
+                self.rejected += 1
+                raise CircuitOpenError(f"Circuit '{self.name}' is open")
+            if state == self.HALF_OPEN:
+                self._trials += 1
+                self._trial_started = time.monotonic()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._state = self.CLOSED
+
+    def release(self) -> None:
+        """
+        Give back a half-open trial slot whose call finished with no verdict.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if (
+                self._state == self.HALF_OPEN
+                or self.failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected,
+        }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """
+    The process-wide breaker for dependency `name`, created on first use.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name, **kwargs)
+        return breaker
+
+
+class Hedger:
+    """
+    Hedged requests: if an attempt has not finished after the observed
+    `quantile` latency, start a second one and take whichever finishes first.
+
+    Until `min_samples` latencies are recorded the hedge delay is
+    `initial_delay` (None disables hedging until then). Only hedge idempotent
+    calls: both attempts may reach the server. A hedge is extra load, so it
+    is skipped while `breaker` is not closed or `budget` has no token.
+    """
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        min_samples: int = 20,
+        window: int = 1000,
+        initial_delay: Optional[float] = None,
+    ):
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._latencies: deque = deque(maxlen=window)
+
+    def delay(self) -> Optional[float]:
+        if len(self._latencies) < self.min_samples:
+            return self.initial_delay
+        return float(
+            np.quantile(
+                np.fromiter(self._latencies, dtype=np.float64), self.quantile
+            )
+        )
+
+    def record(self, seconds: float) -> None:
+        self._latencies.append(seconds)
+
+    async def run(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        budget: Optional[RetryBudget] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> T:
+        start = time.perf_counter()
+        delay = self.delay()
+        primary = asyncio.ensure_future(fn())
+        if delay is None:
+            result = await primary
+            self.record(time.perf_counter() - start)
+            return result
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if (
+                done
+                or (
+                    breaker is not None
+                    and breaker.state != CircuitBreaker.CLOSED
+                )
+                or (budget is not None and not budget.try_spend())
+            ):
+                result = await primary
+                self.record(time.perf_counter() - start)
+                return result
+            self.hedged += 1
+            hedge = asyncio.ensure_future(fn())
+            tasks.append(hedge)
+            pending = {primary, hedge}
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next(
+                    (
+                        task
+                        for task in done
+                        if not task.cancelled() and task.exception() is None
+                    ),
+                    None,
+                )
+                if winner is not None:
+                    self.hedge_wins += winner is hedge
+                    self.record(time.perf_counter() - start)
+                    return winner.result()
+                if not pending:
+                    # Both attempts failed; surface the primary's error unless
+                    # it was cancelled.
+                    return (hedge if primary.cancelled() else primary).result()
+        finally:
+            # Also runs when the caller is cancelled, so no attempt outlives
+            # the call.
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+
+async def retry_async(
+    fn: Callable[..., Awaitable[T]],
+    *args,
+    retries: int = 3,
+    base_delay: float = 0.1,
+    max_delay: float = 10.0,
+    retry_on: RetryOn = (Exception,),
+    budget: Optional[RetryBudget] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    hedger: Optional[Hedger] = None,
+    **kwargs,
+) -> T:
+    """
+    Await `fn(*args, **kwargs)` with up to `retries` attempts.
+
+    Waits between attempts with `asyncio.sleep`, so the event loop is never
+    blocked. An error is retried only if it matches `retry_on` (a tuple of
+    exception types or a predicate) and `budget` has a token to spend;
+    otherwise the last error is re-raised. `breaker` short-circuits with
+    `CircuitOpenError` while open, and that error is never retried. Only
+    retryable errors count as breaker failures.
+    `hedger` races a second attempt against a slow one; the hedge spends a
+    `budget` token and is not sent while `breaker` is not closed.
+    """
+    if budget is not None:
+        budget.record_call()
+    call = functools.partial(fn, *args, **kwargs)
+    for attempt in range(retries):
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            result = await (
+                hedger.run(call, budget, breaker)
+                if hedger is not None
+                else call()
+            )
+        except asyncio.CancelledError:
+            if breaker is not None:
+                breaker.release()
+            raise
+        except Exception as exc:
+            retryable = _should_retry(exc, retry_on)
+            if breaker is not None:
+                # A non-retryable error (e.g. a 4xx) still means the dependency
+                # answered.
+                if retryable:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            if (
+                not retryable
+                or attempt == retries - 1
+                or (budget is not None and not budget.try_spend())
+            ):
+                raise
+            await asyncio.sleep(backoff_delay(attempt, base_delay, max_delay))
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
+    raise AssertionError("unreachable")
+
+
+def async_retry(**options):
+    """
+    Decorator form of `retry_async`, e.g.
+    `@async_retry(retries=4, breaker=get_breaker("vector-db"))`.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            return await retry_async(fn, *args, **options, **kwargs)
+
+        return wrapper
+
+    return decorator
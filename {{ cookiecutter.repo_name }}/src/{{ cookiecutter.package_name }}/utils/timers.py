@@ -1,10 +1,12 @@
 # timers.py
 import time
 
+
 class Timer:
     def __enter__(self):
         self.start = time.time()
         return self
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.end = time.time()
-        self.interval = self.end - self.start
\ No newline at end of file
+        self.interval = self.end - self.start
@@ -1,2 +1,2 @@
 # Version info
-__version__ = "0.1.0"
\ No newline at end of file
+__version__ = "0.1.0"
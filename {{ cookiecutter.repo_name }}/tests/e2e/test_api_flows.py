@@ -1,16 +1,20 @@
 # E2E Test Example
-import pytest
-from httpx import AsyncClient
+import asyncio
 import importlib.util
-import sys
+import json
 import os
+import sys
+
+import pytest
+from httpx import AsyncClient
 
 # Dynamically import the app module
-src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
 sys.path.insert(0, src_path)
-app_module = importlib.import_module('src.{{ cookiecutter.package_name }}.api.app')
+app_module = importlib.import_module("src.{{ cookiecutter.package_name }}.api.app")
 app = app_module.app
 
+
 @pytest.mark.asyncio
 async def test_health_check():
     async with AsyncClient(app=app, base_url="http://test") as ac:
@@ -18,6 +22,7 @@ async def test_health_check():
         assert response.status_code == 200
         assert response.json() == {"status": "ok"}
 
+
 @pytest.mark.asyncio
 async def test_genai_generate():
     async with AsyncClient(app=app, base_url="http://test") as ac:
@@ -25,3 +30,166 @@ async def test_genai_generate():
         response = await ac.post("/genai/generate", json=payload)
         assert response.status_code == 200
         assert "result" in response.json()
+
+
+@pytest.mark.asyncio
+async def test_genai_generate_sse_stream():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        payload = {"prompt": "Hello, world!"}
+        response = await ac.post(
+            "/genai/generate",
+            json=payload,
+            headers={"Accept": "text/event-stream"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [
+            line[len("data: ") :]
+            for line in response.text.splitlines()
+            if line.startswith("data: ")
+        ]
+        assert events[-1] == "[DONE]"
+        assert (
+            "".join(json.loads(e)["token"] for e in events[:-1])
+            == "Generated text for: Hello, world!"
+        )
+
+
+@pytest.mark.asyncio
+async def test_genai_generate_ndjson_stream():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        payload = {"prompt": "Hello"}
+        response = await ac.post(
+            "/genai/generate",
+            json=payload,
+            headers={"Accept": "application/x-ndjson"},
+        )
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[-1] == {"done": True}
+        assert (
+            "".join(line["token"] for line in lines[:-1])
+            == "Generated text for: Hello"
+        )
+
+
+@pytest.mark.asyncio
+async def test_ml_predict_batches_concurrent_requests():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        responses = await asyncio.gather(
+            *(
+                ac.post("/ml/predict", json={"prompt": f"text {i}"})
+                for i in range(10)
+            )
+        )
+        assert all(
+            r.status_code == 200 and r.json() == {"result": "1"}
+            for r in responses
+        )
+
+
+@pytest.mark.asyncio
+async def test_batch_routes():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        payload = {"texts": ["good stuff", "bad stuff", "meh"]}
+        response = await ac.post("/ml/classify_batch", json=payload)
+        assert response.json() == {
+            "results": ["positive", "negative", "neutral"]
+        }
+{%- if cookiecutter.use_sentiment == "yes" %}
+        response = await ac.post(
+            "/ml/sentiment_batch",
+            json=payload,
+            headers={"Accept": "application/x-ndjson"},
+        )
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["index"] for line in lines] == [0, 1, 2]
+        assert lines[0]["result"] == "positive"
+{%- endif %}
+{%- if cookiecutter.use_summarization == "yes" %}
+        response = await ac.post(
+            "/ml/summarize_batch", json={"texts": ["x" * 10_001]}
+        )
+        assert response.status_code == 200
+{%- endif %}
+        response = await ac.post(
+            "/ml/predict_batch", json={"texts": ["a"] * 10_001}
+        )
+        assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_health_memory():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/health/memory")
+        assert response.status_code == 200
+        body = response.json()
+        assert body.get("rss_bytes", body.get("max_rss_bytes", 0)) > 0
+
+
+{% if cookiecutter.use_forecasting == "yes" -%}
+@pytest.mark.asyncio
+async def test_forecast_route():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        payload = {
+            "series": [[1, 2, 3, 4], [4, 3, 2, 1]],
+            "horizon": 3,
+            "method": "seasonal_naive",
+            "season_length": 2,
+        }
+        response = await ac.post("/ml/forecast", json=payload)
+        assert response.json() == {"forecasts": [[3, 4, 3], [2, 1, 2]]}
+        response = await ac.post(
+            "/ml/forecast",
+            json={"series": [[1, 2]], "method": "ar", "order": 3},
+        )
+        assert response.status_code == 422
+
+
+{% endif -%}
+{% if cookiecutter.use_agents == "yes" -%}
+@pytest.mark.asyncio
+async def test_agent_routes():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/agents/card")
+        assert response.json()["capabilities"] == ["summarize", "classify"]
+        response = await ac.post(
+            "/agents/mcp/batch",
+            json={
+                "calls": [
+                    {"tool": "summarize", "input": "hello"},
+                    {"tool": "classify", "input": "good film"},
+                ]
+            },
+        )
+        assert [r["result"] for r in response.json()["results"]] == [
+            "Summary: hello...",
+            "positive",
+        ]
+        response = await ac.get("/agents/tools/stats")
+        assert response.json()["classify"]["calls"] >= 1
+
+
+{% endif -%}
+@pytest.mark.asyncio
+async def test_metrics_endpoint():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        await ac.get("/health/")
+        response = await ac.get("/metrics")
+        assert response.headers["content-type"].startswith(
+            "text/plain; version=0.0.4"
+        )
+        assert (
+            'http_requests_total{method="GET",route="/health/",status="200"}'
+            in response.text
+        )
+
+
+@pytest.mark.asyncio
+async def test_model_promotion_requires_admin_token():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post(
+            "/ml/model/promote",
+            json={"version": "/tmp"},
+            headers={"X-Admin-Token": "x"},
+        )
+        assert response.status_code == 403
@@ -0,0 +1,246 @@
+# Admission Control Tests
+import asyncio
+import importlib
+import os
+import sys
+
+import pytest
+from fastapi import FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+admission = importlib.import_module("src.{{ cookiecutter.package_name }}.api.admission")
+errors = importlib.import_module("src.{{ cookiecutter.package_name }}.core.errors")
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refills_over_time():
+    backend = admission.InMemoryRateLimitBackend()
+    assert [
+        await backend.take("t", 1, rate=100, burst=2) for _ in range(2)
+    ] == [0.0, 0.0]
+    wait = await backend.take("t", 1, rate=100, burst=2)
+    assert 0 < wait <= 0.01
+    await asyncio.sleep(wait + 0.005)
+    assert await backend.take("t", 1, rate=100, burst=2) == 0.0
+    # Buckets are independent per key, and a cost above the burst drains a
+    # full bucket.
+    assert await backend.take("other", 50, rate=1, burst=10) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_then_rejects():
+    limiter = admission.ConcurrencyLimiter(
+        limit=1, max_queue=1, max_wait=0.05, interval=10
+    )
+    await limiter.acquire()
+    queued = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+    with pytest.raises(errors.OverloadedError):
+        await limiter.acquire()
+    limiter.release()
+    await queued
+    assert limiter.in_flight == 1 and limiter.queued == 0
+    with pytest.raises(errors.OverloadedError):
+        await asyncio.create_task(limiter.acquire())
+    limiter.release()
+    assert limiter.in_flight == 0 and limiter.rejected == 2
+
+
+@pytest.mark.asyncio
+async def test_standing_queue_triggers_shedding():
+    limiter = admission.ConcurrencyLimiter(
+        limit=1, max_queue=10, max_wait=1, target=0.01, interval=0.02
+    )
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0.05)
+    limiter.release()
+    await waiter
+    assert limiter.shedding
+    with pytest.raises(errors.OverloadedError, match="shedding"):
+        await limiter.acquire()
+    # Once a slot is free, the next request starts without waiting and ends
+    # shedding.
+    limiter.release()
+    await limiter.acquire()
+    assert not limiter.shedding
+
+
+def _app(controller):
+    app = FastAPI()
+    gate = asyncio.Event()
+
+    @app.get("/health/")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/genai/slow")
+    async def slow():
+        await gate.wait()
+        return {"done": True}
+
+    app.add_middleware(admission.AdmissionMiddleware, controller=controller)
+    return app, gate
+
+
+@pytest.mark.asyncio
+async def test_saturated_route_returns_503_but_health_stays_up():
+    controller = admission.AdmissionController(
+        route_limits={"/genai": 1},
+        max_queue=0,
+        requests_per_second=0,
+        exempt_prefixes=["/health"],
+    )
+    app, gate = _app(controller)
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        first = asyncio.create_task(ac.get("/genai/slow"))
+        await asyncio.sleep(0.01)
+        response = await ac.get("/genai/slow")
+        assert (
+            response.status_code == 503 and "retry-after" in response.headers
+        )
+        assert (await ac.get("/health/")).status_code == 200
+        gate.set()
+        assert (await first).status_code == 200
+    assert controller.stats()["routes"]["/genai"]["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_is_per_api_key():
+    controller = admission.AdmissionController(
+        route_limits={},
+        default_limit=0,
+        requests_per_second=0.5,
+        request_burst=2,
+        exempt_prefixes=[],
+        api_keys=["a", "b"],
+    )
+    app, _ = _app(controller)
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        statuses = [
+            (await ac.get("/health/", headers={"X-API-Key": "a"})).status_code
+            for _ in range(3)
+        ]
+        assert statuses == [200, 200, 429]
+        response = await ac.get("/health/", headers={"X-API-Key": "a"})
+        assert response.headers["retry-after"] == "2"
+        assert (
+            await ac.get("/health/", headers={"X-API-Key": "b"})
+        ).status_code == 200
+    assert (
+        'admission_rate_limited_total{bucket="requests"} 2'
+        in controller.render()
+    )
+
+
+@pytest.mark.asyncio
+async def test_unknown_api_keys_share_the_client_ip_bucket():
+    controller = admission.AdmissionController(
+        route_limits={},
+        default_limit=0,
+        requests_per_second=0.5,
+        request_burst=2,
+        exempt_prefixes=[],
+        api_keys=["a"],
+        limit_by_ip=True,
+    )
+    app, _ = _app(controller)
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        statuses = [
+            (
+                await ac.get("/health/", headers={"X-API-Key": f"rotated-{i}"})
+            ).status_code
+            for i in range(3)
+        ]
+        assert statuses == [200, 200, 429]
+        assert (await ac.get("/health/")).status_code == 429
+        assert (
+            await ac.get("/health/", headers={"X-API-Key": "a"})
+        ).status_code == 200
+    assert len(controller.backend._buckets) == 2
+
+
+@pytest.mark.asyncio
+async def test_requests_without_a_known_key_skip_rate_limits_by_default():
+    controller = admission.AdmissionController(
+        route_limits={},
+        default_limit=0,
+        requests_per_second=0,
+        llm_tokens_per_minute=60,
+        exempt_prefixes=[],
+        api_keys=["a"],
+    )
+    app, _ = _app(controller)
+
+    @app.get("/genai/charge")
+    async def charge(request: Request):
+        await admission.charge_llm_tokens(request, 60)
+        return {}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        for _ in range(3):
+            assert (await ac.get("/genai/charge")).status_code == 200
+        statuses = [
+            (
+                await ac.get("/genai/charge", headers={"X-API-Key": "a"})
+            ).status_code
+            for _ in range(2)
+        ]
+        assert statuses == [200, 429]
+    assert controller.llm_rate_limited == 1
+
+
+def test_shedding_is_per_event_loop():
+    limiter = admission.ConcurrencyLimiter(
+        limit=1, max_queue=10, max_wait=1, target=0.01, interval=0.02
+    )
+
+    async def build_standing_queue():
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.05)
+        limiter.release()
+        await waiter
+
+    async def queue_one():
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        limiter.release()
+        await waiter
+        limiter.release()
+
+    shedding_loop = asyncio.new_event_loop()
+    try:
+        shedding_loop.run_until_complete(build_standing_queue())
+        assert limiter.shedding
+        asyncio.run(queue_one())
+    finally:
+        shedding_loop.close()
+
+
+@pytest.mark.asyncio
+async def test_llm_token_bucket():
+    controller = admission.AdmissionController(llm_tokens_per_minute=600)
+    assert (
+        await controller.take_llm_tokens(
+            "t", admission.estimate_llm_tokens("x" * 400, 500)
+        )
+        == 0.0
+    )
+    assert await controller.take_llm_tokens("t", 100) == pytest.approx(
+        10, rel=0.01
+    )
+    assert controller.llm_rate_limited == 1
@@ -0,0 +1,177 @@
+# Agent Tool Tests
+import asyncio
+import importlib
+import os
+import sys
+import time
+
+import pytest
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+tool_interfaces = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.models.agents.tool_interfaces"
+)
+agent_manager = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.models.agents.agent_manager"
+)
+agent_protocols = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.models.agents.agent_protocols"
+)
+
+
+class SleepTool(tool_interfaces.AgentToolInterface):
+    name = "sleep"
+    timeout = 0.5
+    max_concurrency = 2
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def execute(self, input_data: str) -> str:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(float(input_data))
+        finally:
+            self.active -= 1
+        return f"slept {input_data}"
+
+
+class BlockingTool(tool_interfaces.SyncTool):
+    name = "blocking"
+
+    def run(self, input_data: str) -> str:
+        time.sleep(0.1)
+        return input_data.upper()
+
+
+def _manager():
+    registry = agent_manager.default_registry()
+    sleep_tool = registry.register(SleepTool())
+    registry.register(BlockingTool())
+    return agent_manager.AgentManager(registry), sleep_tool
+
+
+def _batch(*calls):
+    return agent_protocols.MCPBatchRequest(
+        calls=[agent_protocols.MCPRequest(tool=t, input=i) for t, i in calls]
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_calls_concurrently_with_caps_and_timeouts():
+    manager, sleep_tool = _manager()
+    start = time.perf_counter()
+    response = await manager.handle_mcp_batch(
+        _batch(
+            ("sleep", "0.1"),
+            ("sleep", "0.1"),
+            ("sleep", "0.1"),
+            ("sleep", "5"),
+            ("blocking", "abc"),
+            ("blocking", "def"),
+            ("nope", "x"),
+            ("summarize", "hello"),
+        )
+    )
+    elapsed = time.perf_counter() - start
+    results = response.results
+    assert [r.result for r in results[:3]] == ["slept 0.1"] * 3
+    assert results[3].error and "timed out" in results[3].result
+    assert [r.result for r in results[4:6]] == ["ABC", "DEF"]
+    assert results[6].error and results[6].result == "Tool not found"
+    assert results[7].result == "Summary: hello..."
+    assert sleep_tool.peak == 2
+    assert elapsed < 1.0
+
+    stats = manager.tool_stats()
+    assert stats["sleep"]["calls"] == 4 and stats["sleep"]["timeouts"] == 1
+    assert stats["blocking"]["latency_ms"]["p50"] >= 100
+
+
+@pytest.mark.asyncio
+async def test_blocking_tool_does_not_stall_event_loop():
+    manager, _ = _manager()
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    await asyncio.gather(
+        manager.handle_mcp(
+            agent_protocols.MCPRequest(tool="blocking", input="x")
+        ),
+        ticker(),
+    )
+    assert ticks == 5
+
+
+@pytest.mark.asyncio
+async def test_failing_tool_reports_error():
+    class Broken(tool_interfaces.AgentToolInterface):
+        name = "broken"
+
+        async def execute(self, input_data: str) -> str:
+            raise RuntimeError("boom")
+
+    registry = tool_interfaces.ToolRegistry()
+    registry.register(Broken())
+    manager = agent_manager.AgentManager(registry)
+    response = await manager.handle_mcp(
+        agent_protocols.MCPRequest(tool="broken", input="")
+    )
+    assert response.error and "boom" in response.result
+    assert manager.get_agent_card().capabilities == ["broken"]
+
+
+@pytest.mark.asyncio
+async def test_timed_out_sync_job_keeps_its_slot_until_it_returns():
+    class SlowTool(tool_interfaces.SyncTool):
+        name = "slow"
+        timeout = 0.05
+        max_concurrency = 1
+        spans = []
+
+        def run(self, input_data: str) -> str:
+            start = time.perf_counter()
+            time.sleep(0.2)
+            self.spans.append((start, time.perf_counter()))
+            return input_data
+
+    registry = tool_interfaces.ToolRegistry()
+    tool = registry.register(SlowTool())
+    for input_data in ("a", "b"):
+        with pytest.raises(asyncio.TimeoutError):
+            await registry.invoke("slow", input_data)
+    assert registry.stats()["slow"]["in_flight"] == 1
+    while registry.stats()["slow"]["in_flight"]:
+        await asyncio.sleep(0.01)
+    (_, first_end), (second_start, _) = tool.spans
+    assert second_start >= first_end
+
+
+@pytest.mark.asyncio
+async def test_errors_raised_by_a_tool_are_reported_as_tool_failures():
+    class RaisingTool(tool_interfaces.AgentToolInterface):
+        name = "raising"
+
+        async def execute(self, input_data: str) -> str:
+            if input_data == "key":
+                raise KeyError(input_data)
+            raise asyncio.TimeoutError(input_data)
+
+    registry = tool_interfaces.ToolRegistry()
+    registry.register(RaisingTool())
+    manager = agent_manager.AgentManager(registry)
+    response = await manager.handle_mcp_batch(
+        _batch(("raising", "key"), ("raising", "timeout"))
+    )
+    for result in response.results:
+        assert result.error and "failed" in result.result
+    stats = manager.tool_stats()["raising"]
+    assert stats["errors"] == 2 and stats["timeouts"] == 0
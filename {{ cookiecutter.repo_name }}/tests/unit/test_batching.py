@@ -0,0 +1,78 @@
+# Micro-batching Tests
+import asyncio
+import importlib
+import os
+import sys
+import threading
+
+import pytest
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+batching = importlib.import_module("src.{{ cookiecutter.package_name }}.utils.batching")
+errors = importlib.import_module("src.{{ cookiecutter.package_name }}.core.errors")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_batches():
+    sizes = []
+
+    def square_all(xs):
+        sizes.append(len(xs))
+        return [x * x for x in xs]
+
+    batcher = batching.MicroBatcher(
+        square_all, max_batch_size=8, max_wait_ms=20
+    )
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(20)))
+    await batcher.stop()
+    assert results == [i * i for i in range(20)]
+    assert max(sizes) == 8 and len(sizes) == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_errors_reach_every_caller():
+    def fail(xs):
+        raise ValueError("bad batch")
+
+    batcher = batching.MicroBatcher(fail, max_wait_ms=5)
+    results = await asyncio.gather(
+        batcher.submit(1), batcher.submit(2), return_exceptions=True
+    )
+    await batcher.stop()
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_short_batch_result_fails_every_caller():
+    batcher = batching.MicroBatcher(lambda xs: xs[:-1], max_wait_ms=5)
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            batcher.submit(1), batcher.submit(2), return_exceptions=True
+        ),
+        timeout=1,
+    )
+    await batcher.stop()
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected():
+    release = threading.Event()
+
+    def slow(xs):
+        release.wait(1)
+        return xs
+
+    batcher = batching.MicroBatcher(
+        slow, max_batch_size=1, max_wait_ms=0, max_queue_size=2
+    )
+    first = asyncio.ensure_future(batcher.submit(0))
+    await asyncio.sleep(0.01)
+    queued = [asyncio.ensure_future(batcher.submit(i)) for i in (1, 2)]
+    await asyncio.sleep(0)
+    with pytest.raises(errors.OverloadedError):
+        await batcher.submit(3)
+    release.set()
+    assert await asyncio.gather(first, *queued) == [0, 1, 2]
+    await batcher.stop()
@@ -0,0 +1,75 @@
+# Data Ingestion Tests
+import csv
+import importlib
+import json
+import os
+import sys
+
+import pytest
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+data_ingestion = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.pipelines.data_ingestion"
+)
+preprocessing = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.pipelines.preprocessing"
+)
+training = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.pipelines.training"
+)
+
+
+@pytest.fixture
+def shards(tmp_path):
+    for shard in range(3):
+        with open(tmp_path / f"part-{shard}.jsonl", "w") as f:
+            for i in range(250):
+                f.write(
+                    json.dumps(
+                        {"text": f"Shard{shard} Row{i}", "label": i % 2}
+                    )
+                    + "\n"
+                )
+    with open(tmp_path / "extra.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["text", "label"])
+        writer.writeheader()
+        writer.writerows({"text": f"CSV {i}", "label": 1} for i in range(120))
+    return tmp_path
+
+
+def test_reads_all_shards_in_bounded_batches(shards):
+    batches = list(
+        data_ingestion.iter_batches(
+            str(shards), batch_size=100, readahead=2, max_workers=3
+        )
+    )
+    assert max(len(b) for b in batches) == 100
+    texts = {r["text"] for b in batches for r in b}
+    assert len(texts) == 3 * 250 + 120
+
+
+def test_glob_and_early_stop(shards):
+    stream = data_ingestion.iter_batches(
+        str(shards / "part-*.jsonl"), batch_size=10, readahead=1
+    )
+    first = next(stream)
+    stream.close()
+    assert len(first) == 10
+
+
+def test_stream_through_preprocessing_and_training(shards):
+    batches = data_ingestion.iter_batches(
+        str(shards / "extra.csv"), batch_size=50
+    )
+    model = training.train_batches(preprocessing.preprocess_batches(batches))
+    assert model["n_samples"] == 120
+    assert data_ingestion.ingest_data(str(shards / "extra.csv"))[0] == {
+        "text": "CSV 0",
+        "label": "1",
+    }
+
+
+def test_missing_source_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        list(data_ingestion.iter_batches(str(tmp_path / "nope.csv")))
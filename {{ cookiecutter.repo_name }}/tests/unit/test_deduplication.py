@@ -0,0 +1,80 @@
+# Deduplication Tests
+import importlib
+import os
+import sys
+
+import pytest
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+deduplication = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.pipelines.deduplication"
+)
+
+BASE = (
+    "Dear customer, your order number 1234 has shipped and will arrive within "
+    "three business days. Thank you for shopping with us and have a wonderful "
+    "week."
+)
+
+
+def _corpus():
+    return [
+        {"id": 0, "text": BASE},
+        {
+            "id": 1,
+            "text": "  " + BASE.upper() + "\n",
+        },  # exact after normalization
+        {
+            "id": 2,
+            "text": BASE.replace("1234", "98765"),
+        },  # templated near duplicate
+        {
+            "id": 3,
+            "text": "Quarterly revenue grew twelve percent on strong demand"
+            " for cloud services.",
+        },
+        {
+            "id": 4,
+            "text": BASE.replace(
+                "wonderful week", "wonderful week ahead of you"
+            ),
+        },
+    ]
+
+
+def test_exact_and_near_duplicates_dropped_across_batches():
+    dedup = deduplication.Deduplicator(threshold=0.7, shingle_size=4)
+    corpus = _corpus()
+    out = list(dedup.run([corpus[:2], corpus[2:]]))
+    assert [r["id"] for batch in out for r in batch] == [0, 3]
+    assert dedup.stats() == {
+        "seen": 5,
+        "kept": 2,
+        "dropped": 3,
+        "exact_duplicates": 1,
+        "near_duplicates": 2,
+    }
+
+
+@pytest.mark.parametrize("keep", ["last", "longest"])
+def test_keep_policy_replaces_representative(keep):
+    dedup = deduplication.Deduplicator(
+        threshold=0.7, shingle_size=4, keep=keep
+    )
+    out = [r["id"] for batch in dedup.run([_corpus()]) for r in batch]
+    assert out == [3, 4]
+
+
+def test_minhash_estimates_jaccard():
+    hasher = deduplication.MinHasher(num_perm=256, shingle_size=3)
+    a, b = (
+        "the quick brown fox jumps over the lazy dog",
+        "the quick brown fox leaps over the lazy cat",
+    )
+    sa, sb = deduplication.shingles(a, 3), deduplication.shingles(b, 3)
+    exact = len(sa & sb) / len(sa | sb)
+    estimate = (hasher.signature(a) == hasher.signature(b)).mean()
+    assert abs(estimate - exact) < 0.1
+    bands, rows = deduplication.optimal_bands(0.8, 128)
+    assert bands * rows <= 128
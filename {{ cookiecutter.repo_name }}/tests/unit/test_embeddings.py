@@ -0,0 +1,78 @@
+# Embeddings Tests
+import importlib
+import os
+import sys
+
+import numpy as np
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+embeddings = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.models.genai.embeddings"
+)
+llm_base = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.models.genai.llm_base"
+)
+
+
+class CountingModel(llm_base.LLMBase):
+    model_name = "counting"
+
+    def __init__(self):
+        self.batches = []
+
+    def embed_batch(self, texts):
+        self.batches.append(list(texts))
+        return np.array([[len(t), 1.0] for t in texts], dtype=np.float32)
+
+
+def test_embed_texts_batches_and_deduplicates():
+    model = CountingModel()
+    cache = embeddings.EmbeddingCache(maxsize=10)
+    out = embeddings.embed_texts(
+        ["a", "bb", "a", "ccc", " bb "], batch_size=2, model=model, cache=cache
+    )
+    assert out.dtype == np.float32 and out.shape == (5, 2)
+    assert out[:, 0].tolist() == [1, 2, 1, 3, 2]
+    assert model.batches == [["a", "bb"], ["ccc"]]
+
+
+def test_cache_hits_skip_the_model():
+    model = CountingModel()
+    cache = embeddings.EmbeddingCache(maxsize=10)
+    embeddings.embed_texts(["x", "y"], model=model, cache=cache)
+    embeddings.embed_texts(["y", "x"], model=model, cache=cache)
+    assert len(model.batches) == 1
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 2
+
+
+def test_lru_eviction_and_disk_tier(tmp_path):
+    model = CountingModel()
+    cache = embeddings.EmbeddingCache(maxsize=1, directory=str(tmp_path))
+    embeddings.embed_texts(["one", "two"], model=model, cache=cache)
+    assert len(cache) == 1
+    fresh = embeddings.EmbeddingCache(maxsize=1, directory=str(tmp_path))
+    embeddings.embed_texts(["one"], model=model, cache=fresh)
+    assert len(model.batches) == 1
+    assert fresh.stats()["disk_hits"] == 1
+
+
+def test_empty_input_keeps_the_model_width():
+    model = CountingModel()
+    assert embeddings.embed_texts([], model=model).shape == (0, 2)
+    assert embeddings.embed_texts([]).shape == (0, embeddings.EMBEDDING_DIM)
+
+
+def test_disk_tier_is_bounded(tmp_path):
+    model = CountingModel()
+    cache = embeddings.EmbeddingCache(
+        maxsize=1, directory=str(tmp_path), disk_maxsize=10
+    )
+    embeddings.embed_texts(
+        [f"text {i}" for i in range(25)], model=model, cache=cache
+    )
+    assert len(list(tmp_path.glob("*/*.npy"))) <= 10
+    reopened = embeddings.EmbeddingCache(
+        directory=str(tmp_path), disk_maxsize=10
+    )
+    assert reopened._disk_count == len(list(tmp_path.glob("*/*.npy")))
@@ -0,0 +1,116 @@
+# Evaluation Pipeline Tests
+import importlib
+import os
+import sys
+
+import pytest
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+evaluation = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.pipelines.evaluation"
+)
+training = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.pipelines.training"
+)
+
+
+class KeywordModel:
+    def __init__(self):
+        self.calls = 0
+
+    def predict_batch(self, texts):
+        self.calls += len(texts)
+        return ["pos" if "good" in t else "neg" for t in texts]
+
+
+def _records():
+    texts = ["good", "bad", "good day", "not good", "awful", "fine"]
+    labels = ["pos", "neg", "pos", "neg", "neg", "pos"]
+    return [
+        {"id": i, "text": t, "label": y}
+        for i, (t, y) in enumerate(zip(texts, labels))
+    ]
+
+
+def test_classification_metrics():
+    result = evaluation.Evaluator(KeywordModel()).evaluate(
+        [_records()[:4], _records()[4:]]
+    )
+    assert result["count"] == 6
+    assert result["accuracy"] == pytest.approx(4 / 6)
+    assert result["labels"] == ["pos", "neg"]
+    assert result["confusion_matrix"] == [[2, 1], [1, 2]]
+    assert result["per_class"]["pos"]["precision"] == pytest.approx(2 / 3)
+    assert result["macro_f1"] == pytest.approx(2 / 3)
+
+
+def test_stream_yields_running_summaries():
+    evaluator = evaluation.Evaluator(KeywordModel())
+    running = list(evaluator.stream([_records()[:4], _records()[4:]]))
+    assert running == [
+        {"count": 4, "accuracy": 0.75},
+        {"count": 6, "accuracy": pytest.approx(4 / 6)},
+    ]
+    assert evaluator.accumulator.result()["confusion_matrix"] == [
+        [2, 1],
+        [1, 2],
+    ]
+
+
+def test_trained_placeholder_still_evaluates():
+    model = training.train(_records())
+    assert evaluation.evaluate(model, _records()) == 0.95
+    assert evaluation.evaluate_batches(model, [_records()]) == 0.95
+    assert evaluation.evaluate(KeywordModel(), _records()) == pytest.approx(
+        4 / 6
+    )
+
+
+def test_accumulators_merge_like_a_single_pass():
+    whole, left, right = (
+        evaluation.ClassificationAccumulator() for _ in range(3)
+    )
+    y_true, y_pred = list("abcabcab"), list("abbaccab")
+    whole.update(y_true, y_pred)
+    left.update(y_true[4:], y_pred[4:])  # sees labels in a different order
+    right.update(y_true[:4], y_pred[:4])
+    merged = left.merge(right).result()
+    assert merged["per_class"] == whole.result()["per_class"]
+    assert merged["accuracy"] == whole.result()["accuracy"]
+
+    reg = evaluation.RegressionAccumulator()
+    reg.update([1.0, 2.0, 3.0], [1.5, 2.0, 2.0])
+    result = reg.result()
+    assert result["mae"] == pytest.approx(0.5)
+    assert result["rmse"] == pytest.approx((1.25 / 3) ** 0.5)
+
+
+def test_process_pool_matches_inline():
+    batches = [_records()[i : i + 2] for i in range(0, 6, 2)]
+    inline = evaluation.Evaluator(KeywordModel()).evaluate(batches)
+    sharded = evaluation.Evaluator(KeywordModel()).evaluate(batches, workers=2)
+    assert sharded == inline
+
+
+def test_incremental_reevaluation_only_scores_changed_records(tmp_path):
+    store = evaluation.PredictionStore(str(tmp_path / "preds.db"))
+    model = KeywordModel()
+    evaluation.Evaluator(model, store=store, model_version="v1").evaluate(
+        [_records()]
+    )
+    assert model.calls == 6
+
+    records = _records()
+    records[1]["text"] = "good now"
+    records.append({"id": 6, "text": "good", "label": "pos"})
+    evaluator = evaluation.Evaluator(model, store=store, model_version="v1")
+    result = evaluator.evaluate([records])
+    assert (evaluator.scored, evaluator.reused) == (2, 5)
+    assert model.calls == 8
+    assert result["count"] == 7
+
+    evaluation.Evaluator(model, store=store, model_version="v2").evaluate(
+        [records]
+    )
+    assert model.calls == 15
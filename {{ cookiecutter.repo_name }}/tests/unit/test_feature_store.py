@@ -0,0 +1,121 @@
+# Feature Store Tests
+import importlib
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+feature_store = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.infrastructure.storage.feature_store"
+)
+
+
+class FakeRedis:
+    """
+    Minimal stand-in for redis.Redis: set(px=...), mget, sadd, smembers and
+    non-transactional pipelines.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+
+    def set(self, key, value, px=None):
+        self.data[key] = (
+            value.encode(),
+            time.monotonic() + px / 1000 if px else None,
+        )
+
+    def mget(self, keys):
+        now = time.monotonic()
+        return [
+            v if v is not None and (exp is None or exp > now) else None
+            for v, exp in (self.data.get(k, (None, None)) for k in keys)
+        ]
+
+    def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(m.encode() for m in members)
+
+    def smembers(self, key):
+        return set(self.data.get(key, ()))
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append(
+            (name, args, kwargs)
+        )
+
+    def execute(self):
+        self.redis.round_trips += 1
+        return [
+            getattr(self.redis, name)(*args, **kwargs)
+            for name, args, kwargs in self.commands
+        ]
+
+
+def test_get_many_returns_aligned_columns():
+    store = feature_store.FeatureStore(initial_capacity=2)
+    store.put_many(
+        ["a", "b", "c"], {"age": [1, 2, 3], "score": [0.5, 0.6, 0.7]}
+    )
+    store.put("d", {"age": 4})
+    columns = store.get_many(
+        ["c", "missing", "d"], ["age", "score", "unknown"]
+    )
+    np.testing.assert_array_equal(columns["age"], [3, np.nan, 4])
+    np.testing.assert_array_equal(columns["score"], [0.7, np.nan, np.nan])
+    assert np.isnan(columns["unknown"]).all()
+    assert store.get("a") == {"age": 1.0, "score": 0.5}
+
+
+def test_put_many_with_a_bad_column_writes_nothing():
+    store = feature_store.FeatureStore()
+    store.put_many(["a"], {"age": [1]})
+    with pytest.raises(ValueError):
+        store.put_many(["a", "b"], {"age": [7, 8], "score": [0.5]})
+    assert store.get("a") == {"age": 1.0} and store.get("b") == {}
+    assert len(store) == 1
+
+
+def test_per_feature_ttl_expires_lazily():
+    store = feature_store.FeatureStore(ttls={"clicks": 60})
+    store.put_many(["a"], {"clicks": [5], "age": [30]}, now=1000)
+    fresh = store.get_many(["a"], ["clicks", "age"], now=1030)
+    stale = store.get_many(["a"], ["clicks", "age"], now=1100)
+    assert fresh["clicks"][0] == 5
+    assert np.isnan(stale["clicks"][0]) and stale["age"][0] == 30
+
+
+def test_snapshot_round_trip(tmp_path):
+    store = feature_store.FeatureStore()
+    keys = [f"user-{i}" for i in range(1000)]
+    store.put_many(keys, {"f1": np.arange(1000), "f2": np.arange(1000) * 2})
+    store.save_snapshot(tmp_path)
+    restored = feature_store.FeatureStore.load_snapshot(tmp_path)
+    assert len(restored) == 1000
+    np.testing.assert_array_equal(
+        restored.get_many(keys[-3:], ["f2"])["f2"], [1994, 1996, 1998]
+    )
+
+
+def test_redis_store_pipelines_batches():
+    redis = FakeRedis()
+    store = feature_store.RedisFeatureStore(redis, ttls={"clicks": 60})
+    store.put_many(["a", "b"], {"clicks": [1, 2], "age": [10, 20]})
+    columns = store.get_many(["b", "x", "a"], ["clicks", "age"])
+    np.testing.assert_array_equal(columns["age"], [20, np.nan, 10])
+    assert redis.round_trips == 2
+    assert store.get("a") == {"age": 10.0, "clicks": 1.0}
+    assert store.get("a", ["age"]) == {"age": 10.0}
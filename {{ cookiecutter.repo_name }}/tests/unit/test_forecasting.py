@@ -0,0 +1,63 @@
+# Forecasting Tests
+import importlib
+import os
+import sys
+
+import numpy as np
+import pytest
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+forecasting = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.models.ml.forecasting.model"
+)
+forecasting_service = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.services.forecasting_service"
+)
+
+
+def test_seasonal_naive_repeats_last_season():
+    series = np.array([[1, 2, 3, 4, 5, 6], [6, 5, 4, 3, 2, 1]], dtype=float)
+    forecast = forecasting.SeasonalNaive(season_length=3).fit_predict(
+        series, 5
+    )
+    np.testing.assert_array_equal(forecast, [[4, 5, 6, 4, 5], [3, 2, 1, 3, 2]])
+
+
+def test_exponential_smoothing_matches_per_series_loop():
+    rng = np.random.default_rng(0)
+    series = rng.normal(10, 2, (4, 50))
+    model = forecasting.ExponentialSmoothing().fit(series)
+    for row, alpha, level in zip(series, model.alphas, model.level):
+        expected = row[0]
+        for value in row[1:]:
+            expected += alpha * (value - expected)
+        assert level == pytest.approx(expected)
+    assert model.predict(3).shape == (4, 3)
+
+
+def test_autoregressive_recovers_coefficients_for_every_series():
+    rng = np.random.default_rng(1)
+    n, length = 200, 2000
+    phi = rng.uniform(-0.8, 0.8, n)
+    series = np.zeros((n, length))
+    for t in range(1, length):
+        series[:, t] = 2.0 + phi * series[:, t - 1] + rng.normal(0, 1.0, n)
+    model = forecasting.AutoRegressive(order=1).fit(series)
+    np.testing.assert_allclose(model.coef[:, 1], phi, atol=0.1)
+    forecast = model.predict(2)
+    np.testing.assert_allclose(
+        forecast[:, 0], model.coef[:, 0] + model.coef[:, 1] * series[:, -1]
+    )
+
+
+def test_service_groups_ragged_series():
+    forecasts = forecasting_service.forecast_series(
+        [[1, 2, 3], [5, 5], [7, 8, 9]],
+        horizon=2,
+        method="seasonal_naive",
+        season_length=1,
+    )
+    assert forecasts == [[3, 3], [5, 5], [9, 9]]
+    with pytest.raises(ValueError):
+        forecasting.make_model("prophet")
@@ -0,0 +1,86 @@
+# GenAI Streaming Tests
+import asyncio
+import importlib
+import json
+import os
+import sys
+
+import pytest
+from fastapi import FastAPI
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+text_generation = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.models.genai.text_generation"
+)
+genai_router = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.api.routers.genai_router"
+)
+
+
+class EndlessProvider:
+    def __init__(self):
+        self.closed = asyncio.Event()
+        self.sent = 0
+
+    async def astream(self, prompt):
+        try:
+            while True:
+                self.sent += 1
+                yield f" t{self.sent}"
+                await asyncio.sleep(0.005)
+        finally:
+            self.closed.set()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "accept", ["text/event-stream", "application/x-ndjson"]
+)
+async def test_client_disconnect_closes_the_provider_stream(
+    monkeypatch, accept
+):
+    provider = EndlessProvider()
+    monkeypatch.setattr(text_generation, "get_provider", lambda: provider)
+    app = FastAPI()
+    app.include_router(genai_router.router)
+    body = json.dumps({"prompt": "hi"}).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/genai/generate",
+        "raw_path": b"/genai/generate",
+        "query_string": b"",
+        "root_path": "",
+        "client": ("127.0.0.1", 1234),
+        "server": ("test", 80),
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"accept", accept.encode()),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    }
+    requests = [{"type": "http.request", "body": body, "more_body": False}]
+    hang_up = asyncio.Event()
+    chunks = []
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await hang_up.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            chunks.append(message["body"])
+            if len(chunks) == 3:
+                hang_up.set()
+
+    await asyncio.wait_for(app(scope, receive, send), timeout=5)
+    await asyncio.wait_for(provider.closed.wait(), timeout=1)
+    sent = provider.sent
+    await asyncio.sleep(0.05)
+    assert provider.sent == sent < 20
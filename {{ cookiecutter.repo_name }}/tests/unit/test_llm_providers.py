@@ -0,0 +1,159 @@
+# LLM Provider Tests
+import asyncio
+import importlib
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+import pytest
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+azure_openai = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.infrastructure.llm_providers.azure_openai"
+)
+
+LATENCY = 0.05
+
+
+class StubLLMServer:
+    """
+    Local Azure-OpenAI-shaped server that sleeps LATENCY per call and records
+    peak concurrency.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+        app = Starlette(
+            routes=[
+                Route(
+                    "/openai/deployments/{name}/chat/completions",
+                    self.chat,
+                    methods=["POST"],
+                ),
+                Route(
+                    "/openai/deployments/{name}/embeddings",
+                    self.embeddings,
+                    methods=["POST"],
+                ),
+            ]
+        )
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{self.sock.getsockname()[1]}"
+        self.server = uvicorn.Server(uvicorn.Config(app, log_level="warning"))
+        self.thread = threading.Thread(
+            target=self.server.run,
+            kwargs={"sockets": [self.sock]},
+            daemon=True,
+        )
+
+    async def chat(self, request):
+        body = await request.json()
+        if body.get("stream"):
+            return StreamingResponse(
+                self._stream(body["messages"][-1]["content"]),
+                media_type="text/event-stream",
+            )
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(LATENCY)
+        self.in_flight -= 1
+        content = body["messages"][-1]["content"]
+        return JSONResponse(
+            {"choices": [{"message": {"content": f"echo {content}"}}]}
+        )
+
+    async def _stream(self, content):
+        for token in ["echo", " ", content]:
+            await asyncio.sleep(LATENCY / 10)
+            chunk = {"choices": [{"delta": {"content": token}}]}
+            yield f"data: {json.dumps(chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    async def embeddings(self, request):
+        body = await request.json()
+        data = [
+            {"index": i, "embedding": [float(len(t))]}
+            for i, t in enumerate(body["input"])
+        ]
+        return JSONResponse({"data": list(reversed(data))})
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    with StubLLMServer() as server:
+        yield server
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_respect_semaphore(stub_server):
+    stub_server.peak = 0
+    provider = azure_openai.AzureOpenAIProvider(
+        endpoint=stub_server.url, api_key="k", max_concurrency=20
+    )
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(provider.agenerate(f"p{i}") for i in range(200))
+    )
+    elapsed = time.perf_counter() - start
+    await provider.aclose()
+    assert results[7] == "echo p7"
+    assert stub_server.peak <= 20
+    # 200 calls / 20 slots * 50ms ~= 0.5s; a blocking client would take 10s.
+    assert elapsed < 3
+
+
+@pytest.mark.asyncio
+async def test_aembed_preserves_input_order(stub_server):
+    provider = azure_openai.AzureOpenAIProvider(
+        endpoint=stub_server.url, api_key="k"
+    )
+    assert await provider.aembed(["a", "bbb"]) == [[1.0], [3.0]]
+    await provider.aclose()
+
+
+@pytest.mark.asyncio
+async def test_astream_yields_tokens(stub_server):
+    provider = azure_openai.AzureOpenAIProvider(
+        endpoint=stub_server.url, api_key="k"
+    )
+    tokens = [token async for token in provider.astream("hi")]
+    await provider.aclose()
+    assert tokens == ["echo", " ", "hi"]
+    assert provider.in_flight == 0
+
+
+def test_sync_adapter(stub_server):
+    provider = azure_openai.AzureOpenAIProvider(
+        endpoint=stub_server.url, api_key="k"
+    )
+    assert provider.generate("hi") == "echo hi"
+    assert provider.chat([{"role": "user", "content": "yo"}]) == "echo yo"
+
+
+def test_offline_provider_echoes():
+    assert (
+        azure_openai.AzureOpenAIProvider(endpoint="").generate("hi")
+        == "AzureOpenAI: hi"
+    )
@@ -0,0 +1,27 @@
+# Memory Tests
+import importlib
+import os
+import subprocess
+import sys
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+memory = importlib.import_module("src.{{ cookiecutter.package_name }}.utils.memory")
+
+
+def test_reports_the_requested_process_not_this_one():
+    big = b"x" * (200 * 1024 * 1024)
+    child = subprocess.Popen(
+        [sys.executable, "-c", "import time; time.sleep(10)"]
+    )
+    try:
+        mine, theirs = memory.process_memory(), memory.process_memory(
+            child.pid
+        )
+        assert theirs["pid"] == child.pid
+        if "rss_bytes" in theirs:
+            assert theirs["rss_bytes"] < mine.get("rss_bytes", len(big))
+    finally:
+        child.kill()
+        child.wait()
+    del big
@@ -0,0 +1,90 @@
+# Message Queue Tests
+import asyncio
+import importlib
+import os
+import sys
+
+import pytest
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+queue_module = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.infrastructure.messaging.queue"
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return queue_module.InMemoryQueueBackend()
+    return queue_module.SQLiteQueueBackend(str(tmp_path / "queue.db"))
+
+
+@pytest.mark.asyncio
+async def test_batched_send_and_concurrent_consume(backend):
+    queue = queue_module.MessageQueue("jobs", backend)
+    await queue.send_batch([f"job-{i}" for i in range(50)])
+    seen, active, peak = [], 0, 0
+
+    async def handler(message):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.001)
+        seen.append(message.body)
+        active -= 1
+
+    await queue.consume(
+        handler, prefetch=8, concurrency=4, drain=True, poll_interval=0.01
+    )
+    assert sorted(seen) == sorted(f"job-{i}" for i in range(50))
+    assert peak <= 4
+    stats = queue.stats()
+    assert (
+        stats["acked"] == 50
+        and stats["ready"] == 0
+        and stats["in_flight"] == 0
+    )
+
+
+@pytest.mark.asyncio
+async def test_failures_retry_then_dead_letter(backend):
+    queue = queue_module.MessageQueue(
+        "jobs", backend, max_attempts=3, retry_delay=0.001
+    )
+    await queue.send("poison")
+    await queue.send("ok")
+    attempts = []
+
+    def handler(message):
+        attempts.append(message.body)
+        if message.body == "poison":
+            raise ValueError("cannot process")
+
+    await queue.consume(handler, drain=True, poll_interval=0.005)
+    assert attempts.count("poison") == 3 and attempts.count("ok") == 1
+    assert [m.body for m in queue.dead_letters()] == ["poison"]
+    assert queue.stats()["dead_lettered"] == 1
+
+
+def test_expired_leases_count_as_attempts(backend):
+    backend.publish("jobs", ["crasher"])
+    for attempt in range(2):
+        (message,) = backend.reserve("jobs", 10, 0.0, max_attempts=2)
+        assert message.attempts == attempt
+    assert backend.reserve("jobs", 10, 0.0, max_attempts=2) == []
+    assert [m.attempts for m in backend.dead_letters("jobs")] == [2]
+    assert backend.stats("jobs")["dead"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_is_durable(tmp_path):
+    path = str(tmp_path / "queue.db")
+    await queue_module.MessageQueue(
+        "jobs", queue_module.SQLiteQueueBackend(path)
+    ).send_batch(["a", "b"])
+    reopened = queue_module.MessageQueue(
+        "jobs", queue_module.SQLiteQueueBackend(path)
+    )
+    assert reopened.stats()["ready"] == 2
+    assert reopened.stats()["lag_seconds"] >= 0
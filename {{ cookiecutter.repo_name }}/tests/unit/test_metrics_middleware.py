@@ -0,0 +1,113 @@
+# Metrics Middleware Tests
+import importlib
+import logging
+import os
+import sys
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+middleware = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.api.middleware"
+)
+
+
+def _app(registry, **kwargs):
+    app = FastAPI()
+    app.add_middleware(
+        middleware.MetricsMiddleware, registry=registry, **kwargs
+    )
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int):
+        return {"id": item_id}
+
+    @app.post("/echo")
+    async def echo(body: dict):
+        return body
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(
+            (f"chunk {i}\n" for i in range(3)), media_type="text/plain"
+        )
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_records_histograms_status_and_bytes_per_route_template():
+    registry = middleware.HTTPMetrics()
+    transport = httpx.ASGITransport(app=_app(registry))
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test"
+    ) as client:
+        for i in range(3):
+            await client.get(f"/items/{i}")
+        await client.get("/items/not-a-number")
+        await client.post("/echo", json={"a": 1})
+        response = await client.get("/stream")
+        assert response.text == "chunk 0\nchunk 1\nchunk 2\n"
+        await client.get("/missing")
+
+    text = registry.render()
+    assert (
+        'http_requests_total{method="GET",route="/items/{item_id}",'
+        'status="200"} 3' in text
+    )
+    assert (
+        'http_requests_total{method="GET",route="/items/{item_id}",'
+        'status="422"} 1' in text
+    )
+    assert (
+        'http_requests_total{method="GET",route="<unmatched>",status="404"} 1'
+        in text
+    )
+    assert (
+        "http_request_duration_seconds_bucket"
+        '{method="GET",route="/items/{item_id}",le="+Inf"} 4' in text
+    )
+    assert (
+        'http_request_duration_seconds_count{method="POST",route="/echo"} 1'
+        in text
+    )
+    assert (
+        'http_request_size_bytes_total{method="POST",route="/echo"} 8' in text
+    )
+    assert (
+        'http_response_size_bytes_total{method="GET",route="/stream"} 24'
+        in text
+    )
+    assert "http_requests_in_progress 0" in text
+
+
+@pytest.mark.asyncio
+async def test_only_slow_requests_are_logged(caplog):
+    registry = middleware.HTTPMetrics()
+    transport = httpx.ASGITransport(
+        app=_app(registry, slow_request_ms=0, sample_rate=1.0)
+    )
+    with caplog.at_level(logging.WARNING):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            await client.get("/items/1")
+    assert any(
+        "slow request: GET /items/1 -> 200" in r.message
+        for r in caplog.records
+    )
+
+    caplog.clear()
+    transport = httpx.ASGITransport(
+        app=_app(registry, slow_request_ms=60_000, sample_rate=1.0)
+    )
+    with caplog.at_level(logging.WARNING):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            await client.get("/items/1")
+    assert not caplog.records
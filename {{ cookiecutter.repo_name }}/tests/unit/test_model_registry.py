@@ -0,0 +1,188 @@
+# Model Registry Tests
+import importlib
+import json
+import multiprocessing
+import os
+import pickle
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+registry_module = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.models.ml.registry"
+)
+
+
+class ConstantModel:
+    # Stands in for a real model so these tests run without any ML task.
+    def predict(self, x):
+        return 1
+
+    def predict_batch(self, xs):
+        return [1] * len(xs)
+
+
+class WarmupRecorder:
+    def __init__(self, name):
+        self.name = name
+        self.warmed = []
+
+    def predict_batch(self, xs):
+        self.warmed.append(len(xs))
+        return [self.name] * len(xs)
+
+
+@pytest.fixture
+def registry_root(tmp_path):
+    for version in ("v2", "v10", "v9"):
+        (tmp_path / version).mkdir()
+        (tmp_path / version / "model.pkl").write_bytes(
+            pickle.dumps(ConstantModel())
+        )
+        (tmp_path / version / "metrics.json").write_text(
+            json.dumps({"version": version})
+        )
+    return tmp_path
+
+
+def test_resolves_latest_version_and_loads_lazily(registry_root):
+    loads = []
+
+    def loader(path):
+        loads.append(path.name)
+        return registry_module.load_artifact(path)
+
+    registry = registry_module.ModelRegistry(str(registry_root), loader=loader)
+    assert registry.versions() == ["v2", "v9", "v10"]
+    assert loads == []
+    assert registry.get().predict_batch(["x"]) == [1]
+    assert registry.version == "v10" and registry.metrics == {"version": "v10"}
+    registry.get()
+    assert loads == ["v10"]
+
+
+def test_promote_warms_up_and_swaps_atomically(registry_root):
+    registry = registry_module.ModelRegistry(
+        str(registry_root),
+        loader=lambda path: WarmupRecorder(path.name),
+        warmup_inputs=["w"] * 4,
+    )
+    assert registry.get().predict_batch(["x"]) == ["v10"]
+
+    errors, stop = [], threading.Event()
+
+    def hammer():
+        while not stop.is_set():
+            try:
+                assert registry.get().predict_batch(["x"])[0] in ("v10", "v2")
+            except Exception as exc:
+                errors.append(exc)
+
+    worker = threading.Thread(target=hammer)
+    worker.start()
+    registry.promote("v2")
+    stop.set()
+    worker.join()
+
+    assert errors == []
+    assert registry.version == "v2"
+    assert registry.get().warmed[0] == 4
+    assert (registry_root / "CURRENT").read_text() == "v2"
+    assert (
+        registry_module.ModelRegistry(str(registry_root)).resolve_version()
+        == "v2"
+    )
+
+
+def test_npy_artifacts_are_memory_mapped(tmp_path):
+    (tmp_path / "v1").mkdir()
+    np.save(tmp_path / "v1" / "model.npy", np.arange(6, dtype=np.float32))
+    weights = registry_module.ModelRegistry(str(tmp_path)).get()
+    assert isinstance(weights, np.memmap)
+
+
+def test_falls_back_to_default_factory(tmp_path):
+    registry = registry_module.ModelRegistry(
+        str(tmp_path / "missing"), default_factory=ConstantModel
+    )
+    assert registry.version is None
+    assert registry.get().predict("x") == 1
+    with pytest.raises(FileNotFoundError):
+        registry.promote("v1")
+
+
+def test_promote_rejects_paths_outside_the_root(
+    registry_root, tmp_path_factory
+):
+    outside = tmp_path_factory.mktemp("evil")
+    (outside / "model.pkl").write_bytes(pickle.dumps(ConstantModel()))
+    registry = registry_module.ModelRegistry(str(registry_root))
+    for version in (
+        str(outside),
+        f"../{outside.name}",
+        "..",
+        "v2/../v9",
+        "v1",
+    ):
+        with pytest.raises(FileNotFoundError):
+            registry.promote(version)
+    assert not (registry_root / "CURRENT").exists()
+
+
+def _refresh_in_worker(registry, promoted, results):
+    promoted.wait(5)
+    results.put((registry.maybe_refresh(), registry.version))
+
+
+def _promote_in_worker(registry, promoted, results):
+    registry.promote("v2")
+    promoted.set()
+    results.put((False, registry.version))
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="pre-forked workers need fork()"
+)
+def test_promotion_reaches_every_forked_worker(registry_root):
+    ctx = multiprocessing.get_context("fork")
+    registry = registry_module.ModelRegistry(
+        str(registry_root),
+        loader=lambda path: WarmupRecorder(path.name),
+        refresh_interval=0,
+    )
+    # Preloaded in the parent, as serving.preload does before forking.
+    assert registry.version == "v10"
+    assert not registry.maybe_refresh()
+    promoted, results = ctx.Event(), ctx.Queue()
+    workers = [
+        ctx.Process(target=target, args=(registry, promoted, results))
+        for target in (_refresh_in_worker, _promote_in_worker)
+    ]
+    for worker in workers:
+        worker.start()
+    reports = sorted(results.get(timeout=10) for _ in workers)
+    for worker in workers:
+        worker.join(5)
+    assert reports == [(False, "v2"), (True, "v2")]
+
+
+def test_maybe_refresh_is_throttled_and_keeps_the_model_on_a_bad_version(
+    registry_root,
+):
+    registry = registry_module.ModelRegistry(
+        str(registry_root), refresh_interval=60
+    )
+    assert registry.version == "v10"
+    assert not registry.maybe_refresh()
+    (registry_root / "CURRENT").write_text("v9")
+    assert not registry.maybe_refresh() and registry.version == "v10"
+    registry._next_check = 0.0
+    assert registry.maybe_refresh() and registry.version == "v9"
+    os.replace(registry_root / "v2", registry_root / "gone")
+    (registry_root / "CURRENT").write_text("v2")
+    registry._next_check = 0.0
+    assert not registry.maybe_refresh() and registry.version == "v9"
@@ -0,0 +1,83 @@
+# Preprocessing Pipeline Tests
+import importlib
+import json
+import os
+import sys
+
+import pytest
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+preprocessing = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.pipelines.preprocessing"
+)
+
+
+def _records(n):
+    return [{"id": i, "text": f"  Record   NUMBER {i}  "} for i in range(n)]
+
+
+def test_preprocess_normalizes_text():
+    assert preprocessing.preprocess([{"text": " Hello\n  WORLD "}]) == [
+        {"text": "hello world"}
+    ]
+
+
+def test_preprocess_handles_one_huge_text_and_leaves_input_alone():
+    records = [{"text": "Short"}] * 9_999 + [{"text": "Word\x00 " * 40_000}]
+    out = preprocessing.preprocess(records)
+    assert out[0] == {"text": "short"} and records[0] == {"text": "Short"}
+    assert out[-1]["text"].endswith("word\x00")
+
+
+def test_process_pool_preserves_order_and_reports_timings():
+    pipeline = preprocessing.default_pipeline()
+    pipeline.add("tokenize", preprocessing.tokenize())
+    out = pipeline.run_records(_records(500), chunk_size=37, workers=2)
+    assert [r["id"] for r in out] == list(range(500))
+    assert out[3]["text"] == "record number 3"
+    assert out[3]["tokens"] == ["record", "number", "3"]
+    report = pipeline.report()
+    assert {row["step"] for row in report} == {
+        "normalize_whitespace",
+        "lowercase",
+        "tokenize",
+    }
+    assert all(
+        row["records_in"] == 500 and row["batches"] == 14 for row in report
+    )
+    assert sum(row["share"] for row in report) == pytest.approx(1.0)
+
+
+def test_chunk_step_splits_with_overlap():
+    pipeline = preprocessing.PreprocessingPipeline(
+        [("chunk", preprocessing.chunk_text(size=3, overlap=1))]
+    )
+    out = pipeline.process_batch([{"text": "a b c d e"}])
+    assert [(r["chunk_id"], r["text"]) for r in out] == [
+        (0, "a b c"),
+        (1, "c d e"),
+    ]
+    with pytest.raises(ValueError):
+        pipeline.add("chunk", preprocessing.lowercase())
+
+
+def test_batch_job_cli(tmp_path):
+    source = tmp_path / "raw.jsonl"
+    source.write_text("".join(json.dumps(r) + "\n" for r in _records(10)))
+    output = tmp_path / "out" / "records.jsonl"
+    preprocessing.main(
+        [
+            str(source),
+            "--output",
+            str(output),
+            "--workers",
+            "1",
+            "--batch-size",
+            "4",
+        ]
+    )
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [r["text"] for r in lines] == [
+        f"record number {i}" for i in range(10)
+    ]
@@ -0,0 +1,92 @@
+# Prompt Template Tests
+import importlib
+import os
+import sys
+
+import pytest
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+templates = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.prompts.templates"
+)
+formatters = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.prompts.formatters"
+)
+evaluators = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.prompts.evaluators"
+)
+tokens = importlib.import_module("src.{{ cookiecutter.package_name }}.prompts.tokens")
+
+
+def test_compiled_template_matches_str_format():
+    source = "Q: {question!r}\nScore: {score:.2f} ({score}) - {question}"
+    compiled = templates.CompiledTemplate(source)
+    assert compiled.variables == {"question", "score"}
+    values = {"question": "why?", "score": 0.5}
+    assert compiled.render(**values) == source.format(**values)
+    with pytest.raises(KeyError):
+        compiled.render(question="why?")
+
+
+def test_invalid_templates_fail_at_compile_time():
+    for bad in ["{}", "{user.name}", "{items[0]}", "unbalanced {text"]:
+        with pytest.raises(ValueError):
+            templates.CompiledTemplate(bad)
+    registry = templates.PromptRegistry()
+    with pytest.raises(ValueError):
+        registry.register("qa", "Context: {contxt}", variables=["context"])
+
+
+def test_registry_and_formatters_reuse_compiled_templates():
+    assert (
+        templates.get_prompt_template()
+        == "Please summarize the following text: {text}"
+    )
+    assert (
+        templates.registry.render("summarize", text="abc")
+        == "Please summarize the following text: abc"
+    )
+    assert formatters.format_prompt("Hi {name}", name="Ada") == "Hi Ada"
+    assert templates.compile_template(
+        "Hi {name}"
+    ) is templates.compile_template("Hi {name}")
+    assert evaluators.evaluate_prompt(templates.get_prompt_template())
+    assert not evaluators.evaluate_prompt("no variables")
+    assert not evaluators.evaluate_prompt("broken {text")
+
+
+def test_token_counter_caches_and_fits_budget():
+    counter = tokens.TokenCounter(count_fn=lambda text: len(text.split()))
+    fragments = ["one two three", "four five six seven eight", "nine"]
+    assert counter.fit(fragments, budget=5, separator="") == [
+        "one two three",
+        "nine",
+    ]
+    counter.fit(fragments, budget=5, separator="")
+    assert counter.stats()["misses"] == 3 and counter.stats()["hits"] == 3
+
+    template = templates.registry.get("rag_answer")
+    n = counter.count_template(template, context="a b c", question="why")
+    assert n == len(template.render(context="a b c", question="why").split())
+    assert tokens.approximate_token_count("Hi, all!") == 4
+    assert tokens.approximate_token_count("tokenization") == 3
+
+
+def test_token_counter_counts_formatted_fields_and_bounds_its_cache():
+    counter = tokens.TokenCounter(
+        count_fn=lambda text: len(text.split()), max_chars=20
+    )
+    template = templates.compile_template(
+        "{name} vs {name} : {score:,d} points"
+    )
+    values = {"name": "alpha beta", "score": 1234567}
+    rendered = template.render(**values)
+    assert (
+        counter.count_template(template, **values)
+        == len(rendered.split())
+        == 8
+    )
+    assert counter.stats()["chars"] <= 20
+    counter.count("x" * 50)
+    assert counter.stats()["chars"] <= 20
@@ -0,0 +1,174 @@
+# RAG Service Tests
+import asyncio
+import importlib
+import os
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+rag_service = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.services.rag_service"
+)
+lexical_index = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.infrastructure.storage.lexical_index"
+)
+tokens = importlib.import_module("src.{{ cookiecutter.package_name }}.prompts.tokens")
+
+DOCS = {
+    "billing": (
+        "Invoices are issued monthly and billing disputes go to the finance"
+        " team."
+    ),
+    "shipping": (
+        "Orders ship within three business days; tracking numbers arrive by"
+        " email."
+    ),
+    "returns": (
+        "Returns are accepted within thirty days with the original receipt."
+    ),
+    "security": (
+        "Reset your password from the account page; two factor"
+        " authentication is recommended."
+    ),
+}
+TOPICS = [
+    "invoice billing finance",
+    "ship orders tracking",
+    "returns receipt",
+    "password security account",
+]
+
+
+def topic_embed(texts):
+    # One dimension per topic: count of topic words in the text.
+    return (
+        np.array(
+            [
+                [
+                    sum(word in text.lower() for word in topic.split())
+                    for topic in TOPICS
+                ]
+                for text in texts
+            ],
+            dtype=np.float32,
+        )
+        + 1e-3
+    )
+
+
+@pytest.fixture
+def pipeline():
+    p = rag_service.RAGPipeline(
+        embed=topic_embed,
+        dim=len(TOPICS),
+        top_k=2,
+        candidates=4,
+        counter=tokens.TokenCounter(count_fn=lambda t: len(t.split())),
+    )
+    p.add_documents(list(DOCS), list(DOCS.values()))
+    return p
+
+
+def test_pipelines_share_one_search_pool(pipeline):
+    before = threading.active_count()
+    for _ in range(20):
+        other = rag_service.RAGPipeline(embed=topic_embed, dim=len(TOPICS))
+        other.add_documents(list(DOCS), list(DOCS.values()))
+        other.retrieve("cats")
+    assert threading.active_count() <= before + 4
+
+
+def test_bm25_ranks_and_compresses_postings():
+    index = lexical_index.BM25Index()
+    index.add_documents(
+        ["a", "b"], ["the cat sat", "the dog sat on the dog mat"]
+    )
+    index.add_documents(["c"], ["a cat and a dog"])
+    assert [id_ for id_, _ in index.search("dog", k=5)] == ["b", "c"]
+    assert index.search("cat mat", k=1)[0][0] == "b"
+    assert index.search("unicorn") == []
+    assert index._postings["dog"].docs().tolist() == [1, 2]
+    index._postings["dog"].compact()
+    assert index._postings["dog"].docs().tolist() == [1, 2]
+    assert index._postings["dog"].gaps.dtype == np.uint8
+
+
+def test_bm25_one_document_at_a_time_matches_bulk_add():
+    texts = [
+        f"common term doc{i} " + ("rare " if i % 97 == 0 else "")
+        for i in range(2000)
+    ]
+    bulk, incremental = lexical_index.BM25Index(), lexical_index.BM25Index()
+    bulk.add_documents([str(i) for i in range(len(texts))], texts)
+    for i, text in enumerate(texts):
+        incremental.add_documents([str(i)], [text])
+    postings = incremental._postings["common"]
+    # Packed geometrically: most postings are compacted, and the buffer stays
+    # shorter than the packed part.
+    assert len(postings.gaps) >= 1000
+    assert len(postings._state[3]) < len(postings.gaps)
+    assert postings.docs().tolist() == list(range(2000))
+    for query in ("rare common", "doc5 term", "rare"):
+        assert incremental.search(query, k=10) == bulk.search(query, k=10)
+
+
+def test_reciprocal_rank_fusion_weights():
+    fused = rag_service.reciprocal_rank_fusion(
+        {"vector": ["x", "y"], "lexical": ["y", "z"]}, k=60
+    )
+    assert [id_ for id_, _, _ in fused] == ["y", "x", "z"]
+    assert fused[0][2] == {"vector": 2, "lexical": 1}
+    fused = rag_service.reciprocal_rank_fusion(
+        {"vector": ["x", "y"], "lexical": ["y", "z"]},
+        weights={"lexical": 0.0},
+        k=60,
+    )
+    assert [id_ for id_, _, _ in fused] == ["x", "y", "z"]
+
+
+def test_retrieve_fuses_both_retrievers_and_reports_timings(pipeline):
+    chunks, timings = pipeline.retrieve("how do I track my shipping orders?")
+    assert chunks[0].id == "shipping"
+    assert set(chunks[0].ranks) == {"vector", "lexical"}
+    assert {
+        "embed_query",
+        "vector_search",
+        "lexical_search",
+        "fusion",
+        "retrieve",
+    } <= set(timings)
+
+
+def test_context_packing_respects_token_budget(pipeline):
+    pipeline.token_budget = 45
+    result = pipeline.run("password reset and security")
+    assert DOCS["security"] in result.prompt
+    assert pipeline.counter.count(result.prompt) <= 45
+    assert result.answer.startswith("Generated text for:")
+    assert {"pack_context", "generate", "total"} <= set(result.timings)
+
+
+def test_async_run(pipeline):
+    result = asyncio.run(pipeline.arun("returns with receipt"))
+    assert result.chunks[0].id == "returns"
+    assert result.timings["total"] >= result.timings["generate"]
+
+
+def test_concurrent_async_runs_exceed_pool_size(pipeline):
+    async def run_all():
+        queries = ["returns with receipt"] * (
+            rag_service._executor._max_workers * 4
+        )
+        return await asyncio.wait_for(
+            asyncio.gather(*(pipeline.arun(q) for q in queries)), timeout=10
+        )
+
+    results = asyncio.run(run_all())
+    assert (
+        len({tuple(chunk.id for chunk in result.chunks) for result in results})
+        == 1
+    )
@@ -0,0 +1,116 @@
+# Regression Tests
+import importlib
+import os
+import sys
+
+import numpy as np
+import pytest
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+regression = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.models.ml.regression.model"
+)
+regression_train = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.models.ml.regression.train"
+)
+registry = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.models.ml.registry"
+)
+
+FEATURES = ["x1", "x2", "x3"]
+TRUE_COEF = np.array([1.5, -2.0, 0.5])
+
+
+def _batches(n_batches=10, size=500, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(n_batches):
+        X = rng.normal(size=(size, 3))
+        y = 1000.0 + X @ TRUE_COEF + rng.normal(0, 0.01, size)
+        yield [
+            dict(zip(FEATURES, row), y=target)
+            for row, target in zip(X.tolist(), y.tolist())
+        ]
+
+
+def test_normal_equation_matches_in_memory_least_squares():
+    model = regression_train.train_regression(_batches(), FEATURES, "y")
+    records = [r for batch in _batches() for r in batch]
+    X = regression.records_to_matrix(records, FEATURES)
+    y = regression.records_to_matrix(records, ["y"])[:, 0]
+    expected = np.linalg.lstsq(
+        np.column_stack([X, np.ones(len(y))]), y, rcond=None
+    )[0]
+    np.testing.assert_allclose(model.coef, expected[:3], atol=1e-8)
+    assert model.intercept == pytest.approx(expected[3])
+    assert model.n_samples == 5000
+
+
+def test_normal_equation_is_stable_with_large_feature_offsets():
+    rng = np.random.default_rng(0)
+    model = regression.NormalEquationRegressor()
+    batches = []
+    for _ in range(20):
+        X = 1e6 + rng.normal(size=(500, 3))
+        y = 1000.0 + (X - 1e6) @ TRUE_COEF + rng.normal(0, 0.01, 500)
+        batches.append((X, y))
+        model.partial_fit(X, y)
+    model.finalize()
+    X, y = np.concatenate([b[0] for b in batches]), np.concatenate(
+        [b[1] for b in batches]
+    )
+    expected = np.linalg.lstsq(X - X.mean(axis=0), y - y.mean(), rcond=None)[0]
+    np.testing.assert_allclose(model.coef, expected, atol=1e-6)
+    np.testing.assert_allclose(
+        model.predict_batch(X[:5]),
+        X[:5] @ expected + y.mean() - X.mean(axis=0) @ expected,
+    )
+
+
+def test_ridge_shrinks_coefficients():
+    plain = regression_train.train_regression(_batches(), FEATURES, "y")
+    ridge = regression_train.train_regression(
+        _batches(), FEATURES, "y", alpha=5000.0
+    )
+    assert np.linalg.norm(ridge.coef) < np.linalg.norm(plain.coef)
+
+
+def test_sgd_converges_over_epochs():
+    model = regression_train.train_regression(
+        lambda: _batches(size=50),
+        FEATURES,
+        "y",
+        method="sgd",
+        epochs=40,
+        learning_rate=0.1,
+    )
+    np.testing.assert_allclose(model.coef, TRUE_COEF, atol=0.05)
+    with pytest.raises(ValueError):
+        regression_train.train_regression(
+            _batches(), FEATURES, "y", method="sgd", epochs=2
+        )
+
+
+def test_npz_round_trip_through_registry(tmp_path):
+    model = regression_train.train_regression(
+        _batches(), FEATURES, "y", alpha=1.0
+    )
+    (tmp_path / "v1").mkdir()
+    model.save(tmp_path / "v1" / "model.npz")
+    reg = registry.ModelRegistry(
+        str(tmp_path),
+        loader=regression.LinearRegressor.load,
+        warmup_inputs=[{"x1": 0.0, "x2": 0.0, "x3": 0.0}],
+    )
+    loaded = reg.get()
+    assert isinstance(loaded, regression.NormalEquationRegressor)
+    rows = [
+        {"x1": 1.0, "x2": 0.0, "x3": 2.0},
+        {"x1": 0.0, "x2": 1.0, "x3": 0.0},
+    ]
+    np.testing.assert_allclose(
+        loaded.predict_batch(rows), model.predict_batch(rows)
+    )
+    assert loaded.predict([1.0, 0.0, 2.0]) == pytest.approx(
+        1000.0 + 1.5 + 1.0, abs=0.01
+    )
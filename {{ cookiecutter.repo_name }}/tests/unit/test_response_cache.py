@@ -0,0 +1,109 @@
+# Response Cache Tests
+import asyncio
+import importlib
+import os
+import sys
+import time
+
+import pytest
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+response_cache = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.models.genai.response_cache"
+)
+cache_backends = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.infrastructure.storage.cache"
+)
+
+
+class FakeRedis:
+    """
+    Minimal stand-in for redis.asyncio.Redis: get/set(px=...)/delete.
+    """
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.data.pop(key)
+            return None
+        return value
+
+    async def set(self, key, value, px=None):
+        self.data[key] = (
+            value.encode(),
+            time.monotonic() + px / 1000 if px else None,
+        )
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+def _slow_upstream(calls):
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "answer"
+
+    return compute
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_are_coalesced():
+    cache = response_cache.ResponseCache()
+    calls = []
+    key = response_cache.response_key("What is  RAG?", "m", temperature=0)
+    results = await asyncio.gather(
+        *(cache.get_or_compute(key, _slow_upstream(calls)) for _ in range(10))
+    )
+    assert results == ["answer"] * 10
+    assert len(calls) == 1
+    assert cache.stats()["coalesced"] == 9
+    assert (
+        response_cache.response_key("What is RAG?", "m", temperature=0) == key
+    )
+    await cache.get_or_compute(key, _slow_upstream(calls))
+    assert len(calls) == 1 and cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failures_propagate_and_are_not_cached():
+    cache = response_cache.ResponseCache()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(
+        cache.get_or_compute("k", boom),
+        cache.get_or_compute("k", boom),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert await cache.get_or_compute("k", _slow_upstream([])) == "answer"
+
+
+@pytest.mark.asyncio
+async def test_ttl_and_lru_in_memory_backend():
+    backend = cache_backends.InMemoryCacheBackend(max_entries=2)
+    await backend.set("a", "1", ttl=60)
+    await backend.set("b", "2", ttl=0.01)
+    await backend.set("c", "3", ttl=60)
+    assert await backend.get("a") is None
+    await asyncio.sleep(0.02)
+    assert await backend.get("b") is None
+    assert await backend.get("c") == "3"
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_with_fake_client():
+    cache = response_cache.ResponseCache(
+        cache_backends.RedisCacheBackend(FakeRedis()), ttl=60
+    )
+    calls = []
+    assert await cache.get_or_compute("k", _slow_upstream(calls)) == "answer"
+    assert await cache.get_or_compute("k", _slow_upstream(calls)) == "answer"
+    assert len(calls) == 1
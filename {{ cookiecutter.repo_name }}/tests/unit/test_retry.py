@@ -0,0 +1,241 @@
+# Retry Tests
+import asyncio
+import importlib
+import os
+import sys
+import time
+
+import httpx
+import pytest
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+retry = importlib.import_module("src.{{ cookiecutter.package_name }}.utils.retry")
+errors = importlib.import_module("src.{{ cookiecutter.package_name }}.core.errors")
+azure_openai = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.infrastructure.llm_providers.azure_openai"
+)
+
+
+class Flaky:
+    def __init__(self, failures, exc=ConnectionError):
+        self.failures = failures
+        self.exc = exc
+        self.calls = 0
+
+    async def __call__(self, value):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.exc("boom")
+        return value
+
+
+def test_sync_retry_reraises_last_error():
+    calls = []
+
+    def fail():
+        calls.append(1)
+        raise ValueError("nope")
+
+    with pytest.raises(ValueError):
+        retry.retry(fail, retries=3, delay=0.001)
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_async_recovers_without_blocking_the_loop():
+    fn = Flaky(2)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    task = asyncio.create_task(ticker())
+    assert (
+        await retry.retry_async(fn, "ok", retries=3, base_delay=0.02) == "ok"
+    )
+    task.cancel()
+    assert fn.calls == 3
+    assert ticks > 1
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_errors_are_not_retried():
+    fn = Flaky(5, exc=KeyError)
+    with pytest.raises(KeyError):
+        await retry.retry_async(
+            fn, "ok", retries=3, base_delay=0.001, retry_on=(ConnectionError,)
+        )
+    assert fn.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_exhausted_budget_stops_retries():
+    # Holds a single token, and one call only deposits a tenth of one.
+    budget = retry.RetryBudget(ratio=0.1, min_per_second=0.0)
+    first, second = Flaky(1), Flaky(1)
+    assert (
+        await retry.retry_async(first, 1, base_delay=0.001, budget=budget) == 1
+    )
+    with pytest.raises(ConnectionError):
+        await retry.retry_async(second, 1, base_delay=0.001, budget=budget)
+    assert second.calls == 1 and budget.exhausted == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_then_recovers_via_half_open():
+    breaker = retry.CircuitBreaker(
+        "test", failure_threshold=2, recovery_timeout=0.05
+    )
+    fn = Flaky(2)
+    with pytest.raises(ConnectionError):
+        await retry.retry_async(
+            fn, 1, retries=2, base_delay=0.001, breaker=breaker
+        )
+    assert breaker.state == "open"
+    with pytest.raises(errors.CircuitOpenError):
+        await retry.retry_async(fn, 1, breaker=breaker)
+    assert fn.calls == 2
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    assert await retry.retry_async(fn, 1, breaker=breaker) == 1
+    assert breaker.stats() == {"state": "closed", "failures": 0, "rejected": 1}
+
+
+def test_get_breaker_is_shared_per_dependency():
+    assert retry.get_breaker("dep-a") is retry.get_breaker("dep-a")
+    assert retry.get_breaker("dep-a") is not retry.get_breaker("dep-b")
+
+
+@pytest.mark.asyncio
+async def test_hedger_races_slow_attempt():
+    hedger = retry.Hedger(min_samples=5)
+    for _ in range(5):
+        hedger.record(0.01)
+    delays = iter([1.0, 0.0])
+    started = []
+
+    async def call():
+        delay = next(delays)
+        started.append(delay)
+        await asyncio.sleep(delay)
+        return delay
+
+    start = time.perf_counter()
+    assert await hedger.run(call) == 0.0
+    assert time.perf_counter() - start < 0.5
+    assert started == [1.0, 0.0]
+    assert hedger.hedged == 1 and hedger.hedge_wins == 1
+
+
+@pytest.mark.asyncio
+async def test_hedger_survives_a_cancelled_attempt():
+    hedger = retry.Hedger(initial_delay=0.01)
+    calls = []
+
+    async def call():
+        calls.append(None)
+        if len(calls) == 1:
+            await asyncio.sleep(0.02)
+            raise asyncio.CancelledError
+        await asyncio.sleep(0.05)
+        return "hedge"
+
+    assert await hedger.run(call) == "hedge"
+
+
+@pytest.mark.asyncio
+async def test_hedge_spends_budget_and_respects_breaker():
+    hedger = retry.Hedger(initial_delay=0.01)
+    calls = []
+
+    async def call():
+        calls.append(None)
+        await asyncio.sleep(0.03)
+        return len(calls)
+
+    budget = retry.RetryBudget(ratio=0.1, min_per_second=0.0)  # one token
+    assert await hedger.run(call, budget) == 2
+    assert await hedger.run(call, budget) == 3
+    assert (hedger.hedged, budget.exhausted) == (1, 1)
+
+    breaker = retry.CircuitBreaker("hedge", failure_threshold=1)
+    breaker.record_failure()
+    calls.clear()
+    assert await hedger.run(call, breaker=breaker) == 1
+
+
+@pytest.mark.asyncio
+async def test_provider_retries_transient_statuses_only():
+    statuses = [503, 429, 200]
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        status = statuses.pop(0) if statuses else 400
+        body = (
+            {"choices": [{"message": {"content": "hi"}}]}
+            if status == 200
+            else {}
+        )
+        return httpx.Response(status, json=body)
+
+    provider = azure_openai.AzureOpenAIProvider(
+        endpoint="http://llm.test",
+        api_key="k",
+        transport=httpx.MockTransport(handler),
+        retries=3,
+        retry_base_delay=0.001,
+        breaker=retry.CircuitBreaker("llm-test"),
+    )
+    assert await provider.agenerate("hello") == "hi"
+    assert len(calls) == 3
+    with pytest.raises(httpx.HTTPStatusError):
+        await provider.agenerate("hello")
+    assert len(calls) == 4
+    await provider.aclose()
+
+
+@pytest.mark.asyncio
+async def test_half_open_trial_is_released_when_cancelled_or_not_retryable():
+    breaker = retry.CircuitBreaker(
+        "trial", failure_threshold=1, recovery_timeout=0.02
+    )
+    with pytest.raises(ConnectionError):
+        await retry.retry_async(Flaky(1), 1, retries=1, breaker=breaker)
+    time.sleep(0.03)
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(
+            retry.retry_async(hang, breaker=breaker), timeout=0.01
+        )
+    assert breaker.state == "half_open"
+    with pytest.raises(KeyError):
+        await retry.retry_async(
+            Flaky(1, exc=KeyError),
+            1,
+            breaker=breaker,
+            retry_on=(ConnectionError,),
+        )
+    assert breaker.state == "closed"
+    assert await retry.retry_async(Flaky(0), 1, breaker=breaker) == 1
+
+
+def test_abandoned_half_open_trial_expires():
+    breaker = retry.CircuitBreaker(
+        "abandoned", failure_threshold=1, recovery_timeout=0.02
+    )
+    breaker.record_failure()
+    time.sleep(0.03)
+    breaker.before_call()
+    with pytest.raises(errors.CircuitOpenError):
+        breaker.before_call()
+    time.sleep(0.03)
+    breaker.before_call()
+    assert breaker.state == "half_open"
@@ -0,0 +1,148 @@
+# Tracker Tests
+import gc
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+tracker_module = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.infrastructure.tracking.tracker"
+)
+
+
+class ListSink:
+    def __init__(self, delay=0.0):
+        self.batches = []
+        self.delay = delay
+
+    def write(self, records):
+        time.sleep(self.delay)
+        self.batches.append(list(records))
+
+
+def test_flushes_on_size_in_background():
+    sink = ListSink()
+    tracker = tracker_module.Tracker(sink, flush_size=10, flush_interval=60)
+    for step in range(25):
+        tracker.log_metric("loss", 1.0 / (step + 1), step=step)
+    deadline = time.time() + 2
+    while sum(map(len, sink.batches)) < 20 and time.time() < deadline:
+        time.sleep(0.01)
+    assert sum(map(len, sink.batches)) >= 20
+    tracker.close()
+    assert sum(map(len, sink.batches)) == 25
+
+
+def test_log_metric_is_cheap_and_drops_when_full():
+    tracker = tracker_module.Tracker(
+        ListSink(delay=0.2),
+        flush_size=2000,
+        flush_interval=60,
+        max_buffer=5000,
+    )
+    start = time.perf_counter()
+    for step in range(20_000):
+        tracker.log_metric("loss", 0.5, step=step)
+    elapsed = time.perf_counter() - start
+    assert elapsed < 1.0
+    assert tracker.dropped > 0
+    tracker.close()
+
+
+def test_block_policy_keeps_every_record():
+    sink = ListSink(delay=0.01)
+    tracker = tracker_module.Tracker(
+        sink,
+        flush_size=50,
+        flush_interval=0.05,
+        max_buffer=100,
+        overflow="block",
+    )
+    for step in range(500):
+        tracker.log_metric("acc", 0.9, step=step)
+    tracker.close()
+    assert tracker.dropped == 0 and sum(map(len, sink.batches)) == 500
+
+
+def test_jsonl_sink(tmp_path):
+    tracker = tracker_module.Tracker(
+        tracker_module.JSONLSink(str(tmp_path / "metrics.jsonl"))
+    )
+    tracker.log_param("lr", 0.01)
+    tracker.log_metrics({"loss": 0.3, "acc": 0.8}, step=1)
+    tracker.close()
+    lines = [
+        json.loads(line)
+        for line in (tmp_path / "metrics.jsonl").read_text().splitlines()
+    ]
+    assert [(r["type"], r["name"]) for r in lines] == [
+        ("param", "lr"),
+        ("metric", "loss"),
+        ("metric", "acc"),
+    ]
+
+
+def test_mlflow_http_sink_against_local_stub():
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            received.append((self.path, json.loads(body)))
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        sink = tracker_module.MLflowHTTPSink(
+            f"http://127.0.0.1:{server.server_port}", run_id="run-1"
+        )
+        tracker = tracker_module.Tracker(sink, flush_size=5000)
+        for step in range(1500):
+            tracker.log_metric("loss", 0.1, step=step)
+        tracker.log_param("model", "ridge")
+        tracker.close()
+    finally:
+        server.shutdown()
+    assert all(
+        path == "/api/2.0/mlflow/runs/log-batch" for path, _ in received
+    )
+    assert [len(body["metrics"]) for _, body in received] == [1000, 500]
+    assert received[0][1]["params"] == [{"key": "model", "value": "ridge"}]
+
+
+def test_unclosed_tracker_is_collected_and_flushed():
+    sink = ListSink()
+    tracker = tracker_module.Tracker(sink, flush_size=1000, flush_interval=60)
+    tracker.log_metric("loss", 0.5)
+    thread, ref = tracker._thread, weakref.ref(tracker)
+    del tracker
+    gc.collect()
+    assert ref() is None
+    thread.join(2)
+    assert not thread.is_alive()
+    assert [name for batch in sink.batches for _, name, *_ in batch] == [
+        "loss"
+    ]
+
+
+def test_logging_after_close_warns_and_drops():
+    tracker = tracker_module.Tracker(ListSink())
+    tracker.close()
+    with pytest.warns(RuntimeWarning, match="closed"):
+        tracker.log_metric("loss", 0.5)
+    assert tracker.dropped == 1 and not tracker._buffer
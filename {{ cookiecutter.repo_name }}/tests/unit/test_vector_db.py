@@ -0,0 +1,157 @@
+# Vector DB Tests
+import importlib
+import os
+import sys
+
+import numpy as np
+import pytest
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, src_path)
+vector_db = importlib.import_module(
+    "src.{{ cookiecutter.package_name }}.infrastructure.storage.vector_db"
+)
+VectorDB = vector_db.VectorDB
+
+
+def _corpus(n=500, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    return [f"doc-{i}" for i in range(n)], rng.normal(size=(n, dim)).astype(
+        np.float32
+    )
+
+
+def test_flat_search_returns_exact_neighbour():
+    ids, matrix = _corpus()
+    db = VectorDB(dim=16)
+    db.add_embeddings(ids, matrix)
+    hits = db.search(matrix[42], k=3)
+    assert hits[0][0] == "doc-42"
+    assert hits[0][1] == pytest.approx(1.0, abs=1e-5)
+    assert [s for _, s in hits] == sorted((s for _, s in hits), reverse=True)
+
+
+def test_dot_metric_matches_numpy():
+    ids, matrix = _corpus()
+    db = VectorDB(dim=16, metric="dot", initial_capacity=4)
+    db.add_embeddings(ids, matrix)
+    queries = matrix[:5] * 2
+    expected = np.argsort(-(queries @ matrix.T), axis=1)[:, :5]
+    results = db.search_batch(queries, k=5)
+    assert [
+        [int(i.split("-")[1]) for i, _ in row] for row in results
+    ] == expected.tolist()
+
+
+def test_ivf_recall_against_flat():
+    ids, matrix = _corpus(n=2000)
+    flat = VectorDB(dim=16)
+    ivf = VectorDB(dim=16, index="ivf", nlist=32, nprobe=8)
+    flat.add_embeddings(ids, matrix)
+    ivf.add_embeddings(ids, matrix)
+    ivf.build_index()
+    queries = matrix[:50]
+    exact = [{i for i, _ in row} for row in flat.search_batch(queries, k=10)]
+    approx = [{i for i, _ in row} for row in ivf.search_batch(queries, k=10)]
+    recall = np.mean([len(a & e) / 10 for a, e in zip(approx, exact)])
+    assert recall > 0.8
+
+
+def test_ivf_probes_the_lists_holding_the_l2_neighbours():
+    # Clusters of different sizes and distances from the origin, so centroid
+    # norms vary widely.
+    rng = np.random.default_rng(1)
+    centers = rng.normal(size=(20, 8)) * 3
+    spread = rng.uniform(0.2, 2, size=20)
+    labels = rng.integers(0, 20, size=1000)
+    matrix = (
+        centers[labels] + rng.normal(size=(1000, 8)) * spread[labels, None]
+    ).astype(np.float32)
+    index = vector_db.IVFIndex(nlist=16, nprobe=2)
+    index.build(matrix)
+    queries = matrix[:200]
+    distances = ((queries[:, None, :] - matrix[None, :, :]) ** 2).sum(axis=-1)
+    exact = np.argsort(distances, axis=1)[:, :10]
+    probes = index.probe(queries)
+    recall = np.mean(
+        [
+            np.isin(
+                exact[i], np.concatenate([index.lists[c] for c in probes[i]])
+            ).mean()
+            for i in range(len(queries))
+        ]
+    )
+    assert recall > 0.95
+    assert all(i in index.lists[probes[i, 0]] for i in range(len(queries)))
+
+
+def test_rejects_wrong_dimension():
+    db = VectorDB(dim=4)
+    with pytest.raises(ValueError):
+        db.add_embeddings(["a"], [[1.0, 2.0]])
+
+
+def test_save_load_mmap_and_append(tmp_path):
+    ids, matrix = _corpus(n=300)
+    db = VectorDB(dim=16, index="ivf", nlist=8, nprobe=8)
+    db.add_embeddings(ids[:200], matrix[:200], [{"n": i} for i in range(200)])
+    db.save(tmp_path)
+    db.add_embeddings(ids[200:], matrix[200:])
+
+    loaded = VectorDB.load(tmp_path, read_only=True)
+    assert isinstance(loaded._state.base, np.memmap)
+    assert len(loaded) == 300
+    assert loaded.search(matrix[250], k=1)[0][0] == "doc-250"
+    assert loaded.get_metadata("doc-7") == {"n": 7}
+    with pytest.raises(RuntimeError):
+        loaded.add_embeddings(["x"], matrix[:1])
+
+
+def test_background_compaction_keeps_serving(tmp_path):
+    ids, matrix = _corpus(n=400)
+    db = VectorDB(dim=16)
+    db.save(tmp_path)
+    db.add_embeddings(ids[:300], matrix[:300])
+    db.compact(background=True)
+    db.add_embeddings(ids[300:], matrix[300:])
+    assert db.search(matrix[350], k=1)[0][0] == "doc-350"
+    db.wait_for_compaction()
+
+    reloaded = VectorDB.load(tmp_path)
+    assert len(reloaded) == 400
+    assert reloaded.ids == ids
+    assert reloaded.search(matrix[10], k=1)[0][0] == "doc-10"
+
+
+def test_load_drops_rows_left_by_a_crash_mid_append(tmp_path):
+    ids, matrix = _corpus(n=40)
+    db = VectorDB(dim=16)
+    db.save(tmp_path)
+    db.add_embeddings(ids[:10], matrix[:10])
+    vectors_file = db._segment[0]
+    # Crash after the vectors were written but before their records, with the
+    # last vector torn.
+    with open(vectors_file, "ab") as f:
+        f.write(matrix[10:13].tobytes()[:-6])
+
+    db = VectorDB.load(tmp_path)
+    assert len(db) == 10
+    db.add_embeddings(ids[20:30], matrix[20:30])
+    reloaded = VectorDB.load(tmp_path)
+    assert reloaded.ids == ids[:10] + ids[20:30]
+    assert reloaded.search(matrix[25], k=1)[0][0] == "doc-25"
+    expected = vector_db._normalize(
+        np.concatenate([matrix[:10], matrix[20:30]])
+    )
+    np.testing.assert_allclose(reloaded.vectors, expected, rtol=1e-6)
+
+
+def test_open_shared_is_one_read_only_mapping_per_path(tmp_path):
+    ids, matrix = _corpus(n=20)
+    db = VectorDB(dim=16)
+    db.add_embeddings(ids, matrix)
+    db.save(tmp_path)
+    shared = vector_db.open_shared(str(tmp_path))
+    assert shared is vector_db.open_shared(str(tmp_path))
+    assert shared.read_only and isinstance(shared._state.base, np.memmap)
+    assert shared.search(matrix[3], k=1)[0][0] == "doc-3"